@@ -71,6 +71,8 @@ def main():
         # Create Shell Process
         shell_proc = Process("shell", shell.run(), uid=shell.current_user)
         scheduler.add(shell_proc)
+        # The shell blocks on input inside its steps; keep it off the loop thread
+        scheduler.isolate_process(shell_proc)
         supervisor.register(shell_proc)
 
         # Autostart services
@@ -7,11 +7,13 @@ scheduler, process management, system calls, filesystem, and user management.
 """
 
 from .scheduler import Scheduler
+from .async_scheduler import AsyncScheduler
 from .process import Process
 from .syscall import SyscallHandler
 from .filesystem import FileSystem
 __all__ = [
     "Scheduler",
+    "AsyncScheduler",
     "Process",
     "SyscallHandler",
     "FileSystem",
@@ -0,0 +1,288 @@
+# kernel/action_executor.py
+"""
+Parallel Action Executor.
+
+The agent may request several actions in one turn. `ActionExecutor` runs
+them on a thread pool, grouping actions that must not overlap into ordered
+lanes:
+
+    - actions on a path that the batch writes (write_file, append_file) run
+      in the order they were requested, so reads see earlier writes and
+      writes to the same file never interleave
+    - UI actions (read_screen, interact, launch_app) share one lane, since
+      an interaction depends on the screen the previous action left
+    - programs (run_process, launch_app) may run files the batch writes, so
+      once one follows a write, the writes, the accesses to written paths,
+      the UI actions and the programs share one lane in request order
+    - every other action gets a lane of its own
+
+Results are returned in request order. Worker threads run each lane as the
+thread that requested the actions (see `caller_context`), since the current
+process is thread-local and a pool thread would otherwise act as root.
+
+When the response is streamed, actions are dispatched one at a time through
+an `ActionBatch` before the rest of the batch is known, so every action on
+the same path shares a lane, and a program waits for the writes dispatched
+before it to finish.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+PATH_ACTIONS = frozenset({"read_file", "write_file", "append_file", "list_dir"})
+WRITE_ACTIONS = frozenset({"write_file", "append_file"})
+UI_ACTIONS = frozenset({"read_screen", "interact", "launch_app"})
+EXEC_ACTIONS = frozenset({"run_process", "launch_app"})
+MAX_WORKERS = 8
+
+
+def _normalize_path(path):
+    path = str(path).replace("\\", "/")
+    while "//" in path:
+        path = path.replace("//", "/")
+    return path.rstrip("/") or "/"
+
+
+def plan_lanes(actions):
+    """
+    Group actions into lanes that may run concurrently with each other.
+
+    Args:
+        actions (list[tuple[str, list]]): (name, args) pairs in request order.
+
+    Returns:
+        list[list[int]]: Action indexes per lane, each in request order.
+    """
+    written = set()
+    serial = False  # A program follows a write
+    for name, args in actions:
+        if name in WRITE_ACTIONS and args:
+            written.add(_normalize_path(args[0]))
+        elif name in EXEC_ACTIONS and written:
+            serial = True
+
+    lanes = {}
+    order = []
+    for index, (name, args) in enumerate(actions):
+        key = ("action", index)
+        if name in PATH_ACTIONS and args and _normalize_path(args[0]) in written:
+            key = ("serial",) if serial else ("path", _normalize_path(args[0]))
+        elif serial and (name in UI_ACTIONS or name in EXEC_ACTIONS):
+            key = ("serial",)
+        elif name in UI_ACTIONS:
+            key = ("ui",)
+        if key not in lanes:
+            lanes[key] = []
+            order.append(key)
+        lanes[key].append(index)
+    return [lanes[key] for key in order]
+
+
+class ActionExecutor:
+    """
+    Runs a batch of agent actions concurrently, respecting lane ordering.
+
+    Attributes:
+        max_workers (int): Maximum actions running at once.
+        caller_context (callable): Captures the calling thread's identity,
+            e.g. `SyscallHandler.caller_context`, or None.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, caller_context=None):
+        """
+        Initialize the ActionExecutor.
+
+        Args:
+            max_workers (int, optional): Thread pool size. Defaults to 8.
+            caller_context (callable, optional): Called on the requesting
+                thread; returns a factory of context managers that apply the
+                captured identity on a worker thread.
+        """
+        self.max_workers = max_workers
+        self.caller_context = caller_context
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="loop-action")
+        return self._pool
+
+    def _capture_caller(self):
+        if self.caller_context is None:
+            return nullcontext
+        return self.caller_context()
+
+    def run(self, actions, execute):
+        """
+        Execute a batch of actions.
+
+        Args:
+            actions (list[tuple[str, list]]): (name, args) pairs in request order.
+            execute (callable): execute(name, args) -> result. Exceptions are
+                returned as the action's result.
+
+        Returns:
+            list: One result per action, in request order.
+        """
+        results = [None] * len(actions)
+
+        def run_lane(indexes):
+            for index in indexes:
+                name, args = actions[index]
+                try:
+                    results[index] = execute(name, args)
+                except Exception as e:
+                    results[index] = f"Error executing {name}: {e}"
+
+        def run_lane_as_caller(indexes):
+            with as_caller():
+                run_lane(indexes)
+
+        lanes = plan_lanes(actions)
+        if len(lanes) == 1:
+            run_lane(lanes[0])  # Nothing to overlap: stay on the caller's thread
+            return results
+        as_caller = self._capture_caller()
+        futures = [self._get_pool().submit(run_lane_as_caller, lane) for lane in lanes]
+        for future in futures:
+            future.result()
+        return results
+
+    def batch(self, execute):
+        """
+        Start a batch that actions are added to as they become known.
+
+        Args:
+            execute (callable): execute(name, args) -> result.
+
+        Returns:
+            ActionBatch: The open batch.
+        """
+        return ActionBatch(self, execute)
+
+    def shutdown(self):
+        """
+        Stop the worker threads.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+class ActionBatch:
+    """
+    Actions dispatched incrementally, e.g. while the LLM response streams in.
+
+    Attributes:
+        actions (list[tuple[str, list]]): (name, args) pairs in dispatch order.
+        started (float): Time the batch was opened.
+    """
+
+    def __init__(self, executor, execute):
+        """
+        Initialize the ActionBatch.
+
+        Args:
+            executor (ActionExecutor): Executor whose pool runs the lanes.
+            execute (callable): execute(name, args) -> result.
+        """
+        self.actions = []
+        self.started = time.time()
+        self._executor = executor
+        self._execute = execute
+        self._as_caller = executor._capture_caller()
+        self._results = []
+        self._lanes = {}
+        self._pending = 0
+        self._open_writes = set()   # Writes not finished yet
+        self._waits = {}            # Program index -> writes it waits for
+        self._parked = {}           # Program index -> its lane, resubmitted once the writes finish
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self.actions)
+
+    def add(self, name, args):
+        """
+        Dispatch an action; it starts as soon as its lane is free.
+
+        Args:
+            name (str): Action name.
+            args (list): Action arguments.
+        """
+        with self._cond:
+            index = len(self.actions)
+            self.actions.append((name, args))
+            self._results.append(None)
+            if name in PATH_ACTIONS and args:
+                key = ("path", _normalize_path(args[0]))
+            elif name in UI_ACTIONS:
+                key = ("ui",)
+            else:
+                key = ("action", index)
+            if name in WRITE_ACTIONS:
+                self._open_writes.add(index)
+            elif name in EXEC_ACTIONS and self._open_writes:
+                self._waits[index] = set(self._open_writes)
+            lane = self._lanes.setdefault(key, deque())
+            lane.append(index)
+            self._pending += 1
+            idle = len(lane) == 1
+        if idle:
+            self._executor._get_pool().submit(self._run_lane, lane)
+
+    def _run_lane(self, lane):
+        with self._as_caller():
+            self._drain(lane)
+
+    def _drain(self, lane):
+        while True:
+            with self._cond:
+                index = lane[0]
+                if self._waits.get(index):
+                    # A program waiting for writes: the last of them resubmits the lane
+                    self._parked[index] = lane
+                    return
+            name, args = self.actions[index]
+            try:
+                result = self._execute(name, args)
+            except Exception as e:
+                result = f"Error executing {name}: {e}"
+            resume = []
+            with self._cond:
+                self._results[index] = result
+                lane.popleft()
+                self._pending -= 1
+                if index in self._open_writes:
+                    self._open_writes.discard(index)
+                    for program, writes in list(self._waits.items()):
+                        writes.discard(index)
+                        if not writes:
+                            del self._waits[program]
+                            if program in self._parked:
+                                resume.append(self._parked.pop(program))
+                self._cond.notify_all()
+                done = not lane
+            for parked in resume:
+                self._executor._get_pool().submit(self._run_lane, parked)
+            if done:
+                return
+
+    def wait(self):
+        """
+        Wait for every dispatched action.
+
+        Returns:
+            list: One result per action, in dispatch order.
+        """
+        with self._cond:
+            while self._pending:
+                self._cond.wait()
+            return list(self._results)
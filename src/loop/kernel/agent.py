@@ -6,14 +6,19 @@ This module implements a ReAct (Reasoning and Acting) agent that can
 interact with the LooP kernel to perform tasks autonomously.
 """
 
+import os
 import json
 import hashlib
 import time
 import inspect
-from loop.kernel.dom import SystemDOM
+from loop.kernel.action_executor import ActionExecutor, PATH_ACTIONS
+from loop.kernel.dom import DEFAULT_FS_DEPTH, DEFAULT_FS_TOKEN_BUDGET, SystemDOM
 from loop.kernel.sandbox import AgentSandbox
 from loop.kernel.llm import LLMProvider
+from loop.kernel.stream_parser import StreamingActionParser
+from loop.kernel.tools import AGENT_TOOLS, SANDBOX_TOOLS, Tool
 from loop.kernel.resource_monitor import ResourceMonitor
+from loop.kernel.state_encoder import get_encoder
 from loop.utils.error_recovery import ErrorRecovery
 from loop.utils.logging import ActionLogger
 
@@ -36,19 +41,43 @@ class ReActAgent:
         extra_tools (dict): Dictionary of dynamically registered tools {name: {'func': func, 'desc': desc}}.
     """
 
-    def __init__(self, syscall_handler, model="gpt-3.5-turbo"):
+    def __init__(self, syscall_handler, model="gpt-3.5-turbo", stream=False, io=None, native_tools=None, state_deltas=False,
+                 state_encoder=None):
         """
         Initialize the ReActAgent.
 
         Args:
             syscall_handler (SyscallHandler): The kernel syscall handler.
             model (str, optional): The name of the LLM model to use. Defaults to "gpt-3.5-turbo".
+            stream (bool, optional): Stream LLM responses and start actions before
+                the response is complete. Defaults to False.
+            io (IOAdapter, optional): Adapter that receives streamed tokens.
+            native_tools (bool, optional): Use the provider's function calling with a
+                cacheable static system prompt instead of a JSON-in-text prompt.
+                Takes precedence over `stream`. Defaults to LOOP_NATIVE_TOOLS=true.
+            state_deltas (bool, optional): Keep the task's first DOM snapshot as a
+                stable prompt prefix and add only the sections that changed since
+                it after that. Defaults to False.
+            state_encoder (str or StateEncoder, optional): How the state is written
+                into the prompt ("repr", "json", "compact"). Defaults to
+                LOOP_STATE_ENCODER, or "compact".
         """
         self.sys = syscall_handler
-        self.dom = SystemDOM(syscall_handler)
+        self.dom = SystemDOM(syscall_handler, fs_depth=DEFAULT_FS_DEPTH, fs_token_budget=DEFAULT_FS_TOKEN_BUDGET)
         self.resource_monitor = ResourceMonitor()
         self.action_logger = ActionLogger()
         self.model = model
+        self.stream = stream
+        self.io = io
+        if native_tools is None:
+            native_tools = os.environ.get("LOOP_NATIVE_TOOLS") == "true"
+        self.native_tools = native_tools
+        self.state_deltas = state_deltas
+        self.state_encoder = get_encoder(state_encoder or os.environ.get("LOOP_STATE_ENCODER"))
+        self._dom_version = 0
+        self._state_base = None
+        self._tools = None
+        self._system_prompt_text = None
 
         # Use existing sandbox from syscall handler if available, otherwise create new.
         if hasattr(syscall_handler, 'sandbox') and syscall_handler.sandbox:
@@ -62,6 +91,7 @@ class ReActAgent:
         self.history = []
         self.todo_list = []
         self.extra_tools = {}
+        self.executor = ActionExecutor(caller_context=getattr(self.sys, "caller_context", None))
 
         # Initialize Plugins (if available)
         if hasattr(self.sys, 'plugin_loader') and self.sys.plugin_loader:
@@ -91,8 +121,10 @@ class ReActAgent:
 
         self.extra_tools[name] = {
             "func": func,
-            "description": f"{signature} <-- {desc}"
+            "description": f"{signature} <-- {desc}",
+            "tool": Tool.from_callable(func, desc, name)
         }
+        self._tools = self._system_prompt_text = None
         print(f"[Agent] Registered tool: {name}")
 
     def inject_context(self, message: str):
@@ -103,12 +135,13 @@ class ReActAgent:
         print(f"[Agent] Context Injected: {message[:100]}...")
         self.history.append(f"System Note: {message}")
 
-    def run(self, task):
+    def run(self, task, cancel=None):
         """
         Executes the ReAct loop for a given task.
 
         Args:
             task (str): The task description from the user.
+            cancel (threading.Event, optional): Stops the task before the next turn when set.
 
         Returns:
             str: The final result or status of the task.
@@ -116,6 +149,8 @@ class ReActAgent:
         print(f"[Agent] Starting task: {task}")
         self.history = [] # Reset history per task
         self.todo_list = []
+        self._dom_version = 0 # First observation of a task is complete
+        self._state_base = None
 
         # Generate Task ID
         task_id = hashlib.md5(f"{task}{time.time()}".encode()).hexdigest()[:8]
@@ -137,6 +172,10 @@ class ReActAgent:
             loop_count += 1
             print(f"[Agent] Turn {loop_count}...")
 
+            if cancel is not None and cancel.is_set():
+                print("[Agent] Task cancelled.")
+                return "Cancelled"
+
             # 0. Check Limits
             limit_error = self.resource_monitor.check_limits()
             if limit_error:
@@ -144,16 +183,27 @@ class ReActAgent:
                 return f"Stopped: {limit_error}"
 
             # 1. Observe / Think
-            state = self.dom.get_state()
-            prompt = self._construct_prompt(task, state)
+            state = self._observe()
+            if self.native_tools:
+                system = self._system_prompt()
+                prompt = self._turn_prompt(task, state)
+                input_chars = len(system) + len(prompt)
+            else:
+                prompt = self._construct_prompt(task, state)
+                input_chars = len(prompt)
 
             # Count input tokens (approx)
-            input_chars = len(prompt)
             input_tokens = input_chars // 4
 
             # Wrap LLM call with retry logic
+            batch = None
             try:
-                response = self._generate_with_retry(prompt)
+                if self.native_tools:
+                    response = self._generate_tool_turn(system, prompt)
+                elif self.stream:
+                    response, batch = self._generate_streaming(prompt)
+                else:
+                    response = self._generate_with_retry(prompt)
             except Exception as e:
                 print(f"[Agent] LLM Generation Failed: {e}")
                 return f"Error: LLM Generation Failed after retries: {e}"
@@ -162,53 +212,230 @@ class ReActAgent:
             output_chars = len(response)
             output_tokens = output_chars // 4
 
-            self.resource_monitor.track_tokens(self.model, input_tokens, output_tokens)
+            # Cached responses cost nothing
+            if getattr(self.llm, "last_cache_hit", False) is not True:
+                self.resource_monitor.track_tokens(self.model, input_tokens, output_tokens)
 
             print(f"[Agent] Response:\n{response}\n")
 
             self.history.append(f"Turn {loop_count} Output:\n{response}")
 
             # 2. Parse
-            thought, todo, action, args = self._parse_response(response)
+            thought, todo, actions = self._parse_actions(response)
 
             if todo:
                 self.todo_list = todo
 
+            finished = any(name == "done" for name, _ in actions)
+            actions = [(name, args) for name, args in actions if name != "done"]
+
             # 3. Act
-            if action:
+            if batch is not None:
+                # Actions were dispatched while streaming; add any the stream parser missed
+                dispatched = list(batch.actions)
+                for action, args in actions:
+                    if (action, args) in dispatched:
+                        dispatched.remove((action, args))
+                    else:
+                        batch.add(action, args)
+            if batch is not None and len(batch):
+                results = batch.wait()
+                actions = batch.actions
+                duration = (time.time() - batch.started) * 1000
+                self._record_results(task_id, loop_count, thought, actions, results, duration, input_tokens+output_tokens)
+            elif actions:
                 start_act = time.time()
-                result = None
-
-                if action == "done":
-                    print("[Agent] Task completed.")
-                    # Log final step
-                    self.action_logger.log_action(task_id, loop_count, thought, "done", [], "Success", 0, input_tokens+output_tokens)
-                    return "Task Completed"
-
-                # Check Extra Tools first
-                if action in self.extra_tools:
-                    try:
-                        func = self.extra_tools[action]["func"]
-                        result = func(*args)
-                    except Exception as e:
-                        result = f"Error executing tool {action}: {e}"
-                else:
-                    # Execute via Sandbox
-                    result = self.sandbox.execute(action, args)
-
+                results = self.executor.run(actions, self._execute_action)
                 duration = (time.time() - start_act) * 1000
-
-                # Log Action
-                self.action_logger.log_action(task_id, loop_count, thought, action, args, result, duration, input_tokens+output_tokens)
-
-                display_result = str(result)[:500] + "... [Truncated]" if len(str(result)) > 500 else str(result)
-                print(f"[Agent] Execution Result: {display_result}")
-                self.history.append(f"Turn {loop_count} Result: {result}")
-            else:
+                self._record_results(task_id, loop_count, thought, actions, results, duration, input_tokens+output_tokens)
+            elif not finished:
                 self.history.append(f"Turn {loop_count} Result: No action parsed.")
 
+            if finished:
+                print("[Agent] Task completed.")
+                # Log final step
+                self.action_logger.log_action(task_id, loop_count, thought, "done", [], "Success", 0, input_tokens+output_tokens)
+                return "Task Completed"
+
         return "Max turns reached."
 
+    def _observe(self):
+        """
+        Observe the system state for the next prompt.
+
+        With `state_deltas`, the first observation of a task is kept as the
+        snapshot every later prompt starts with (each call is a standalone
+        prompt, so the model must always see it), followed by the current
+        value of each section that changed since then. The snapshot stays
+        byte-identical across turns, so providers can cache it as a prefix.
+        Sections whose provider did not answer in time are flagged as
+        possibly out of date.
+
+        Returns:
+            dict: The state to show.
+        """
+        if not self.state_deltas:
+            return self.dom.get_state()
+        delta = self.dom.get_delta(self._dom_version)
+        if self._state_base is None:
+            self._dom_version = delta["version"]
+            self._state_base = delta["changed"]
+            state = dict(self._state_base)
+        else:
+            state = dict(self._state_base)
+            if delta["changed"]:
+                state["changed"] = "Updated since the snapshot above: " + ", ".join(delta["changed"])
+                for name, value in delta["changed"].items():
+                    state[f"{name} (current)"] = value
+        if delta.get("stale"):
+            state["stale"] = "Last known snapshot, may be out of date: " + ", ".join(delta["stale"])
+        return state
+
+    def _record_results(self, task_id, loop_count, thought, actions, results, duration, tokens):
+        """
+        Log a turn's actions and add their results to the history as one entry.
+
+        Args:
+            task_id (str): The task ID.
+            loop_count (int): The turn number.
+            thought (str): The agent's reasoning for the turn.
+            actions (list[tuple[str, list]]): The executed (name, args) pairs.
+            results (list): One result per action.
+            duration (float): Execution time of the turn's actions in ms.
+            tokens (int): Tokens used by the turn.
+        """
+        for (action, args), result in zip(actions, results):
+            self.action_logger.log_action(task_id, loop_count, thought, action, args, result, duration, tokens)
+
+        if len(actions) == 1:
+            result = results[0]
+            display_result = str(result)[:500] + "... [Truncated]" if len(str(result)) > 500 else str(result)
+            print(f"[Agent] Execution Result: {display_result}")
+            self.history.append(f"Turn {loop_count} Result: {result}")
+            return
+
+        # Independent actions fan out; all results go into one history entry
+        lines = [
+            f"[{i}] {action}({json.dumps(args, default=str)[1:-1]}): {result}"
+            for i, ((action, args), result) in enumerate(zip(actions, results), 1)
+        ]
+        print(f"[Agent] Executed {len(actions)} actions in {duration:.0f}ms")
+        self.history.append(f"Turn {loop_count} Results:\n" + "\n".join(lines))
+
+    def _tool_definitions(self):
+        """
+        Tools offered to the model: sandbox actions, registered tools, and the
+        agent's own update_todo/done.
+
+        Returns:
+            list[Tool]: The tools (rebuilt only after `register_tool`).
+        """
+        if self._tools is None:
+            extra = [t.get("tool") or Tool.from_callable(t["func"], name=name) for name, t in self.extra_tools.items()]
+            self._tools = SANDBOX_TOOLS + extra + AGENT_TOOLS
+        return self._tools
+
+    def _generate_tool_turn(self, system, prompt):
+        """
+        Run one turn through native function calling.
+
+        The tool calls are rendered as the JSON response the text protocol
+        uses, so parsing, history and logging are shared with it. Without tool
+        calls (e.g. the mock provider) the text is returned for parsing as usual.
+
+        Args:
+            system (str): Static system prompt.
+            prompt (str): Per-turn prompt.
+
+        Returns:
+            str: The response.
+        """
+        tools = self._tool_definitions()
+        result = self._generate_tools_with_retry(system, prompt, tools)
+        if not result["calls"]:
+            return result["text"]
+
+        by_name = {t.name: t for t in tools}
+        todo = None
+        actions = []
+        for call in result["calls"]:
+            name, arguments = call["name"], call.get("arguments") or {}
+            if name == "update_todo":
+                todo = arguments.get("items")
+                continue
+            tool = by_name.get(name)
+            args = tool.positional(arguments) if tool else list(arguments.values())
+            actions.append({"name": name, "args": args})
+
+        response = {"thought": result["text"].strip(), "actions": actions}
+        if todo is not None:
+            response["todo"] = todo
+        return json.dumps(response, default=str)
+
+    @ErrorRecovery.retry_with_backoff(retries=3, backoff_in_seconds=1)
+    def _generate_tools_with_retry(self, system, prompt, tools):
+        return self.llm.generate_with_tools(system, prompt, tools)
+
+    @ErrorRecovery.retry_with_backoff(retries=3, backoff_in_seconds=1)
+    def _generate_streaming(self, prompt):
+        """
+        Stream the LLM response, dispatching each action as soon as it is complete.
+
+        Tokens are forwarded to the IO adapter (if any) for live display. A
+        stream that fails before any action was dispatched is retried; once
+        actions are running, the partial response is used as is.
+
+        Args:
+            prompt (str): The prompt to send.
+
+        Returns:
+            tuple: The full response text and the `ActionBatch` of dispatched actions.
+        """
+        parser = StreamingActionParser()
+        batch = self.executor.batch(self._execute_action)
+        chunks = []
+        try:
+            for chunk in self.llm.generate_stream(prompt):
+                chunks.append(chunk)
+                if self.io is not None:
+                    self.io.stream(chunk)
+                for action, args in parser.feed(chunk):
+                    if action != "done":
+                        batch.add(action, args)
+        except Exception:
+            if not len(batch):
+                raise
+            # Retrying would run the dispatched actions again; keep what streamed
+            batch.wait()
+            return "".join(chunks), batch
+        error = getattr(self.llm, "last_error", None)
+        if isinstance(error, str) and not len(batch):
+            raise RuntimeError(error)
+        return "".join(chunks), batch
+
+    def _execute_action(self, action, args):
+        """
+        Execute one action via a registered tool or the sandbox.
+
+        Args:
+            action (str): The action name.
+            args (list): The action arguments.
+
+        Returns:
+            any: The action result (errors are returned as strings).
+        """
+        if action in PATH_ACTIONS and args:
+            self.dom.touch(args[0])  # Expanded first in the next observation
+        # Check Extra Tools first
+        if action in self.extra_tools:
+            try:
+                func = self.extra_tools[action]["func"]
+                return func(*args)
+            except Exception as e:
+                return f"Error executing tool {action}: {e}"
+        # Execute via Sandbox
+        return self.sandbox.execute(action, args)
+
     @ErrorRecovery.retry_with_backoff(retries=3, backoff_in_seconds=1)
     def _generate_with_retry(self, prompt):
         return self.llm.generate(prompt)
@@ -219,7 +446,7 @@ class ReActAgent:
 
         Args:
             task (str): The current task.
-            state (str): The current system state (DOM).
+            state (dict): The current system state (DOM).
 
         Returns:
             str: The fully constructed prompt.
@@ -237,7 +464,7 @@ You are an AI Agent inside LooP.
 Your goal is to complete the user's Task.
 
 SYSTEM STATE (DOM):
-{state}
+{self.state_encoder.encode(state)}
 
 CURRENT TODO LIST:
 {self.todo_list}
@@ -250,15 +477,16 @@ TASK: {task}
 INSTRUCTIONS:
 1. Analyze the state and history.
 2. Update your ToDo list if needed.
-3. Choose a single Action to perform.
+3. Choose the Actions to perform. Actions that do not depend on each other's
+   results (e.g. reading several files) should be listed together: they run in
+   parallel, and writes to the same path run in the order listed.
 4. Output MUST be a valid JSON object with no markdown formatting:
 {{
   "thought": "<your reasoning>",
   "todo": ["<step 1>", "<step 2>"],
-  "action": {{
-      "name": "<function_name>",
-      "args": [<arg1>, <arg2>]
-  }}
+  "actions": [
+      {{"name": "<function_name>", "args": [<arg1>, <arg2>]}}
+  ]
 }}
 
 AVAILABLE ACTIONS:
@@ -288,25 +516,64 @@ AVAILABLE ACTIONS:
 Do not interact with system files (/kernel, /bin, /etc).
 """
 
-    def _parse_response(self, text):
+    def _system_prompt(self):
         """
-        Parses Thought, ToDo, and Action from the LLM output.
+        Static instructions for native tool calling. They do not change between
+        turns (the actions are sent as tool definitions), so providers can cache
+        them as a prompt prefix.
+
+        Returns:
+            str: The system prompt.
+        """
+        if self._system_prompt_text is None:
+            self._system_prompt_text = """You are an AI Agent inside LooP.
+Your goal is to complete the user's Task.
+
+INSTRUCTIONS:
+1. Analyze the system state and history you are given each turn.
+2. Call update_todo to update your ToDo list if needed.
+3. Call the tools for the Actions to perform, explaining your reasoning in text.
+   Calls that do not depend on each other's results (e.g. reading several files)
+   should be made together: they run in parallel, and writes to the same path
+   run in the order called.
+4. Call done when the task is complete.
+
+Do not interact with system files (/kernel, /bin, /etc)."""
+        return self._system_prompt_text
+
+    def _turn_prompt(self, task, state):
+        """
+        The per-turn part of the prompt for native tool calling.
 
         Args:
-            text (str): The raw output from the LLM.
+            task (str): The current task.
+            state (dict): The current system state (DOM).
 
         Returns:
-            tuple: A tuple containing:
-                - thought (str): The agent's reasoning.
-                - todo_list (list): The list of todo items.
-                - action_name (str): The name of the action to execute.
-                - action_args (list): The arguments for the action.
+            str: The prompt.
+        """
+        history_text = "\n".join(self.history[-3:]) # Keep last 3 turns
+        return f"""SYSTEM STATE (DOM):
+{self.state_encoder.encode(state)}
+
+CURRENT TODO LIST:
+{self.todo_list}
+
+HISTORY:
+{history_text}
+
+TASK: {task}"""
+
+    def _parse_json(self, text):
         """
-        thought = ""
-        todo = []
-        action = None
-        args = []
+        Extract the JSON object from the LLM output.
+
+        Args:
+            text (str): The raw output from the LLM.
 
+        Returns:
+            dict: The parsed object, or None if there is none.
+        """
         try:
             json_str = text.strip()
             # Remove markdown code blocks
@@ -323,21 +590,62 @@ Do not interact with system files (/kernel, /bin, /etc).
             end = json_str.rfind("}")
 
             if start != -1 and end != -1:
-                json_str = json_str[start:end+1]
-                data = json.loads(json_str)
-
-                thought = data.get("thought", "")
-                todo = data.get("todo", [])
-
-                # Check for action object
-                if "action" in data:
-                    action_data = data["action"]
-                    if isinstance(action_data, dict):
-                        action = action_data.get("name")
-                        args = action_data.get("args", [])
-
+                data = json.loads(json_str[start:end+1])
+                if isinstance(data, dict):
+                    return data
         except (json.JSONDecodeError, AttributeError):
             # Deterministic failure behavior
             pass
+        return None
+
+    def _parse_actions(self, text):
+        """
+        Parses Thought, ToDo, and every requested Action from the LLM output.
+
+        Both a single "action" object and an "actions" list are accepted.
+
+        Args:
+            text (str): The raw output from the LLM.
+
+        Returns:
+            tuple: A tuple containing:
+                - thought (str): The agent's reasoning.
+                - todo_list (list): The list of todo items.
+                - actions (list[tuple[str, list]]): (name, args) pairs in order.
+        """
+        data = self._parse_json(text)
+        if data is None:
+            return "", [], []
+
+        specs = []
+        if isinstance(data.get("actions"), list):
+            specs.extend(data["actions"])
+        if "action" in data:
+            specs.append(data["action"])
+
+        actions = []
+        for spec in specs:
+            if isinstance(spec, dict) and spec.get("name"):
+                args = spec.get("args", [])
+                actions.append((spec["name"], args if isinstance(args, list) else [args]))
+        return data.get("thought", ""), data.get("todo", []), actions
 
+    def _parse_response(self, text):
+        """
+        Parses Thought, ToDo, and Action from the LLM output.
+
+        Args:
+            text (str): The raw output from the LLM.
+
+        Returns:
+            tuple: A tuple containing:
+                - thought (str): The agent's reasoning.
+                - todo_list (list): The list of todo items.
+                - action_name (str): The name of the first action to execute.
+                - action_args (list): The arguments for the action.
+        """
+        thought, todo, actions = self._parse_actions(text)
+        if not actions:
+            return thought, todo, None, []
+        action, args = actions[0]
         return thought, todo, action, args
@@ -0,0 +1,316 @@
+# kernel/agent_pool.py
+"""
+Agent Worker Pool.
+
+The API server used to drive a single `ReActAgent`, so concurrent users
+queued behind one another. `AgentPool` runs submitted tasks on N worker
+threads, each owning its own `ReActAgent` (history and ToDo list are per
+agent and reset per task) while sharing the kernel's syscall handler, and
+with it the sandbox and memory store.
+
+Every task has a submitting user and its agent runs as that user: the
+worker threads are not processes, so without it the agent's syscalls would
+run as root. Tasks can be polled, cancelled (a running task stops before
+its next turn) and streamed by their owner: each task collects the agent's
+streamed tokens in an event log that clients read incrementally.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from loop.kernel.io import IOAdapter
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = frozenset({COMPLETED, FAILED, CANCELLED})
+
+DEFAULT_WORKERS = 4
+MAX_FINISHED = 256  # Finished tasks kept for polling
+
+
+class AgentTask:
+    """
+    A task submitted to the pool.
+
+    Attributes:
+        id (str): Task ID.
+        task (str): The task description.
+        user (str): Submitting user; the agent runs as this user.
+        status (str): QUEUED, RUNNING, COMPLETED, FAILED or CANCELLED.
+        result (str): The agent's final result.
+        error (str): Failure description.
+    """
+
+    def __init__(self, task_id, task, user):
+        """
+        Initialize the AgentTask.
+
+        Args:
+            task_id (str): Task ID.
+            task (str): The task description.
+            user (str): Submitting user.
+        """
+        self.id = task_id
+        self.task = task
+        self.user = user
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+        self._events = []
+        self._cond = threading.Condition()
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    def emit(self, kind, content):
+        """
+        Append an event to the task's stream.
+
+        Args:
+            kind (str): Event type ("token", "status").
+            content (str): Payload.
+        """
+        with self._cond:
+            self._events.append({"type": kind, "content": content})
+            self._cond.notify_all()
+
+    def _set_status(self, status):
+        with self._cond:
+            self.status = status
+            now = time.time()
+            if status == RUNNING:
+                self.started = now
+            elif status in FINISHED:
+                self.finished = now
+            self._events.append({"type": "status", "content": status})
+            self._cond.notify_all()
+
+    def events(self, since=0, timeout=None):
+        """
+        Read the events after `since`, waiting for new ones if there are none.
+
+        Args:
+            since (int): Number of events already read.
+            timeout (float, optional): Seconds to wait; None returns immediately.
+
+        Returns:
+            tuple: (events, next index). No new events and `done` means the stream ended.
+        """
+        with self._cond:
+            if timeout and len(self._events) <= since and not self.done:
+                self._cond.wait(timeout)
+            return self._events[since:], len(self._events)
+
+    def to_dict(self):
+        """
+        Describe the task.
+
+        Returns:
+            dict: JSON-friendly task state.
+        """
+        return {
+            "id": self.id,
+            "task": self.task,
+            "user": self.user,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class TaskIO(IOAdapter):
+    """
+    IO adapter that records an agent's streamed tokens in its current task.
+    """
+
+    def __init__(self):
+        self.task = None
+
+    def write(self, text: str):
+        if self.task is not None:
+            self.task.emit("text", text)
+
+    def read(self, prompt: str = "", password: bool = False) -> str:
+        return ""  # Pool agents never prompt
+
+    def flush(self):
+        pass
+
+    def stream(self, text: str):
+        if self.task is not None:
+            self.task.emit("token", text)
+
+
+class AgentPool:
+    """
+    Runs agent tasks concurrently on a fixed set of worker threads.
+
+    Attributes:
+        workers (int): Number of concurrent agents.
+    """
+
+    def __init__(self, syscall_handler, workers=DEFAULT_WORKERS, agent_factory=None, max_finished=MAX_FINISHED):
+        """
+        Initialize the AgentPool and start its workers.
+
+        Args:
+            syscall_handler (SyscallHandler): Kernel syscall handler shared by all agents.
+            workers (int, optional): Concurrent agents. Defaults to 4.
+            agent_factory (callable, optional): agent_factory(syscall_handler, io) -> agent.
+                Defaults to a streaming `ReActAgent`.
+            max_finished (int, optional): Finished tasks retained for polling.
+        """
+        self.sys = syscall_handler
+        self.workers = workers
+        self.max_finished = max_finished
+        self._factory = agent_factory or _default_agent
+        self._queue = queue.Queue()
+        self._tasks = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"loop-agent-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, task, user):
+        """
+        Queue a task.
+
+        Args:
+            task (str): The task description.
+            user (str): Submitting user; the agent runs as this user.
+
+        Returns:
+            AgentTask: The queued task.
+
+        Raises:
+            ValueError: If no user is given.
+        """
+        if not user:
+            raise ValueError("Agent tasks need a submitting user")
+        with self._lock:
+            agent_task = AgentTask(f"t{next(self._ids)}", task, user)
+            self._tasks[agent_task.id] = agent_task
+            self._prune()
+        agent_task.emit("status", QUEUED)
+        self._queue.put(agent_task)
+        return agent_task
+
+    def _prune(self):
+        """
+        Forget the oldest finished tasks beyond `max_finished`. Called with the lock held.
+        """
+        finished = [t.id for t in self._tasks.values() if t.done]
+        for task_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._tasks[task_id]
+
+    def get(self, task_id, user=None):
+        """
+        Look up a task.
+
+        Args:
+            task_id (str): Task ID.
+            user (str, optional): Only a task of this user.
+
+        Returns:
+            AgentTask: The task, or None if unknown or owned by someone else.
+        """
+        with self._lock:
+            task = self._tasks.get(task_id)
+        if task is None or (user is not None and task.user != user):
+            return None
+        return task
+
+    def list(self, user=None):
+        """
+        List known tasks, oldest first.
+
+        Args:
+            user (str, optional): Only tasks of this user.
+
+        Returns:
+            list[AgentTask]: The tasks.
+        """
+        with self._lock:
+            return [t for t in self._tasks.values() if user is None or t.user == user]
+
+    def cancel(self, task_id, user=None):
+        """
+        Cancel a task. A queued task never starts; a running one stops before its next turn.
+
+        Args:
+            task_id (str): Task ID.
+            user (str, optional): Only a task of this user.
+
+        Returns:
+            bool: True if the task existed and had not finished.
+        """
+        task = self.get(task_id, user)
+        if task is None or task.done:
+            return False
+        task.cancel_event.set()
+        with self._lock:
+            if task.status == QUEUED:
+                task._set_status(CANCELLED)
+        return True
+
+    def _worker(self):
+        io = TaskIO()
+        agent = None
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            with self._lock:
+                if task.status != QUEUED:
+                    continue  # Cancelled while queued
+                task._set_status(RUNNING)
+            io.task = task
+            try:
+                if agent is None:
+                    agent = self._factory(self.sys, io)
+                with self.sys.acting_as(task.user):
+                    result = agent.run(task.task, cancel=task.cancel_event)
+                task.result = result
+                task._set_status(CANCELLED if task.cancel_event.is_set() else COMPLETED)
+            except Exception as e:
+                task.error = str(e)
+                task._set_status(FAILED)
+            finally:
+                io.task = None
+
+    def shutdown(self, wait=True):
+        """
+        Cancel every unfinished task and stop the workers.
+
+        Args:
+            wait (bool, optional): Wait for running tasks to stop.
+        """
+        for task in self.list():
+            self.cancel(task.id)
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+def _default_agent(syscall_handler, io):
+    from loop.kernel.agent import ReActAgent
+    return ReActAgent(syscall_handler, stream=True, io=io)
@@ -0,0 +1,327 @@
+# kernel/async_scheduler.py
+"""
+Asyncio Scheduler Backend.
+
+This module provides `AsyncScheduler`, a drop-in alternative to `Scheduler`
+that runs on an asyncio event loop. Processes whose target is a coroutine
+(an `async def` call, or an `async def` function taking no arguments) run as
+asyncio tasks, so many agents can wait on network I/O concurrently. Legacy
+generator processes keep running through the regular run queues, one
+timeslice per tick, with the event loop serviced between ticks.
+"""
+
+import asyncio
+import contextvars
+import inspect
+import time
+import types
+from collections import deque
+
+from loop.kernel.process import ProcessState
+from loop.kernel.scheduler import Scheduler
+
+# Process owning the currently running asyncio task (None outside coroutine processes).
+_task_process = contextvars.ContextVar("loop_task_process", default=None)
+
+
+def is_coroutine_process(process):
+    """
+    Check whether a process should be driven as an asyncio task.
+
+    Args:
+        process (Process): The process.
+
+    Returns:
+        bool: True if the target is a coroutine or coroutine function.
+    """
+    target = getattr(process, "target", None)
+    return inspect.iscoroutine(target) or inspect.iscoroutinefunction(target)
+
+
+class AsyncScheduler(Scheduler):
+    """
+    Scheduler backend driven by an asyncio event loop.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): Loop used by `run()`; `run_async()`
+            uses whichever loop awaits it.
+        tasks (dict): Coroutine processes mapped to their asyncio tasks.
+    """
+
+    def __init__(self, loop=None):
+        """
+        Initialize the AsyncScheduler.
+
+        Args:
+            loop (asyncio.AbstractEventLoop, optional): Event loop for `run()`.
+                A private loop is created on first use if omitted.
+        """
+        self.loop = loop
+        self.tasks = {}
+        self._pending_tasks = deque()
+        self._event_futures = {}
+        self._running_loop = None
+        self._async_wakeup = None
+        super().__init__()
+
+    # ==========================
+    # Context
+    # ==========================
+
+    @property
+    def current_process(self):
+        """
+        The process on whose behalf code is running: the owning coroutine
+        process inside a task, otherwise the generator process being stepped.
+        """
+        proc = _task_process.get()
+        return proc if proc is not None else self._local.process
+
+    @current_process.setter
+    def current_process(self, value):
+        self._local.process = value
+
+    def isolate(self, step):
+        """
+        Move the process of a running step to a dedicated worker thread.
+
+        The event loop cannot migrate threads, so the overrunning step still
+        finishes on the loop thread; only later steps run isolated.
+
+        Args:
+            step (tuple): The step, as read from `current_step`.
+
+        Returns:
+            bool: True if the step was still running.
+        """
+        with self._lock:
+            if self.current_step is not step:
+                return False
+            self._isolate_process(step[1])
+        return True
+
+    # ==========================
+    # Process lifecycle
+    # ==========================
+
+    def _admit(self, process):
+        if not is_coroutine_process(process):
+            super()._admit(process)
+            return
+        self._pending_tasks.append(process)
+        self._kick()
+
+    def _evict(self, process):
+        task = self.tasks.pop(process, None)
+        if task is not None and not task.done():
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        super()._evict(process)
+
+    def signal(self, process):
+        """
+        Tell the scheduler a signal was delivered to a process.
+
+        Coroutine processes receiving SIGTERM/SIGKILL have their task cancelled;
+        generator processes are handled as in `Scheduler.signal`.
+
+        Args:
+            process (Process): The signalled process.
+        """
+        task = self.tasks.get(process)
+        if task is None:
+            super().signal(process)
+            return
+        if process.signal in ("SIGKILL", "SIGTERM"):
+            print(f"[scheduler] {process.pid} {'killed' if process.signal == 'SIGKILL' else 'terminated'}")
+            task.get_loop().call_soon_threadsafe(task.cancel)
+
+    def _start_pending(self):
+        """Create tasks for coroutine processes admitted since the last tick."""
+        loop = asyncio.get_running_loop()
+        while self._pending_tasks:
+            proc = self._pending_tasks.popleft()
+            if proc not in self.processes or proc in self.tasks:
+                continue
+            self.tasks[proc] = loop.create_task(self._drive(proc))
+
+    async def _drive(self, proc):
+        """Run a coroutine process to completion and reap it."""
+        _task_process.set(proc)
+        target = proc.target
+        if inspect.iscoroutinefunction(target):
+            target = target()
+        proc.state = ProcessState.RUNNING
+        try:
+            await _accounted(proc, target)
+            proc.exit_code = 0
+        except asyncio.CancelledError:
+            proc.exit_code = -9 if proc.signal == "SIGKILL" else -15
+        except Exception as e:
+            print(f"[process {proc.pid}] Error in process: {e}")
+            proc.exit_code = 1
+        finally:
+            proc.state = ProcessState.TERMINATED
+            self.tasks.pop(proc, None)
+            self.processes.discard(proc)
+            self._kick()
+
+    # ==========================
+    # Events
+    # ==========================
+
+    def notify(self, event, count=None):
+        """
+        Fire an event for parked generator processes and awaiting coroutines.
+
+        Args:
+            event (tuple): The event key.
+            count (int, optional): Maximum number of parked processes to wake.
+
+        Returns:
+            int: Number of processes and coroutines woken.
+        """
+        woken = super().notify(event, count)
+        futures = self._event_futures.pop(event, None)
+        if futures:
+            for fut in futures:
+                if not fut.done():
+                    fut.get_loop().call_soon_threadsafe(_resolve, fut)
+                    woken += 1
+        return woken
+
+    async def wait_for(self, event, timeout=None, predicate=None):
+        """
+        Await a kernel event from a coroutine process.
+
+        Args:
+            event (tuple): The event key (see `loop.kernel.events`).
+            timeout (float, optional): Seconds to wait before giving up.
+            predicate (callable, optional): Checked after registering; if it
+                returns True the wait completes immediately (avoids lost wakeups).
+
+        Returns:
+            bool: True if the event fired (or predicate held), False on timeout.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        self._event_futures.setdefault(event, []).append(fut)
+        try:
+            if predicate is not None and predicate():
+                return True
+            await asyncio.wait_for(fut, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            futures = self._event_futures.get(event)
+            if futures and fut in futures:
+                futures.remove(fut)
+                if not futures:
+                    del self._event_futures[event]
+
+    def _kick(self):
+        super()._kick()
+        loop, wakeup = self._running_loop, self._async_wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def _idle_async(self):
+        self._async_wakeup.clear()
+        if self.runnable_count() or self._pending_tasks or not self.running:
+            return
+        timeout = self.idle_timeout
+        with self._lock:
+            next_timer = self.timers.next_delay()
+        if next_timer is not None:
+            timeout = min(timeout, next_timer)
+        try:
+            await asyncio.wait_for(self._async_wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    # ==========================
+    # Main loop
+    # ==========================
+
+    async def run_async(self, max_steps=None):
+        """
+        Run the scheduling loop on the current event loop.
+
+        Each iteration starts newly admitted coroutine processes, runs one
+        `tick()` for generator processes and then yields to the event loop.
+        When nothing is runnable it awaits the next timer or wakeup instead.
+
+        Args:
+            max_steps (int, optional): Maximum number of loop iterations to run.
+        """
+        self._running_loop = asyncio.get_running_loop()
+        self._async_wakeup = asyncio.Event()
+        self.running = True
+        steps = 0
+        try:
+            while self.running and self.processes:
+                if max_steps is not None and steps >= max_steps:
+                    break
+                steps += 1
+                self._start_pending()
+                if not self.runnable_count():
+                    await self._idle_async()
+                self.tick()
+                await asyncio.sleep(0)
+        finally:
+            self._running_loop = None
+            self._async_wakeup = None
+
+    def run(self, max_steps=None):
+        """
+        Run the scheduling loop on this scheduler's own event loop (blocking).
+
+        Coroutine processes keep their tasks between calls, so `run(max_steps=n)`
+        can be called repeatedly.
+
+        Args:
+            max_steps (int, optional): Maximum number of loop iterations to run.
+        """
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.run_async(max_steps))
+
+    def close(self):
+        """
+        Cancel outstanding coroutine processes and close the private event loop.
+        """
+        if self.loop is None or self.loop.is_closed():
+            return
+        tasks = [t for t in self.tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+
+def _resolve(fut):
+    if not fut.done():
+        fut.set_result(True)
+
+
+@types.coroutine
+def _accounted(proc, coro):
+    """Await `coro`, charging each resumption of it to `proc` (see `Process.account`)."""
+    value, error = None, None
+    while True:
+        start_ns = time.perf_counter_ns()
+        start_cpu_ns = time.thread_time_ns()
+        try:
+            if error is not None:
+                request = coro.throw(error)
+            else:
+                request = coro.send(value)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            proc.account(time.perf_counter_ns() - start_ns, time.thread_time_ns() - start_cpu_ns)
+        value, error = None, None
+        try:
+            value = yield request
+        except BaseException as exc:
+            error = exc
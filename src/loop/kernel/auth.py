@@ -0,0 +1,269 @@
+# kernel/auth.py
+"""
+Authentication Support.
+
+Argon2 verification is deliberately slow (tens of milliseconds) and used to
+run on whichever thread called `UserManager.authenticate()`. This module
+provides the pieces `UserManager` uses to keep it off the shell, scheduler
+and API event loop:
+
+    get_auth_pool()  shared thread pool, sized to the CPU count, that runs
+                     Argon2 verifications (argon2-cffi releases the GIL while
+                     hashing, so logins verify in parallel)
+    FailureLimiter   sliding-window count of failed logins per key, used to
+                     throttle per user and source, per user and per source
+                     address
+    SessionCache     short-lived session tokens issued after a successful
+                     login, so repeated API calls skip Argon2
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_USER_FAILURES = 5       # Failed logins per user and source per window
+MAX_ACCOUNT_FAILURES = 50   # Failed logins per user from all sources per window
+MAX_SOURCE_FAILURES = 20    # Failed logins per source (e.g. client address) per window
+FAILURE_WINDOW = 60.0       # Seconds
+SESSION_TTL = 900.0         # Seconds a session token stays valid
+MAX_SESSIONS = 4096
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_auth_pool():
+    """
+    Return the shared authentication thread pool, creating it on first use.
+
+    Returns:
+        ThreadPoolExecutor: The pool.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="loop-auth")
+    return _pool
+
+
+class FailureLimiter:
+    """
+    Sliding-window limiter of failed attempts per key.
+
+    Attributes:
+        limit (int): Failures allowed per window before the key is throttled.
+        window (float): Window length in seconds.
+    """
+    MAX_KEYS = 10000  # Expired keys are swept once this many are tracked
+
+    def __init__(self, limit, window=FAILURE_WINDOW):
+        """
+        Initialize the FailureLimiter.
+
+        Args:
+            limit (int): Failures allowed per window.
+            window (float, optional): Window length in seconds. Defaults to 60s.
+        """
+        self.limit = limit
+        self.window = window
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, key, now):
+        stamps = self._failures.get(key)
+        if stamps is None:
+            return None
+        cutoff = now - self.window
+        while stamps and stamps[0] <= cutoff:
+            stamps.popleft()
+        if not stamps:
+            del self._failures[key]
+            return None
+        return stamps
+
+    def allowed(self, key):
+        """
+        Check whether another attempt for `key` may proceed.
+
+        Args:
+            key (hashable): User/source pair or source identifier (None is never throttled).
+
+        Returns:
+            bool: False while the key has reached its failure limit.
+        """
+        if key is None:
+            return True
+        with self._lock:
+            stamps = self._prune(key, time.monotonic())
+            return stamps is None or len(stamps) < self.limit
+
+    def acquire(self, key):
+        """
+        Reserve an attempt, counted as a failure unless `release()`d.
+
+        Checking the limit and counting the attempt is one atomic step, so
+        concurrent attempts cannot all get past a limit before any of them
+        has failed.
+
+        Args:
+            key (hashable): User/source pair or source identifier (None is never throttled).
+
+        Returns:
+            bool: False if the key has reached its failure limit (nothing is reserved).
+        """
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            stamps = self._prune(key, now)
+            if stamps is not None and len(stamps) >= self.limit:
+                return False
+            self._append(key, stamps, now)
+            return True
+
+    def release(self, key):
+        """
+        Withdraw an attempt reserved with `acquire()` that did not fail.
+
+        Args:
+            key (hashable): The key passed to `acquire()`.
+        """
+        if key is None:
+            return
+        with self._lock:
+            stamps = self._failures.get(key)
+            if stamps:
+                stamps.pop()
+                if not stamps:
+                    del self._failures[key]
+
+    def record_failure(self, key):
+        """
+        Count a failed attempt.
+
+        Args:
+            key (hashable): User/source pair or source identifier.
+        """
+        if key is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._append(key, self._prune(key, now), now)
+
+    def _append(self, key, stamps, now):
+        """
+        Add a failure stamp. Called with the lock held.
+        """
+        if stamps is None:
+            if len(self._failures) >= self.MAX_KEYS:
+                for stale in list(self._failures):
+                    self._prune(stale, now)
+            stamps = self._failures[key] = deque(maxlen=self.limit)
+        stamps.append(now)
+
+    def reset(self, key):
+        """
+        Forget the failures of a key (e.g. after a successful login).
+
+        Args:
+            key (hashable): User/source pair or source identifier.
+        """
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class SessionCache:
+    """
+    Short-lived session tokens mapping to an authenticated user.
+
+    Attributes:
+        ttl (float): Token lifetime in seconds.
+        max_sessions (int): Oldest tokens are dropped beyond this many.
+    """
+
+    def __init__(self, ttl=SESSION_TTL, max_sessions=MAX_SESSIONS):
+        """
+        Initialize the SessionCache.
+
+        Args:
+            ttl (float, optional): Token lifetime in seconds. Defaults to 15 minutes.
+            max_sessions (int, optional): Maximum live tokens.
+        """
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # token -> (user, expires), oldest first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def issue(self, user):
+        """
+        Create a session token for an authenticated user.
+
+        Args:
+            user (str): Username.
+
+        Returns:
+            str: The token.
+        """
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sessions[token] = (user, time.monotonic() + self.ttl)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return token
+
+    def validate(self, token):
+        """
+        Resolve a token to its user.
+
+        Args:
+            token (str): Session token.
+
+        Returns:
+            str: The username, or None if the token is unknown or expired.
+        """
+        if not token:
+            return None
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._sessions[token]
+                return None
+            return entry[0]
+
+    def revoke(self, token):
+        """
+        Invalidate one token.
+
+        Args:
+            token (str): Session token.
+
+        Returns:
+            bool: True if the token existed.
+        """
+        with self._lock:
+            return self._sessions.pop(token, None) is not None
+
+    def revoke_user(self, user):
+        """
+        Invalidate every token of a user (e.g. after deletion).
+
+        Args:
+            user (str): Username.
+
+        Returns:
+            int: Number of tokens revoked.
+        """
+        with self._lock:
+            stale = [t for t, (u, _) in self._sessions.items() if u == user]
+            for token in stale:
+                del self._sessions[token]
+        return len(stale)
@@ -17,7 +17,10 @@ from loop.kernel.users import UserManager
 from loop.kernel.syscall import SyscallHandler
 from loop.kernel.sandbox import AgentSandbox
 from loop.kernel.scheduler import Scheduler
+from loop.kernel.async_scheduler import AsyncScheduler
+from loop.kernel.watchdog import Watchdog
 from loop.kernel.network import NetworkManager, NetworkGuard
+from loop.kernel.httpclient import get_http_client
 from loop.servicemanager.servicemanager import ServiceManager
 from loop.kernel.plugins.loader import PluginLoader
 from loop.shell.shell import Shell
@@ -73,7 +76,16 @@ def boot() -> LoopKernel:
         # 4. Initialize syscall handler
         # We need Scheduler and NetworkManager for SyscallHandler
         log("Initializing core services (Scheduler, Network)...")
-        scheduler = Scheduler()
+        if config["kernel"].get("scheduler") == "asyncio":
+            log("Using asyncio scheduler backend")
+            scheduler = AsyncScheduler()
+        else:
+            scheduler = Scheduler()
+        if config["kernel"].get("watchdog_enabled") == "true":
+            action = config["kernel"].get("watchdog_action", "isolate")
+            timeslice = float(config["kernel"].get("watchdog_timeslice", "2.0"))
+            Watchdog(scheduler, timeslice=timeslice, action=action).start()
+            log(f"Watchdog armed ({action} after {timeslice}s)")
         network_manager = NetworkManager(user_manager)
 
         # Enforce network config
@@ -87,19 +99,23 @@ def boot() -> LoopKernel:
 
         # Apply Network Guard
         log("Engaging NetworkGuard...")
-        network_guard = NetworkGuard(network_manager)
+        network_guard = NetworkGuard(network_manager, identify=syscall_handler.current_identity)
 
         # NOTE: NetworkGuard.enable() activates the restriction (BLOCKS traffic).
         # If network_enabled is FALSE, we want to BLOCK traffic -> Call enable().
-        # If network_enabled is TRUE, we want to ALLOW traffic -> Do NOT call enable().
+        # If network_enabled is TRUE, we want to ALLOW traffic -> only enforce the
+        # per-destination policy. It is empty by default, and sockets are only
+        # patched once it gets rules or limits.
 
         if config["kernel"].get("network_enabled") == "true":
-            log("Network is ENABLED. Guard is inactive.")
-            # Do not enable the guard, allowing traffic.
+            log("Network is ENABLED. Guard enforces the network policy only.")
+            network_guard.enable(enforce_state=False)
         else:
             log("Network is DISABLED. Guard is ACTIVE.")
             network_guard.enable() # This blocks network traffic
 
+        # Pooled HTTP connections skip connect(): the shared client asks the guard per request
+        get_http_client().guard = network_guard
         log("NetworkGuard configured")
 
         # 5. Create shared sandbox for both Kernel and Agent
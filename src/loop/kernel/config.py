@@ -16,6 +16,10 @@ DEFAULT_CONFIG = {
         "network_enabled": "true",
         "gui_enabled": "false",
         "log_level": "INFO",
+        "scheduler": "cooperative",  # or "asyncio"
+        "watchdog_enabled": "false",   # opt-in: preempt steps that never yield
+        "watchdog_timeslice": "2.0",   # seconds a single process step may run
+        "watchdog_action": "isolate",  # log | interrupt | isolate
     },
     "filesystem": {
         "mounts": "/tmp,/var/log",
@@ -6,6 +6,7 @@ Manages risk levels and requires explicit user approval for dangerous actions.
 """
 
 import json
+import threading
 import time
 from pathlib import Path
 from rich.console import Console
@@ -29,6 +30,7 @@ class ConfirmationManager:
         self.whitelist = self._load_whitelist()
         self.console = Console()
         self.request_history = [] # List of timestamps
+        self._lock = threading.Lock() # Parallel agent actions prompt one at a time
 
     def _load_whitelist(self):
         if self.config_path.exists():
@@ -67,6 +69,10 @@ class ConfirmationManager:
         Returns:
             bool: True if approved, False otherwise.
         """
+        with self._lock:
+            return self._request_approval(action, args)
+
+    def _request_approval(self, action, args):
         risk = self.assess_risk(action)
 
         # Check whitelist
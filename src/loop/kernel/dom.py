@@ -5,8 +5,76 @@ System DOM Representation.
 This module provides the `SystemDOM` class, which converts the current
 operating system state (filesystem, processes, users) into a structured
 dictionary (DOM-like) format for the AI agent to consume.
+
+The DOM is versioned: every section (filesystem, processes, users, docker,
+k8s_pods) records the DOM version at which its content last changed, so
+`get_delta(since_version)` can return only the sections that changed since
+an earlier observation. Filesystem subtrees are cached and rebuilt only
+below directories that changed: in-memory directories carry a version
+counter, host directories are compared by mtime.
+
+With `fs_depth` or `fs_token_budget` set, the filesystem section is a lazy
+view instead of the full tree: directories are expanded breadth-first, the
+paths the agent touched recently (see `touch()`) first, down to `fs_depth`.
+Directories that are not expanded show their entry counts, and listings are
+cut short (with a count of the omitted entries) once the serialized view
+would exceed the token budget, so its size is independent of the workspace.
+
+Each section comes from a provider, and `refresh()` runs the providers
+concurrently, each with its own deadline. A provider that misses its
+deadline (an unreachable Docker daemon or cluster) or fails keeps serving
+its last good snapshot, reported in "stale", while the call goes on in the
+background; its result is picked up by a later refresh, and no second call
+is started while one is in flight. Providers run as the caller of
+`refresh()` (see `SyscallHandler.caller_context`), and a snapshot taken as
+another caller is never shown. Plugins add sections with
+`register_provider()`.
 """
 
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from loop.kernel import rootfs
+
+SECTIONS = ("filesystem", "processes", "users", "docker", "k8s_pods")
+
+DEFAULT_FS_DEPTH = 3            # Directory levels expanded in the lazy view
+DEFAULT_FS_TOKEN_BUDGET = 1500  # Approximate tokens (chars / 4) for the lazy view
+MAX_FOCUS_PATHS = 16            # Recently touched paths expanded first
+MAX_HOST_LISTINGS = 4096        # Cached host directory listings
+MORE_MARKER = 16                # Chars reserved for a '"more": n' entry
+
+DEFAULT_PROVIDER_TIMEOUT = 1.0  # Seconds a refresh waits for a provider
+DEFAULT_TIMEOUTS = {"filesystem": 2.0, "docker": 0.5, "k8s_pods": 0.5}
+MAX_PROVIDER_THREADS = 16       # One in-flight call per provider at most
+
+
+class _Provider:
+    """
+    A DOM section source and its last good snapshot.
+    """
+    __slots__ = ("name", "func", "timeout", "default", "snapshot", "error", "future", "future_caller")
+
+    def __init__(self, name, func, timeout, default):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.default = default
+        # (caller, value, monotonic time) of the last good snapshot, replaced as a whole
+        self.snapshot = (None, default, None)
+        self.error = None
+        self.future = None    # Latest call, in flight until done
+        self.future_caller = None
+
 
 class SystemDOM:
     """
@@ -16,15 +84,183 @@ class SystemDOM:
 
     Attributes:
         sys (SyscallHandler): The system call handler to access kernel state.
+        version (int): Bumped whenever any section changes.
     """
-    def __init__(self, syscall_handler):
+    def __init__(self, syscall_handler, fs_depth=None, fs_token_budget=None, timeouts=None):
         """
         Initialize the SystemDOM.
 
         Args:
             syscall_handler (SyscallHandler): The kernel syscall handler.
+            fs_depth (int, optional): Directory levels to expand (1 lists only the
+                root). None for no depth limit.
+            fs_token_budget (int, optional): Approximate token size limit of the
+                filesystem section. None for no limit.
+            timeouts (dict, optional): Section name -> seconds a refresh waits for
+                its provider, overriding DEFAULT_TIMEOUTS.
         """
         self.sys = syscall_handler
+        self.fs_depth = fs_depth
+        self.fs_token_budget = fs_token_budget
+        self.stale = []                              # Sections serving an old snapshot
+        self._focus = OrderedDict()                  # Recently touched paths, most recent last
+        self._focus_lock = threading.Lock()
+        self._host_listings = {}                     # path -> (mtime_ns, entries)
+        self.version = 0
+        self._sections = {}                          # name -> (value, version)
+        self._node_trees = weakref.WeakKeyDictionary()  # DirectoryNode -> (version, tree)
+        self._host_trees = {}                        # path -> (mtime_ns, tree)
+        self._lock = threading.RLock()
+        self._providers = OrderedDict()              # name -> _Provider
+        self._executor = None
+
+        timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        builtins = {
+            "filesystem": (self._build_filesystem, {"type": "unknown"}),
+            "processes": (lambda: self.sys.sys_proc_list(), []),
+            "users": (lambda: self.sys.user_manager.list_users(), []),
+            "docker": (lambda: self._build_cloud(self.sys.sys_docker_ps), []),
+            "k8s_pods": (lambda: self._build_cloud(self.sys.sys_k8s_get_pods), []),
+        }
+        for name in SECTIONS:
+            func, default = builtins[name]
+            self.register_provider(name, func, timeouts.get(name, DEFAULT_PROVIDER_TIMEOUT), default)
+
+    def register_provider(self, name, func, timeout=DEFAULT_PROVIDER_TIMEOUT, default=None):
+        """
+        Add a section to the DOM, or replace the provider of an existing one.
+
+        Args:
+            name (str): Section name.
+            func (callable): func() -> JSON-serializable section value. Runs on a
+                worker thread.
+            timeout (float, optional): Seconds a refresh waits for it.
+            default (optional): Value shown until the first snapshot arrives.
+        """
+        with self._lock:
+            old = self._providers.get(name)
+            provider = _Provider(name, func, timeout, default)
+            if old is not None and old.snapshot[2] is not None:
+                provider.snapshot = old.snapshot
+            self._providers[name] = provider
+
+    def unregister_provider(self, name):
+        """
+        Remove a section from the DOM.
+
+        Args:
+            name (str): Section name.
+        """
+        with self._lock:
+            if self._providers.pop(name, None) is not None and self._sections.pop(name, None) is not None:
+                self.version += 1
+
+    @property
+    def sections(self):
+        """
+        Names of the DOM sections, in order.
+        """
+        return list(self._providers)
+
+    def refresh(self):
+        """
+        Observe every section and bump the versions of those that changed.
+
+        Providers run concurrently, as the calling thread's user and process.
+        One that misses its deadline or fails keeps its last good snapshot and
+        is listed in `stale`.
+
+        Returns:
+            int: The current DOM version.
+        """
+        with self._lock:
+            start = time.monotonic()
+            caller, context = self._capture_caller()
+            providers = list(self._providers.values())
+            futures = []
+            for provider in providers:
+                future = provider.future
+                if future is None or future.done() or provider.future_caller != caller:
+                    # Nothing in flight for this caller: revalidate
+                    future = provider.future = self._pool().submit(self._fetch, provider, caller, context)
+                    provider.future_caller = caller
+                futures.append(future)
+
+            stale = []
+            for provider, future in zip(providers, futures):
+                remaining = start + provider.timeout - time.monotonic()
+                try:
+                    future.result(timeout=max(0.0, remaining))
+                except FutureTimeout:
+                    pass
+                owner, value, fetched = provider.snapshot
+                if owner != caller:
+                    # Another user's snapshot (e.g. their containers) must not show
+                    value, fetched = provider.default, None
+                if fetched is None or fetched < start:
+                    stale.append(provider.name)
+                self._update(provider.name, value)
+            self.stale = stale
+            return self.version
+
+    def _capture_caller(self):
+        """
+        Identify the calling thread and capture its identity for the provider
+        threads, which would otherwise run their syscalls as root.
+
+        Returns:
+            tuple: (identity, callable returning a context manager).
+        """
+        capture = getattr(self.sys, "caller_context", None)
+        identify = getattr(self.sys, "current_identity", None)
+        if capture is None or identify is None:
+            return None, nullcontext
+        return identify(), capture()
+
+    def _fetch(self, provider, caller=None, context=nullcontext):
+        """
+        Call a provider as `caller` and keep its result as the last good
+        snapshot. Runs on a worker thread.
+        """
+        try:
+            with context():
+                value = provider.func()
+        except Exception as e:
+            provider.error = f"{type(e).__name__}: {e}"
+        else:
+            provider.snapshot = (caller, value, time.monotonic())
+            provider.error = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_PROVIDER_THREADS, thread_name_prefix="loop-dom")
+        return self._executor
+
+    def close(self):
+        """
+        Stop the provider threads. Calls still in flight are not waited for.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _update(self, name, value):
+        entry = self._sections.get(name)
+        if entry is not None and (entry[0] is value or entry[0] == value):
+            return
+        self.version += 1
+        self._sections[name] = (value, self.version)
+
+    def section_versions(self):
+        """
+        Report the version at which each section last changed.
+
+        Returns:
+            dict: Section name -> version.
+        """
+        with self._lock:
+            return {name: entry[1] for name, entry in self._sections.items()}
 
     def get_state(self):
         """
@@ -35,33 +271,251 @@ class SystemDOM:
         JSON-serializable dictionary.
 
         Returns:
-            dict: A dictionary containing 'filesystem', 'processes', 'users', 'docker', and 'k8s_pods'.
+            dict: A dictionary containing 'filesystem', 'processes', 'users', 'docker',
+            'k8s_pods' and any plugin sections, plus 'stale' (names of the sections
+            showing an old snapshot) if there are any.
         """
-        # Get docker state
-        docker_state = []
+        with self._lock:
+            self.refresh()
+            state = {name: self._sections[name][0] for name in self._providers}
+            if self.stale:
+                state["stale"] = list(self.stale)
+            return state
+
+    def get_delta(self, since_version=0):
+        """
+        Returns the sections that changed after `since_version`.
+
+        Args:
+            since_version (int, optional): A version returned by an earlier call
+                (0 for everything). Defaults to 0.
+
+        Returns:
+            dict: 'version' (current version), 'changed' (section name -> value)
+            and 'unchanged' (names of the omitted sections), plus 'stale' (names of
+            the sections showing an old snapshot) if there are any.
+        """
+        with self._lock:
+            version = self.refresh()
+            changed = {
+                name: self._sections[name][0] for name in self._providers
+                if self._sections[name][1] > since_version
+            }
+            delta = {
+                "version": version,
+                "changed": changed,
+                "unchanged": [name for name in self._providers if name not in changed],
+            }
+            if self.stale:
+                delta["stale"] = list(self.stale)
+            return delta
+
+    def touch(self, path):
+        """
+        Mark a path as recently used, so the lazy filesystem view expands it first.
+
+        Args:
+            path (str): Path as used by the agent.
+        """
+        path = _normalize(path)
+        with self._focus_lock:
+            self._focus.pop(path, None)
+            self._focus[path] = None
+            while len(self._focus) > MAX_FOCUS_PATHS:
+                self._focus.popitem(last=False)
+
+    def _build_cloud(self, syscall):
         try:
-            res = self.sys.sys_docker_ps()
+            res = syscall()
             if res.get("success"):
-                docker_state = res.get("data", [])
+                return res.get("data", [])
         except Exception:
             pass
+        return []
+
+    def _build_filesystem(self):
+        """
+        Build the filesystem tree from the in-memory filesystem if the kernel has
+        one, otherwise from the host root filesystem.
+
+        Returns:
+            dict: The tree.
+        """
+        fs = getattr(self.sys, "fs", None)
+        if self.fs_depth is not None or self.fs_token_budget is not None:
+            if fs is not None:
+                return self._get_fs_view(fs.root, self._list_node)
+            return self._get_fs_view(str(rootfs.get_resolved_root()), self._list_host)
+        if fs is not None:
+            return self._get_fs_tree(fs.root)
+        return self._get_host_tree(str(rootfs.get_resolved_root()))
+
+    def _get_fs_view(self, root, list_dir):
+        """
+        Build the depth- and budget-bounded filesystem view.
+
+        Directories are expanded in priority order: those leading to recently
+        touched paths first (only their focused entries; the rest of their
+        listing waits its turn), then breadth-first down to `fs_depth`. The
+        view is complete up to where the token budget runs out.
+
+        Args:
+            root: Root directory source (DirectoryNode or host path).
+            list_dir (callable): list_dir(source) -> [(name, is_dir, child_source, attrs)].
+
+        Returns:
+            dict: The view. Expanded directories have "children" (and "more",
+            the number of entries left out, if the listing was cut short); the
+            others have "files"/"dirs" counts.
+        """
+        max_depth = self.fs_depth if self.fs_depth is not None else float("inf")
+        budget = self.fs_token_budget * 4 if self.fs_token_budget is not None else float("inf")
+        # Directories on the way to a recently touched path, ranked by recency
+        with self._focus_lock:
+            touched = list(reversed(self._focus))
+        focus = {}
+        for rank, path in enumerate(touched):
+            parts = [p for p in path.split("/") if p]
+            for i in range(len(parts) + 1):
+                focus.setdefault("/" + "/".join(parts[:i]), rank)
+
+        view = {"type": "directory"}
+        view.update(self._summary(root, list_dir))
+        used = _size(view)
+        order = itertools.count()
+        queue = [((0, 0), next(order), "/", root, 0, view, None)]
+
+        while queue:
+            _, _, vpath, source, depth, node, pending = heapq.heappop(queue)
+            before = _size(node)
+            if pending is None:
+                # Expand: the counts give way to the listing
+                entries = sorted(
+                    list_dir(source),
+                    key=lambda e: (focus.get(_join(vpath, e[0]), len(focus)), not e[1], e[0]),
+                )
+                summary = {"files": node.pop("files", 0), "dirs": node.pop("dirs", 0)}
+                node["children"] = {}
+                items, rest = entries, []
+                if vpath in focus:
+                    items = [e for e in entries if _join(vpath, e[0]) in focus]
+                    rest = entries[len(items):]
+                    if rest:
+                        node["more"] = len(rest)  # Until the rest is listed
+                if used + _size(node) - before > budget:
+                    node.pop("children")
+                    node.pop("more", None)
+                    node.update(summary)
+                    break
+                if rest:
+                    heapq.heappush(queue, ((1, depth), next(order), vpath, source, depth, node, rest))
+            else:
+                items = pending
+                del node["more"]
+            used += _size(node) - before
+
+            children = node["children"]
+            for i, (name, is_dir, child_source, attrs) in enumerate(items):
+                entry = dict(attrs)
+                entry["type"] = "directory" if is_dir else "file"
+                if is_dir:
+                    entry.update(self._summary(child_source, list_dir))
+                cost = _size(name) + _size(entry) + 4
+                if used + cost + MORE_MARKER > budget:
+                    # Out of budget: note what is left out here and stop
+                    node["more"] = node.get("more", 0) + len(items) - i
+                    queue = []
+                    break
+                children[name] = entry
+                used += cost
+                child_path = _join(vpath, name)
+                if is_dir:
+                    if child_path in focus:
+                        priority = (0, focus[child_path])
+                    elif depth + 1 < max_depth:
+                        priority = (1, depth + 1)
+                    else:
+                        continue
+                    heapq.heappush(queue, (priority, next(order), child_path, child_source, depth + 1, entry, None))
+        return view
 
-        # Get K8s state
-        k8s_state = []
+    def _summary(self, source, list_dir):
+        entries = list_dir(source)
+        dirs = sum(1 for e in entries if e[1])
+        return {"files": len(entries) - dirs, "dirs": dirs}
+
+    def _list_node(self, node):
+        entries = []
+        for name, child in node.children.items():
+            attrs = {"permissions": child.permissions.mode, "owner": child.permissions.owner}
+            entries.append((name, type(child).__name__ == "DirectoryNode", child, attrs))
+        return entries
+
+    def _list_host(self, path):
+        """
+        List a host directory, cached until its mtime changes.
+        """
         try:
-            res = self.sys.sys_k8s_get_pods()
-            if res.get("success"):
-                k8s_state = res.get("data", [])
-        except Exception:
-            pass
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        cached = self._host_listings.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with os.scandir(path) as it:
+                entries = [(e.name, e.is_dir(follow_symlinks=False), e.path, {}) for e in it]
+        except OSError:
+            entries = []
+        if len(self._host_listings) >= MAX_HOST_LISTINGS:
+            self._host_listings.clear()
+        self._host_listings[path] = (mtime, entries)
+        return entries
 
-        return {
-            "filesystem": self._get_fs_tree(self.sys.fs.root),
-            "processes": self.sys.sys_proc_list(),
-            "users": self.sys.user_manager.list_users(),
-            "docker": docker_state,
-            "k8s_pods": k8s_state
-        }
+    def _get_host_tree(self, path):
+        """
+        Build the tree of a host directory, reusing cached subtrees.
+
+        A directory's mtime changes when entries are added, removed or renamed,
+        so its listing is re-read only then; subdirectories are still visited
+        since their changes do not touch the parent's mtime.
+
+        Args:
+            path (str): Absolute host path.
+
+        Returns:
+            dict: The directory node (the cached object if nothing below changed).
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._host_trees.pop(path, None)
+            return {"type": "unknown"}
+
+        cached = self._host_trees.get(path)
+        if cached is not None and cached[0] == mtime:
+            old_children = cached[1]["children"]
+            names = [(name, child["type"] == "directory") for name, child in old_children.items()]
+        else:
+            old_children = cached[1]["children"] if cached is not None else {}
+            try:
+                with os.scandir(path) as it:
+                    names = sorted((e.name, e.is_dir(follow_symlinks=False)) for e in it)
+            except OSError:
+                names = []
+
+        children = {}
+        for name, is_dir in names:
+            children[name] = self._get_host_tree(os.path.join(path, name)) if is_dir else {"type": "file"}
+
+        if cached is not None and children == old_children and all(
+            children[n] is old_children[n] for n, is_dir in names if is_dir
+        ):
+            tree = cached[1]
+        else:
+            tree = {"type": "directory", "children": children}
+        self._host_trees[path] = (mtime, tree)
+        return tree
 
     def _get_fs_tree(self, node, path="/"):
         """
@@ -91,14 +545,36 @@ class SystemDOM:
                 # "size": len(node.data) # Optional
             }
         elif node_type == "DirectoryNode":
+            # Nothing below this directory changed: reuse the cached subtree
+            version = getattr(node, "version", None)
+            cached = self._node_trees.get(node) if version is not None else None
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
             children = {}
             for name, child in node.children.items():
                 child_path = path + name + "/" if path == "/" else path + "/" + name
                 children[name] = self._get_fs_tree(child, child_path)
-            return {
+            tree = {
                 "type": "directory",
                 "permissions": node.permissions.mode,
                 "owner": node.permissions.owner,
                 "children": children
             }
+            if version is not None:
+                self._node_trees[node] = (version, tree)
+            return tree
         return {"type": "unknown"}
+
+
+def _normalize(path):
+    parts = [p for p in str(path).replace("\\", "/").split("/") if p and p != "."]
+    return "/" + "/".join(parts)
+
+
+def _join(parent, name):
+    return parent + name if parent == "/" else parent + "/" + name
+
+
+def _size(value):
+    return len(json.dumps(value, default=str))
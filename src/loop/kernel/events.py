@@ -0,0 +1,176 @@
+# kernel/events.py
+"""
+Kernel Wait Events.
+
+This module defines the event keys processes can block on and the `Wait`
+request a generator yields to block itself. A blocked process is parked in the
+scheduler's wait queue for its event and costs nothing until the event fires.
+
+Event keys are plain hashable tuples so any subsystem can fire them:
+    ("ipc", pid)     - a message was delivered to `pid`'s inbox
+    ("ipc_space", pid) - `pid`'s full inbox has room again
+    ("exit", pid)    - process `pid` exited or was removed
+    ("file", path)   - the virtual file `path` was written, appended or deleted
+    ("timer", id)    - timer `id` expired
+    ("worker", pid)  - the OS worker hosting process `pid` has output or exited
+"""
+
+import posixpath
+
+IPC = "ipc"
+IPC_SPACE = "ipc_space"
+EXIT = "exit"
+FILE = "file"
+TIMER = "timer"
+WORKER = "worker"
+
+
+def ipc_event(pid):
+    """
+    Event fired when a message arrives in the inbox of `pid`.
+
+    Args:
+        pid (int): Receiving process ID.
+
+    Returns:
+        tuple: The event key.
+    """
+    return (IPC, pid)
+
+
+def ipc_space_event(pid):
+    """
+    Event fired when the full inbox of `pid` frees a slot.
+
+    Args:
+        pid (int): Receiving process ID.
+
+    Returns:
+        tuple: The event key.
+    """
+    return (IPC_SPACE, pid)
+
+
+def exit_event(pid):
+    """
+    Event fired when process `pid` exits.
+
+    Args:
+        pid (int): Process ID.
+
+    Returns:
+        tuple: The event key.
+    """
+    return (EXIT, pid)
+
+
+def file_event(path):
+    """
+    Event fired when the file at virtual path `path` changes.
+
+    Args:
+        path (str): Virtual (rootfs) path.
+
+    Returns:
+        tuple: The event key.
+    """
+    return (FILE, posixpath.normpath("/" + str(path).lstrip("/")))
+
+
+def timer_event(timer_id):
+    """
+    Event fired when timer `timer_id` expires.
+
+    Args:
+        timer_id (int): Timer identifier.
+
+    Returns:
+        tuple: The event key.
+    """
+    return (TIMER, timer_id)
+
+
+def worker_event(pid):
+    """
+    Event fired when the OS worker hosting process `pid` has data or exits.
+
+    Args:
+        pid (int): Process ID of the pinned process.
+
+    Returns:
+        tuple: The event key.
+    """
+    return (WORKER, pid)
+
+
+def worker_slot_event():
+    """
+    Event fired when a worker slot frees up in the worker pool.
+
+    Returns:
+        tuple: The event key.
+    """
+    return (WORKER, None)
+
+
+class Wait:
+    """
+    Blocking request yielded by a process generator.
+
+    The wait is registered only when the step yields, so an event fired
+    between checking a condition and yielding `Wait` is missed. Events that
+    can fire from another thread need the wait registered before the
+    re-check; for IPC, `sys_recv(block=True)` does that:
+
+    Example:
+        msg = sys.sys_recv(block=True)
+        while msg is None:
+            yield  # Parked until a message arrives
+            msg = sys.sys_recv(block=True)
+
+    Attributes:
+        event (tuple): The event key to block on.
+    """
+    __slots__ = ("event",)
+
+    def __init__(self, event):
+        """
+        Initialize the Wait request.
+
+        Args:
+            event (tuple): The event key to block on.
+        """
+        self.event = event
+
+    def __repr__(self):
+        return f"Wait({self.event!r})"
+
+
+class Sleep:
+    """
+    Sleep request yielded by a process generator.
+
+    The scheduler parks the process on a timer and resumes it once `seconds`
+    have elapsed, without blocking other processes.
+
+    Example:
+        while True:
+            do_work()
+            yield Sleep(3)
+
+    Attributes:
+        seconds (float): Sleep duration.
+    """
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds):
+        """
+        Initialize the Sleep request.
+
+        Args:
+            seconds (float): Sleep duration.
+        """
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"Sleep({self.seconds!r})"
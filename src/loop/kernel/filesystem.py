@@ -76,6 +76,9 @@ class DirectoryNode:
         name (str): The name of the directory.
         children (dict): A dictionary mapping names to child nodes (Files or Directories).
         permissions (Permissions): Access permissions.
+        version (int): Bumped whenever an entry is added or removed anywhere below
+            this directory, or a permission in that subtree changes (file contents
+            do not count). Lets observers such as SystemDOM reuse unchanged subtrees.
     """
     def __init__(self, name, owner="root", mode="rw", group="root", group_mode="", world_mode=""):
         """
@@ -92,6 +95,7 @@ class DirectoryNode:
         self.name = name
         self.children = {}
         self.permissions = Permissions(owner, mode, group, group_mode, world_mode)
+        self.version = 0
 
     def __repr__(self):
         return f"<Dir {self.name}>"
@@ -263,6 +267,7 @@ class FileSystem:
             if self._check_perm(parent, uid, 'w', groups):
                 group = groups[0] if groups else "root"
                 parent.children[name] = FileNode(name, data, owner=uid, group=group)
+                self._touch(path)
             else:
                 raise PermissionError(f"Permission denied: {path}")
 
@@ -292,6 +297,7 @@ class FileSystem:
             if self._check_perm(parent, uid, 'w', groups):
                 group = groups[0] if groups else "root"
                 parent.children[name] = FileNode(name, text + "\n", owner=uid, group=group)
+                self._touch(path)
             else:
                 raise PermissionError(f"Permission denied: {path}")
 
@@ -322,6 +328,7 @@ class FileSystem:
             new_owner = owner if owner else uid
             new_group = group if group else (groups[0] if groups else "root")
             parent.children[name] = DirectoryNode(name, owner=new_owner, group=new_group)
+            self._touch(path)
         else:
             raise PermissionError(f"Permission denied: {path}")
 
@@ -357,6 +364,7 @@ class FileSystem:
                  raise OSError("Directory not empty")
 
              del parent.children[name]
+             self._touch(path)
         else:
             raise PermissionError(f"Permission denied: {path}")
 
@@ -391,8 +399,26 @@ class FileSystem:
             node.permissions.group_mode = group_mode
         if world_mode is not None:
             node.permissions.world_mode = world_mode
+        if isinstance(node, DirectoryNode):
+            node.version += 1
+        self._touch(path)
 
     # ===== Helpers =====
+    def _touch(self, path):
+        """
+        Bump the version of every directory containing `path`, root included.
+
+        Args:
+            path (str): The path whose entry changed.
+        """
+        node = self.root
+        node.version += 1
+        for p in [p for p in path.split("/") if p][:-1]:
+            node = node.children.get(p)
+            if not isinstance(node, DirectoryNode):
+                return
+            node.version += 1
+
     def _resolve(self, path):
         """
         Resolve a path string to a node in the filesystem tree.
@@ -0,0 +1,199 @@
+# kernel/httpclient.py
+"""
+Pooled HTTP Client.
+
+Plugins and kernel services share one `HttpClient` (see `get_http_client()`)
+instead of calling `requests.get/post` directly, which opened a new TCP and
+TLS connection per request. The client keeps connections alive in a
+per-host pool, retries idempotent requests on connection errors and
+gateway errors with `ErrorRecovery` backoff, opens a circuit breaker per
+host that keeps failing, and checks the `NetworkGuard` before every request:
+a pooled connection is reused without a new `connect()`, so the network
+state and policy are checked here instead.
+
+The client is shared by every caller, so it keeps no per-caller state:
+cookies set by responses are not stored (pass `cookies=`/`headers=` per
+request instead), and the session's headers, auth and cookie jar must not
+be modified. Under that assumption it is safe to use from any thread: the
+only shared mutable state is the connection pool, which is thread-safe.
+"""
+
+import threading
+from http import cookiejar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from loop.utils.error_recovery import ErrorRecovery
+
+POOL_HOSTS = 32          # Hosts with a pool of idle connections
+POOL_PER_HOST = 10       # Concurrent connections per host
+DEFAULT_TIMEOUT = 30.0   # Seconds
+RETRIES = 2
+RETRY_BACKOFF = 0.5      # Seconds, doubled per attempt
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+BREAKER_THRESHOLD = 5    # Consecutive failures before a host's circuit opens
+BREAKER_TIMEOUT = 30     # Seconds before a request is let through again
+
+
+class RetryableStatus(Exception):
+    """A gateway error response; retried like a connection error."""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class _NoCookies(cookiejar.CookiePolicy):
+    """Cookie policy that neither stores nor returns cookies."""
+    netscape = True
+    rfc2965 = False
+    hide_cookie2 = False
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+    def domain_return_ok(self, domain, request):
+        return False
+
+    def path_return_ok(self, path, request):
+        return False
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client with per-host connection pools.
+
+    Cookies are not persisted between requests, so one caller's session
+    cookies are never sent on another caller's requests.
+
+    Attributes:
+        session (requests.Session): The pooled session.
+        timeout (float): Default request timeout in seconds.
+        guard (NetworkGuard): Consulted before every request, if set.
+    """
+
+    def __init__(self, pool_hosts=POOL_HOSTS, pool_per_host=POOL_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                 retries=RETRIES, backoff=RETRY_BACKOFF, guard=None):
+        """
+        Initialize the HttpClient.
+
+        Args:
+            pool_hosts (int, optional): Hosts to keep connection pools for.
+            pool_per_host (int, optional): Maximum connections per host; further
+                requests wait for a free connection.
+            timeout (float, optional): Default timeout in seconds.
+            retries (int, optional): Retries of idempotent requests.
+            backoff (float, optional): Initial retry delay in seconds.
+            guard (NetworkGuard, optional): Network guard to honour.
+        """
+        self.timeout = timeout
+        self.guard = guard
+        self.session = requests.Session()
+        self.session.cookies.set_policy(_NoCookies())
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._send_with_retries = ErrorRecovery.retry_with_backoff(
+            retries=retries,
+            backoff_in_seconds=backoff,
+            exceptions=(requests.ConnectionError, requests.Timeout, RetryableStatus),
+        )(self._send)
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, host):
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(host)
+                if breaker is None:
+                    breaker = ErrorRecovery.circuit_breaker(BREAKER_THRESHOLD, BREAKER_TIMEOUT)(_call)
+                    self._breakers[host] = breaker
+        return breaker
+
+    def _send(self, method, url, **kwargs):
+        response = self.session.request(method, url, **kwargs)
+        if response.status_code in RETRY_STATUSES:
+            raise RetryableStatus(response)
+        return response
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request over a pooled connection.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Absolute URL.
+            **kwargs: Passed to `requests.Session.request` (headers, json, ...).
+
+        Returns:
+            requests.Response: The response (gateway errors are returned once
+            retries are exhausted).
+
+        Raises:
+            OSError: If the network guard refuses the destination.
+            RuntimeError: If the host's circuit breaker is open.
+            requests.RequestException: On connection failures after retries.
+        """
+        method = method.upper()
+        parts = urlsplit(url)
+        host = parts.hostname
+        if self.guard is not None:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            self.guard.check(host, port)
+        kwargs.setdefault("timeout", self.timeout)
+        send = self._send_with_retries if method in RETRY_METHODS else self._send
+        try:
+            return self._breaker(host)(send, method, url, **kwargs)
+        except RetryableStatus as e:
+            return e.response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def close(self):
+        """
+        Close every pooled connection.
+        """
+        self.session.close()
+
+
+def _call(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Return the kernel-wide HTTP client, creating it on first use.
+
+    Returns:
+        HttpClient: The shared client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -26,6 +26,10 @@ class IOAdapter(ABC):
         """Send a control signal to the frontend (e.g. WAKE)."""
         pass
 
+    def stream(self, text: str):
+        """Send a chunk of a streaming LLM response for live display."""
+        pass
+
     def get_signal(self):
         """Retrieve a pending signal (non-blocking)."""
         return None
@@ -65,6 +69,7 @@ class APIAdapter(IOAdapter):
         self.output_queue = queue.Queue()
         self.input_queue = queue.Queue()
         self.signal_queue = queue.Queue()
+        self.token_queue = queue.Queue()
         self._buffer = []
 
     def write(self, text: str):
@@ -89,6 +94,10 @@ class APIAdapter(IOAdapter):
         """External method to send a signal to the API/Frontend."""
         self.signal_queue.put(name)
 
+    def stream(self, text: str):
+        """External method to forward streamed LLM tokens to the API/Frontend."""
+        self.token_queue.put(text)
+
     def input(self, text: str):
         """External method to inject input from the API."""
         self.input_queue.put(text)
@@ -106,3 +115,12 @@ class APIAdapter(IOAdapter):
             return self.signal_queue.get(block=block, timeout=timeout)
         except queue.Empty:
             return None
+
+    def get_tokens(self):
+        """External method to retrieve all pending streamed tokens as one string."""
+        tokens = []
+        while True:
+            try:
+                tokens.append(self.token_queue.get_nowait())
+            except queue.Empty:
+                return "".join(tokens)
@@ -0,0 +1,139 @@
+# kernel/ipc.py
+"""
+IPC Channels.
+
+This module provides `Channel`, the bounded message queue backing every
+process inbox. It is a `collections.deque` ring: send and receive are O(1),
+and a full channel refuses new messages instead of growing without bound, so
+fast producers get backpressure (see `sys_send(..., block=True)`).
+
+Payloads are never copied. Objects are queued by reference; bytes-like
+payloads sent with `send_buffer` are wrapped in a read-only `memoryview`, so
+the receiver can slice large buffers without copying them either.
+"""
+
+from collections import deque
+
+DEFAULT_CAPACITY = 1024
+
+
+class Channel:
+    """
+    Bounded FIFO message channel.
+
+    Attributes:
+        capacity (int): Maximum number of queued messages (None for unbounded).
+        on_space (callable): One-shot callback run when a full channel frees a
+            slot; used by the kernel to wake blocked senders.
+    """
+    __slots__ = ("capacity", "on_space", "_queue")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Initialize the Channel.
+
+        Args:
+            capacity (int, optional): Maximum queued messages. None disables the bound.
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.on_space = None
+        self._queue = deque()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __bool__(self):
+        return bool(self._queue)
+
+    def __iter__(self):
+        return iter(list(self._queue))
+
+    def __repr__(self):
+        return f"Channel({len(self._queue)}/{self.capacity})"
+
+    def full(self):
+        """
+        Check whether the channel is at capacity.
+
+        Returns:
+            bool: True if a send would be refused.
+        """
+        return self.capacity is not None and len(self._queue) >= self.capacity
+
+    def send(self, msg):
+        """
+        Queue a message without blocking.
+
+        Args:
+            msg (any): The message (queued by reference).
+
+        Returns:
+            bool: True if queued, False if the channel is full.
+        """
+        if self.capacity is not None and len(self._queue) >= self.capacity:
+            return False
+        self._queue.append(msg)
+        return True
+
+    def send_buffer(self, data):
+        """
+        Queue a bytes-like payload as a zero-copy read-only memoryview.
+
+        Args:
+            data (bytes | bytearray | memoryview): The payload.
+
+        Returns:
+            bool: True if queued, False if the channel is full.
+        """
+        return self.send(memoryview(data).toreadonly())
+
+    def _freed(self, before):
+        if before == self.capacity and self.on_space is not None:
+            callback, self.on_space = self.on_space, None
+            callback()
+
+    def recv(self):
+        """
+        Take the oldest message without blocking.
+
+        Returns:
+            any: The message, or None if the channel is empty.
+        """
+        if not self._queue:
+            return None
+        before = len(self._queue)
+        msg = self._queue.popleft()
+        self._freed(before)
+        return msg
+
+    def recv_many(self, n=None):
+        """
+        Take up to `n` messages at once.
+
+        Args:
+            n (int, optional): Maximum number of messages. Defaults to all queued.
+
+        Returns:
+            list: The messages, oldest first (empty if none are queued).
+        """
+        queue = self._queue
+        before = len(queue)
+        if n is None or n >= before:
+            batch = list(queue)
+            queue.clear()
+        else:
+            popleft = queue.popleft
+            batch = [popleft() for _ in range(n)]
+        if batch:
+            self._freed(before)
+        return batch
+
+    def clear(self):
+        """
+        Drop every queued message.
+        """
+        before = len(self._queue)
+        self._queue.clear()
+        self._freed(before)
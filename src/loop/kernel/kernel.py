@@ -10,6 +10,7 @@ from typing import Optional
 from .io import IOAdapter, CLIAdapter
 from .syscall import SyscallHandler
 from .scheduler import Scheduler
+from .worker_pool import WorkerPool
 from .users import UserManager
 from .network import NetworkManager, NetworkGuard
 from .sandbox import AgentSandbox
@@ -27,6 +28,7 @@ class LoopKernel:
     Attributes:
         io (IOAdapter): Input/Output interface.
         scheduler (Scheduler): Process scheduler.
+        worker_pool (WorkerPool): OS workers hosting SCHED_WORKER processes.
         user_manager (UserManager): User authentication and management.
         network_manager (NetworkManager): Network state management.
         network_guard (NetworkGuard): Security enforcement for network access.
@@ -59,6 +61,7 @@ class LoopKernel:
 
         # Core Components
         self.scheduler = scheduler if scheduler else Scheduler()
+        self.worker_pool = WorkerPool(self.scheduler)
         self.user_manager = user_manager if user_manager else UserManager()
         self.network_manager = network_manager if network_manager else NetworkManager(self.user_manager)
 
@@ -168,6 +171,14 @@ class LoopKernel:
             # We pass the rest of the grace period logic to service manager
             self.service_manager.shutdown(timeout=10.0, grace_period=0) # We already warned plugins
 
+        # Stop the preemption watchdog
+        if getattr(self.scheduler, "watchdog", None):
+            self.scheduler.watchdog.stop()
+
+        # Stop worker processes pinned to other cores
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+
         # 5. Disable Network Guard (Release patches)
         if self.network_guard:
             self.network_guard.disable()
@@ -10,6 +10,8 @@ testing and offline development.
 import os
 import json
 
+from loop.kernel.llm_cache import get_llm_cache
+
 
 class LLMProvider:
     """
@@ -23,19 +25,26 @@ class LLMProvider:
         model (str): The specific model name to use.
         is_mock (bool): True if running in mock mode.
         client (object): The underlying client object for the API.
+        cache (LLMCache): Response cache, or None to disable caching.
+        last_cache_hit (bool): True if the last response came from the cache.
+        last_error (str): Error text of the last response if the provider failed, else None.
     """
 
-    def __init__(self, model=None):
+    def __init__(self, model=None, cache=None):
         """
         Initialize the LLMProvider.
 
         Args:
             model (str, optional): Specific model to use. If None, uses a default based on provider.
+            cache (LLMCache, optional): Response cache. Defaults to the shared cache.
         """
         self.provider = os.environ.get("LLM_PROVIDER", "mock").lower()
         self.model = model or self._default_model_for_provider()
         self.is_mock = False
         self.client = None
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.last_cache_hit = False
+        self.last_error = None
 
         self._init_client()
 
@@ -103,55 +112,237 @@ class LLMProvider:
         else:
             self.is_mock = True
 
+    @property
+    def cache_provider(self):
+        """str: Provider name responses are cached under ("mock" when falling back)."""
+        return "mock" if self.is_mock else self.provider
+
+    def _cache_get(self, prompt, stop):
+        self.last_error = None
+        cached = None
+        if self.cache is not None:
+            cached = self.cache.get(self.cache_provider, self.model, prompt, stop)
+        self.last_cache_hit = cached is not None
+        return cached
+
+    def _cache_put(self, prompt, stop, response):
+        if self.cache is not None and response:
+            self.cache.put(self.cache_provider, self.model, prompt, response, stop)
+
+    def _error(self, e):
+        # Reported as text, like a response, and never cached
+        self.last_error = f"LLM Error ({self.provider}): {e}"
+        return self.last_error
+
     def generate(self, prompt, stop=None):
         """
-        Generate a response from the LLM.
+        Generate a response from the LLM, answering repeated prompts from the cache.
 
         Args:
             prompt (str): The prompt to send to the LLM.
             stop (list, optional): List of stop sequences.
 
         Returns:
-            str: The generated text response.
+            str: The generated text response, or "LLM Error (...)" if the provider
+            failed (see `last_error`).
         """
+        cached = self._cache_get(prompt, stop)
+        if cached is not None:
+            return cached
+        try:
+            response = self._generate(prompt, stop)
+        except Exception as e:
+            return self._error(e)
+        self._cache_put(prompt, stop, response)
+        return response
+
+    def _generate(self, prompt, stop=None):
         if self.is_mock:
             return self._mock_response(prompt)
 
+        if self.provider == "openai":
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are the Kernel Agent for LooP."},
+                    {"role": "user", "content": prompt}
+                ],
+                stop=stop
+            )
+            return response.choices[0].message.content
+
+        elif self.provider == "gemini":
+            # Google GenAI
+            model = self.client.GenerativeModel(self.model)
+            # Gemini doesn't support system prompts in same way for all models, usually prepend or use config.
+            # Just prepend system prompt.
+            full_prompt = f"You are the Kernel Agent for LooP.\n\n{prompt}"
+            response = model.generate_content(full_prompt)
+            return response.text
+
+        elif self.provider == "anthropic":
+            # Anthropic uses 'system' param
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=1024,
+                system="You are the Kernel Agent for LooP.",
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            return response.content[0].text
+
+    def generate_stream(self, prompt, stop=None):
+        """
+        Generate a response from the LLM, yielding text as it arrives.
+
+        Args:
+            prompt (str): The prompt to send to the LLM.
+            stop (list, optional): List of stop sequences.
+
+        Yields:
+            str: Consecutive chunks of the generated text. If the provider fails,
+            the last chunk is "LLM Error (...)" (see `last_error`) and the partial
+            response is not cached.
+        """
+        cached = self._cache_get(prompt, stop)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
         try:
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are the Kernel Agent for LooP."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    stop=stop
-                )
-                return response.choices[0].message.content
-
-            elif self.provider == "gemini":
-                # Google GenAI
-                model = self.client.GenerativeModel(self.model)
-                # Gemini doesn't support system prompts in same way for all models, usually prepend or use config.
-                # Just prepend system prompt.
-                full_prompt = f"You are the Kernel Agent for LooP.\n\n{prompt}"
-                response = model.generate_content(full_prompt)
-                return response.text
-
-            elif self.provider == "anthropic":
-                # Anthropic uses 'system' param
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=1024,
-                    system="You are the Kernel Agent for LooP.",
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                return response.content[0].text
+            for chunk in self._generate_stream(prompt, stop):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            yield self._error(e)
+            return
+        self._cache_put(prompt, stop, "".join(chunks))
 
+    def _generate_stream(self, prompt, stop=None):
+        if self.is_mock:
+            # Emit the mock response a few words at a time, like a real stream
+            words = self._mock_response(prompt).split(" ")
+            for i in range(0, len(words), 4):
+                yield " ".join(words[i:i+4]) + (" " if i + 4 < len(words) else "")
+            return
+
+        if self.provider == "openai":
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are the Kernel Agent for LooP."},
+                    {"role": "user", "content": prompt}
+                ],
+                stop=stop,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        elif self.provider == "gemini":
+            model = self.client.GenerativeModel(self.model)
+            full_prompt = f"You are the Kernel Agent for LooP.\n\n{prompt}"
+            for chunk in model.generate_content(full_prompt, stream=True):
+                if chunk.text:
+                    yield chunk.text
+
+        elif self.provider == "anthropic":
+            with self.client.messages.stream(
+                model=self.model,
+                max_tokens=1024,
+                system="You are the Kernel Agent for LooP.",
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+
+    def generate_with_tools(self, system, prompt, tools):
+        """
+        Generate a response using the provider's native function calling.
+
+        The static `system` prompt is sent as a cacheable prefix: Anthropic
+        gets an explicit cache_control breakpoint after it, while OpenAI and
+        Gemini cache a repeated prefix automatically.
+
+        Args:
+            system (str): Static instructions (identical across turns).
+            prompt (str): The per-turn prompt.
+            tools (list[Tool]): Tools the model may call.
+
+        Returns:
+            dict: "text" (str) and "calls" (list of {"name", "arguments"} dicts).
+            If the provider failed, "text" is "LLM Error (...)" (see `last_error`).
+        """
+        cache_prompt = f"{system}\n\n{prompt}\n\nTOOLS: " + json.dumps([t.to_anthropic() for t in tools], sort_keys=True)
+        cached = self._cache_get(cache_prompt, None)
+        if cached is not None:
+            return json.loads(cached)
+        try:
+            result = self._generate_with_tools(system, prompt, tools)
         except Exception as e:
-            return f"LLM Error ({self.provider}): {e}"
+            return {"text": self._error(e), "calls": []}
+        self._cache_put(cache_prompt, None, json.dumps(result))
+        return result
+
+    def _generate_with_tools(self, system, prompt, tools):
+        if self.is_mock:
+            # The mock has no function calling; the agent falls back to parsing the text
+            return {"text": self._mock_response(prompt), "calls": []}
+
+        text, calls = "", []
+        if self.provider == "openai":
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ],
+                tools=[t.to_openai() for t in tools]
+            )
+            message = response.choices[0].message
+            text = message.content or ""
+            for call in message.tool_calls or []:
+                try:
+                    arguments = json.loads(call.function.arguments or "{}")
+                except json.JSONDecodeError:
+                    arguments = {}
+                calls.append({"name": call.function.name, "arguments": arguments})
+
+        elif self.provider == "gemini":
+            model = self.client.GenerativeModel(
+                self.model,
+                system_instruction=system,
+                tools=[{"function_declarations": [t.to_gemini() for t in tools]}]
+            )
+            response = model.generate_content(prompt)
+            for part in response.candidates[0].content.parts:
+                if getattr(part, "function_call", None) and part.function_call.name:
+                    arguments = {k: _plain(v) for k, v in part.function_call.args.items()}
+                    calls.append({"name": part.function_call.name, "arguments": arguments})
+                elif getattr(part, "text", None):
+                    text += part.text
+
+        elif self.provider == "anthropic":
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=1024,
+                system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+                tools=[t.to_anthropic() for t in tools],
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            for block in response.content:
+                if block.type == "tool_use":
+                    calls.append({"name": block.name, "arguments": dict(block.input or {})})
+                elif block.type == "text":
+                    text += block.text
+
+        return {"text": text, "calls": calls}
 
     def _mock_response(self, prompt):
         """
@@ -180,3 +371,14 @@ ToDo:
 1. List current directory.
 Action: list_dir("/")
         """.strip()
+
+
+def _plain(value):
+    """Convert Gemini's protobuf map/list wrappers to plain Python values."""
+    if hasattr(value, "items"):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (str, bytes)):
+        return value
+    if hasattr(value, "__iter__"):
+        return [_plain(v) for v in value]
+    return value
@@ -0,0 +1,322 @@
+# kernel/llm_cache.py
+"""
+LLM Response Cache.
+
+Agent prompts repeat often (same task, same DOM state, same history), and
+every repeat used to cost a full generation. `LLMCache` stores responses in
+SQLite under `LOOP_ROOT/var/cache` so they survive restarts, keyed on a hash
+of the provider, model, stop sequences and the normalized prompt.
+Normalization folds line endings (CRLF), trailing spaces and blank-line
+runs so prompts that differ only in those share an entry. Indentation and
+spacing within a line are kept: in code they change the meaning.
+
+Entries expire after a TTL, and the least recently used entries are evicted
+once the entry count or total response size exceeds its cap. Caching can
+be disabled globally (LOOP_LLM_CACHE=off) or per provider
+(LOOP_LLM_CACHE_DISABLE=openai,anthropic).
+
+The cache is an optimization only: database errors (a locked file, a full
+disk, a read-only LOOP_ROOT) turn a lookup into a miss and a store into a
+no-op, and are reported once.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from loop.kernel import rootfs
+
+DEFAULT_TTL = 7 * 24 * 3600          # Seconds
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # Total size of cached responses
+EVICT_FRACTION = 0.1                  # Share of the cap freed per eviction pass
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_prompt(prompt):
+    """
+    Canonicalize a prompt for keying: line endings, trailing whitespace and
+    runs of blank lines are normalized; indentation is kept.
+
+    Args:
+        prompt (str): The prompt.
+
+    Returns:
+        str: The normalized prompt.
+    """
+    text = prompt.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [line.rstrip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip("\n")
+
+
+def cache_key(provider, model, prompt, stop=None):
+    """
+    Compute the cache key of a generation request.
+
+    Args:
+        provider (str): Provider name.
+        model (str): Model name.
+        prompt (str): The prompt.
+        stop (list, optional): Stop sequences.
+
+    Returns:
+        str: Hex digest.
+    """
+    h = hashlib.sha256()
+    for part in (provider, model, "\x1f".join(stop or ()), normalize_prompt(prompt)):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class LLMCache:
+    """
+    Disk-backed LRU cache of LLM responses.
+
+    Attributes:
+        path (Path): SQLite database file.
+        ttl (float): Seconds an entry stays valid.
+        max_entries (int): Maximum number of entries.
+        max_bytes (int): Maximum total size of cached responses.
+        disabled_providers (set[str]): Providers that bypass the cache.
+        enabled (bool): False to bypass the cache entirely.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that were not.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, disabled_providers=None, enabled=None):
+        """
+        Initialize the LLMCache. The database is opened on first use.
+
+        Args:
+            path (str or Path, optional): Database file. Defaults to LOOP_ROOT/var/cache/llm.sqlite.
+            ttl (float, optional): Entry lifetime in seconds. Defaults to 7 days.
+            max_entries (int, optional): Entry cap.
+            max_bytes (int, optional): Size cap in bytes.
+            disabled_providers (iterable[str], optional): Providers to bypass.
+                Defaults to LOOP_LLM_CACHE_DISABLE (comma separated).
+            enabled (bool, optional): Defaults to LOOP_LLM_CACHE not being "off"/"0"/"false".
+        """
+        self.path = Path(path) if path else rootfs.LOOP_ROOT / "var" / "cache" / "llm.sqlite"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        if disabled_providers is None:
+            disabled_providers = os.environ.get("LOOP_LLM_CACHE_DISABLE", "").split(",")
+        self.disabled_providers = {p.strip().lower() for p in disabled_providers if p.strip()}
+        if enabled is None:
+            enabled = os.environ.get("LOOP_LLM_CACHE", "on").lower() not in ("off", "0", "false")
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._entries = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._failed = False
+
+    def _db(self):
+        """
+        Open the database on first use. Called with the lock held.
+        """
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, provider TEXT, model TEXT, response TEXT,"
+                " size INTEGER, created REAL, accessed REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._conn = conn
+            self._recount()
+        return self._conn
+
+    def _failure(self, e):
+        """
+        Report a database error, once per cache.
+        """
+        if not self._failed:
+            self._failed = True
+            print(f"[LLMCache] Cache unavailable, generating without it: {e}")
+
+    def _recount(self):
+        self._entries, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def enabled_for(self, provider):
+        """
+        Check whether responses of a provider are cached.
+
+        Args:
+            provider (str): Provider name.
+
+        Returns:
+            bool: True if the cache applies.
+        """
+        return self.enabled and provider.lower() not in self.disabled_providers
+
+    def get(self, provider, model, prompt, stop=None):
+        """
+        Look up a cached response.
+
+        Args:
+            provider (str): Provider name.
+            model (str): Model name.
+            prompt (str): The prompt.
+            stop (list, optional): Stop sequences.
+
+        Returns:
+            str: The cached response, or None on a miss.
+        """
+        if not self.enabled_for(provider):
+            return None
+        key = cache_key(provider, model, prompt, stop)
+        now = time.time()
+        with self._lock:
+            try:
+                db = self._db()
+                row = db.execute("SELECT response, size, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[2] + self.ttl <= now:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._entries -= 1
+                    self._bytes -= row[1]
+                    row = None
+                if row is not None:
+                    db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            except (sqlite3.Error, OSError) as e:
+                self._failure(e)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, provider, model, prompt, response, stop=None):
+        """
+        Store a response.
+
+        Args:
+            provider (str): Provider name.
+            model (str): Model name.
+            prompt (str): The prompt.
+            response (str): The generated response.
+            stop (list, optional): Stop sequences.
+        """
+        if not self.enabled_for(provider):
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        key = cache_key(provider, model, prompt, stop)
+        now = time.time()
+        with self._lock:
+            try:
+                db = self._db()
+                old = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, response, size, now, now),
+                )
+                if old is None:
+                    self._entries += 1
+                else:
+                    self._bytes -= old[0]
+                self._bytes += size
+                if self._entries > self.max_entries or self._bytes > self.max_bytes:
+                    self._evict()
+            except (sqlite3.Error, OSError) as e:
+                self._failure(e)
+
+    def _evict(self):
+        """
+        Drop expired entries, then least recently used ones until both caps
+        have headroom. Called with the lock held.
+        """
+        db = self._conn
+        db.execute("DELETE FROM responses WHERE created <= ?", (time.time() - self.ttl,))
+        self._recount()  # Other processes may share the file
+        target_entries = int(self.max_entries * (1 - EVICT_FRACTION))
+        target_bytes = int(self.max_bytes * (1 - EVICT_FRACTION))
+        if self._entries <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        freed_entries = freed_bytes = 0
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if self._entries - freed_entries <= target_entries and self._bytes - freed_bytes <= target_bytes:
+                break
+            doomed.append((key,))
+            freed_entries += 1
+            freed_bytes += size
+        db.execute("BEGIN")
+        db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        db.execute("COMMIT")
+        self._entries -= freed_entries
+        self._bytes -= freed_bytes
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+            self._entries = self._bytes = 0
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        Report cache usage.
+
+        Returns:
+            dict: hits, misses, hit rate, entries and bytes.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._recount()
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": self._entries,
+                "bytes": self._bytes,
+            }
+
+    def close(self):
+        """
+        Close the database.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Return the kernel-wide LLM response cache, creating it on first use.
+
+    Returns:
+        LLMCache: The shared cache.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
@@ -0,0 +1,417 @@
+# kernel/netpolicy.py
+"""
+Network Policy Engine.
+
+`NetworkPolicy` decides, per connection, whether a user may reach a
+destination and how fast. It is evaluated by `NetworkGuard` inside the
+patched socket functions, so matching is compiled into hash lookups:
+
+    hosts   a rule for "example.com" matches it and every subdomain; a name
+            is matched by looking up each of its suffixes, longest first
+    CIDRs   longest-prefix match over one hash table per prefix length in
+            use (typically a handful), most specific first
+    ports   a set per rule (None for any port)
+
+The most specific destination wins: host rules, then CIDR rules, then rules
+without a destination. Among rules for the same destination the first one
+declared that applies to the user and port is taken; if none applies the
+policy default is used. Decisions are memoized until the rules change.
+
+Bandwidth is limited with token buckets: per rule (one bucket per user),
+per user and per process. An `unmetered` allow rule bypasses the user and
+process limits, e.g. to let agents reach the LLM endpoint at full speed
+while other egress is throttled.
+"""
+
+import ipaddress
+import threading
+import time
+
+ALLOW = "allow"
+DENY = "deny"
+
+MAX_CACHED_DECISIONS = 4096
+
+
+class TokenBucket:
+    """
+    Byte-rate limiter.
+
+    Attributes:
+        rate (float): Refill rate in bytes per second.
+        burst (float): Bucket capacity in bytes.
+        tokens (float): Bytes currently available (negative while in debt).
+    """
+    __slots__ = ("rate", "burst", "tokens", "_stamp", "_lock")
+
+    def __init__(self, rate, burst=None):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate (float): Bytes per second.
+            burst (float, optional): Capacity in bytes. Defaults to one second of traffic.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.tokens = self.burst
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n):
+        """
+        Take `n` bytes from the bucket, going into debt if needed.
+
+        Args:
+            n (int): Number of bytes.
+
+        Returns:
+            float: Seconds the caller should wait before transferring (0 if none).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self.tokens -= n
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class Rule:
+    """
+    A single allow/deny rule.
+
+    Attributes:
+        action (str): ALLOW or DENY.
+        hosts (tuple[str]): Host names (matching subdomains too).
+        cidrs (tuple[ip_network]): Destination networks.
+        ports (frozenset[int]): Destination ports, or None for any.
+        users (frozenset[str]): Users the rule applies to, or None for everyone.
+        rate (float): Per-user bandwidth limit of traffic matching the rule, or None.
+        burst (float): Bucket capacity for `rate`.
+        unmetered (bool): Exempt matching traffic from user/process limits.
+    """
+    __slots__ = ("action", "hosts", "cidrs", "ports", "users", "rate", "burst", "unmetered", "index")
+
+    def __init__(self, action, hosts=None, cidrs=None, ports=None, users=None,
+                 rate=None, burst=None, unmetered=False):
+        """
+        Initialize the Rule.
+
+        Args:
+            action (str): ALLOW or DENY.
+            hosts (iterable[str], optional): Host names.
+            cidrs (iterable[str], optional): Networks such as "10.0.0.0/8".
+            ports (iterable[int], optional): Ports.
+            users (iterable[str], optional): Users.
+            rate (float, optional): Bytes per second per user.
+            burst (float, optional): Bucket capacity in bytes.
+            unmetered (bool, optional): Bypass user/process limits.
+        """
+        if action not in (ALLOW, DENY):
+            raise ValueError(f"unknown rule action: {action}")
+        self.action = action
+        self.hosts = tuple(_normalize_host(h) for h in (hosts or ()))
+        self.cidrs = tuple(ipaddress.ip_network(c, strict=False) for c in (cidrs or ()))
+        self.ports = frozenset(int(p) for p in ports) if ports else None
+        self.users = frozenset(users) if users else None
+        self.rate = rate
+        self.burst = burst
+        self.unmetered = unmetered
+        self.index = None
+
+    def applies(self, user, port):
+        """
+        Check the user and port conditions (the destination is matched by the index).
+
+        Args:
+            user (str): Username.
+            port (int): Destination port (None if unknown).
+
+        Returns:
+            bool: True if the rule applies.
+        """
+        if self.users is not None and user not in self.users:
+            return False
+        return self.ports is None or port in self.ports
+
+    def to_dict(self):
+        """
+        Describe the rule.
+
+        Returns:
+            dict: JSON-friendly rule description.
+        """
+        return {
+            "action": self.action,
+            "hosts": list(self.hosts),
+            "cidrs": [str(c) for c in self.cidrs],
+            "ports": sorted(self.ports) if self.ports is not None else None,
+            "users": sorted(self.users) if self.users is not None else None,
+            "rate": self.rate,
+            "burst": self.burst,
+            "unmetered": self.unmetered,
+        }
+
+
+def _normalize_host(host):
+    return host.strip().lower().lstrip("*").strip(".")
+
+
+def _parse_ip(ip):
+    try:
+        addr = ipaddress.ip_address(ip.split("%", 1)[0] if isinstance(ip, str) else ip)
+    except ValueError:
+        return None
+    return addr.version, int(addr)
+
+
+class Decision:
+    """
+    Outcome of a policy check.
+
+    Attributes:
+        allowed (bool): Whether the connection may proceed.
+        rule (Rule): The rule that matched, or None for the default.
+        buckets (tuple[TokenBucket]): Limits the connection's traffic is charged to.
+    """
+    __slots__ = ("allowed", "rule", "buckets")
+
+    def __init__(self, allowed, rule=None, buckets=()):
+        self.allowed = allowed
+        self.rule = rule
+        self.buckets = buckets
+
+
+class NetworkPolicy:
+    """
+    Compiled set of network rules and bandwidth limits.
+
+    Attributes:
+        default (str): Action when no rule matches (ALLOW or DENY).
+        rules (list[Rule]): Rules in declaration order.
+        on_change (callable): Called without arguments after rules or limits change.
+    """
+
+    def __init__(self, default=ALLOW):
+        """
+        Initialize the NetworkPolicy.
+
+        Args:
+            default (str, optional): Action when no rule matches. Defaults to ALLOW.
+        """
+        if default not in (ALLOW, DENY):
+            raise ValueError(f"unknown default action: {default}")
+        self.default = default
+        self.rules = []
+        self._user_limits = {}      # user -> (rate, burst)
+        self._process_limits = {}   # pid -> (rate, burst)
+        self._buckets = {}          # key -> TokenBucket
+        self._lock = threading.RLock()
+        self.on_change = None
+        self._compile()
+
+    @property
+    def empty(self):
+        """
+        True if the policy allows everything without limits, so nothing needs enforcing.
+        """
+        return self.default == ALLOW and not (self.rules or self._user_limits or self._process_limits)
+
+    def _changed(self):
+        callback = self.on_change
+        if callback is not None:
+            callback()
+
+    # Configuration
+    def add_rule(self, action, **kwargs):
+        """
+        Append a rule (see `Rule` for the keyword arguments).
+
+        Args:
+            action (str): ALLOW or DENY.
+
+        Returns:
+            Rule: The compiled rule.
+        """
+        rule = Rule(action, **kwargs)
+        with self._lock:
+            rule.index = len(self.rules)
+            self.rules.append(rule)
+            self._compile()
+        self._changed()
+        return rule
+
+    def clear(self):
+        """
+        Remove every rule and bandwidth limit.
+        """
+        with self._lock:
+            self.rules = []
+            self._user_limits.clear()
+            self._process_limits.clear()
+            self._buckets.clear()
+            self._compile()
+        self._changed()
+
+    def limit_user(self, user, rate, burst=None):
+        """
+        Cap the bandwidth of every connection of a user.
+
+        Args:
+            user (str): Username.
+            rate (float): Bytes per second, or None to remove the limit.
+            burst (float, optional): Bucket capacity in bytes.
+        """
+        self._set_limit(self._user_limits, "user", user, rate, burst)
+
+    def limit_process(self, pid, rate, burst=None):
+        """
+        Cap the bandwidth of every connection opened by a process.
+
+        Args:
+            pid (int): Process ID.
+            rate (float): Bytes per second, or None to remove the limit.
+            burst (float, optional): Bucket capacity in bytes.
+        """
+        self._set_limit(self._process_limits, "pid", pid, rate, burst)
+
+    def _set_limit(self, limits, kind, key, rate, burst):
+        with self._lock:
+            if rate is None:
+                limits.pop(key, None)
+            else:
+                TokenBucket(rate, burst)  # Validate
+                limits[key] = (rate, burst)
+            self._buckets.pop((kind, key), None)
+            self._decisions = {}
+        self._changed()
+
+    def _compile(self):
+        """
+        Rebuild the lookup tables from `rules`. Called with the lock held.
+        """
+        hosts, cidrs, wildcard = {}, {4: {}, 6: {}}, []
+        for rule in self.rules:
+            for host in rule.hosts:
+                hosts.setdefault(host, []).append(rule)
+            for net in rule.cidrs:
+                by_len = cidrs[net.version].setdefault(net.prefixlen, {})
+                by_len.setdefault(int(net.network_address), []).append(rule)
+            if not rule.hosts and not rule.cidrs:
+                wildcard.append(rule)
+        self._hosts = hosts
+        self._cidrs = {
+            version: [(length, _mask(version, length), table[length]) for length in sorted(table, reverse=True)]
+            for version, table in cidrs.items()
+        }
+        self._wildcard = wildcard
+        self._decisions = {}
+
+    # Evaluation
+    def match(self, host=None, ip=None, port=None, user=None):
+        """
+        Find the rule governing a connection.
+
+        Args:
+            host (str, optional): Destination host name.
+            ip (str, optional): Destination address.
+            port (int, optional): Destination port.
+            user (str, optional): Connecting user.
+
+        Returns:
+            Rule: The matching rule, or None if the default applies.
+        """
+        if host and self._hosts:
+            labels = _normalize_host(host).split(".")
+            for i in range(len(labels)):
+                rule = _first(self._hosts.get(".".join(labels[i:])), user, port)
+                if rule is not None:
+                    return rule
+        if ip is not None:
+            parsed = _parse_ip(ip)
+            if parsed is not None:
+                version, value = parsed
+                for _, mask, table in self._cidrs[version]:
+                    rule = _first(table.get(value & mask), user, port)
+                    if rule is not None:
+                        return rule
+        return _first(self._wildcard, user, port)
+
+    def check(self, host=None, ip=None, port=None, user=None, pid=None):
+        """
+        Decide whether a connection is allowed and which limits apply.
+
+        Args:
+            host (str, optional): Destination host name.
+            ip (str, optional): Destination address.
+            port (int, optional): Destination port.
+            user (str, optional): Connecting user.
+            pid (int, optional): Connecting process.
+
+        Returns:
+            Decision: The decision.
+        """
+        key = (host, ip, port, user, pid)
+        decisions = self._decisions
+        decision = decisions.get(key)
+        if decision is not None:
+            return decision
+        rule = self.match(host, ip, port, user)
+        action = rule.action if rule is not None else self.default
+        if action == DENY:
+            decision = Decision(False, rule)
+        else:
+            decision = Decision(True, rule, self._buckets_for(rule, user, pid))
+        if len(decisions) >= MAX_CACHED_DECISIONS:
+            decisions.clear()
+        decisions[key] = decision
+        return decision
+
+    def _buckets_for(self, rule, user, pid):
+        buckets = []
+        if rule is not None and rule.rate:
+            buckets.append(self._bucket(("rule", rule.index, user), rule.rate, rule.burst))
+        if rule is None or not rule.unmetered:
+            limit = self._user_limits.get(user)
+            if limit is not None:
+                buckets.append(self._bucket(("user", user), *limit))
+            limit = self._process_limits.get(pid)
+            if limit is not None:
+                buckets.append(self._bucket(("pid", pid), *limit))
+        return tuple(buckets)
+
+    def _bucket(self, key, rate, burst):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            return bucket
+
+    def to_dict(self):
+        """
+        Describe the policy.
+
+        Returns:
+            dict: default action, rules and limits.
+        """
+        return {
+            "default": self.default,
+            "rules": [rule.to_dict() for rule in self.rules],
+            "user_limits": {u: {"rate": r, "burst": b} for u, (r, b) in self._user_limits.items()},
+            "process_limits": {p: {"rate": r, "burst": b} for p, (r, b) in self._process_limits.items()},
+        }
+
+
+def _mask(version, length):
+    bits = 32 if version == 4 else 128
+    return ((1 << length) - 1) << (bits - length)
+
+
+def _first(rules, user, port):
+    if rules:
+        for rule in rules:
+            if rule.applies(user, port):
+                return rule
+    return None
@@ -5,13 +5,36 @@ Kernel Networking Management.
 This module controls network access within LooP. It manages the global network state
 (enabled/disabled) and enforces it via monkey-patching the standard `socket` module.
 It also integrates with `UserManager` to check user permissions.
+
+The state lives in memory. `.env` is only re-read when its stamp (mtime,
+size, inode) changes: a watcher thread polls it while the `NetworkGuard` is
+active, and `is_enabled()` otherwise stats it at most every `STAT_INTERVAL`
+seconds. The guarded socket functions read `NetworkManager.enabled` directly,
+so no socket creation or DNS lookup performs file I/O.
+
+Per-user and per-destination rules and bandwidth limits are kept in
+`NetworkManager.policy` (see `loop.kernel.netpolicy`) and enforced by the
+`NetworkGuard` when sockets connect and transfer data.
 """
 
+import errno
+import functools
+import ipaddress
 import os
 import socket
 import logging
+import threading
+import time
+from loop.kernel.netpolicy import NetworkPolicy
 from loop.kernel.users import UserManager
 
+try:
+    import ssl
+except ImportError:  # Python built without OpenSSL
+    ssl = None
+
+_INET_FAMILIES = (socket.AF_INET, socket.AF_INET6)
+
 
 class NetworkManager:
     """
@@ -22,9 +45,11 @@ class NetworkManager:
     Attributes:
         user_manager (UserManager): Instance for permission validation.
         enabled (bool): Current network status.
+        policy (NetworkPolicy): Destination rules and bandwidth limits.
     """
     ENV_KEY = "LOOP_NETWORK_STATE"
     ENV_FILE = ".env"
+    STAT_INTERVAL = 0.5  # Seconds between checks of the .env stamp
 
     def __init__(self, user_manager=None):
         """
@@ -35,12 +60,27 @@ class NetworkManager:
         """
         self.user_manager = user_manager or UserManager()
         self.enabled = False
+        self.policy = NetworkPolicy()
+        self._stamp = None
+        self._next_stat = 0.0
+        self._watcher = None
+        self._stop_watching = threading.Event()
         self._load_state()
 
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.ENV_FILE)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
     def _load_state(self):
         """
         Load the network state from the .env file or environment variables.
         """
+        # Stamp before reading so a write racing with the read triggers another reload
+        self._stamp = self._file_stamp()
+        self._next_stat = time.monotonic() + self.STAT_INTERVAL
         # Check .env file first (source of truth for live updates)
         state_str = None
         if os.path.exists(self.ENV_FILE):
@@ -62,18 +102,68 @@ class NetworkManager:
         else:
             self.enabled = False
 
+    def refresh(self):
+        """
+        Reload the state if `.env` changed since it was last read.
+
+        Tools that edit `.env` can call this to make the change visible at once.
+
+        Returns:
+            bool: True if the state was reloaded.
+        """
+        if self._file_stamp() == self._stamp:
+            return False
+        self._load_state()
+        return True
+
     def is_enabled(self):
         """
         Check if the network is currently enabled.
-        Reloads state from disk to ensure freshness.
+
+        External changes (e.g. from the CLI) are picked up by the watcher, or
+        by a stamp check at most every `STAT_INTERVAL` when it is not running.
 
         Returns:
             bool: True if network is enabled.
         """
-        # Reload state to ensure external changes (e.g., CLI) are picked up
-        self._load_state()
+        if self._watcher is None and time.monotonic() >= self._next_stat:
+            self._next_stat = time.monotonic() + self.STAT_INTERVAL
+            self.refresh()
         return self.enabled
 
+    def start_watcher(self, interval=None):
+        """
+        Start a background thread that reloads the state when `.env` changes.
+
+        Args:
+            interval (float, optional): Polling period. Defaults to `STAT_INTERVAL`.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        interval = interval if interval is not None else self.STAT_INTERVAL
+        self._stop_watching.clear()
+
+        def watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logging.warning(f"[NetworkManager] State refresh failed: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="loop-netstate", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        """
+        Stop the background watcher (no-op if not running).
+        """
+        watcher, self._watcher = self._watcher, None
+        if watcher is None:
+            return
+        self._stop_watching.set()
+        if watcher is not threading.current_thread():
+            watcher.join(timeout=2.0)
+
     def set_enabled(self, enabled: bool):
         """
         Set the network state and persist it.
@@ -113,14 +203,17 @@ class NetworkManager:
 
         with open(self.ENV_FILE, "w") as f:
             f.writelines(new_lines)
+        self._stamp = self._file_stamp()
 
-    def check_access(self, user, permission="use_network"):
+    def check_access(self, user, permission="use_network", host=None, port=None):
         """
         Checks if network is globally enabled AND if user has permission.
 
         Args:
             user (str): The username attempting access.
             permission (str, optional): The permission required. Defaults to "use_network".
+            host (str, optional): Destination host name or address to check against the policy.
+            port (int, optional): Destination port.
 
         Returns:
             bool: True if access is granted.
@@ -131,67 +224,349 @@ class NetworkManager:
         if not self.user_manager.has_permission(user, permission):
             return False
 
+        if host is not None:
+            if _is_ip(host):
+                return self.policy.check(ip=host, port=port, user=user).allowed
+            return self.policy.check(host=host, port=port, user=user).allowed
+
         return True
 
 
 class NetworkGuard:
     """
     Enforces network policy by monkey-patching the standard `socket` module.
-    Blocks all network calls if the network is disabled.
+
+    Blocks all network calls if the network is disabled. While active, the
+    manager's `.env` watcher keeps the state current, so each guarded call
+    is a single attribute read.
+
+    Connections are also checked against the manager's `NetworkPolicy` when
+    they connect: `socket.socket` is replaced by a subclass whose `connect`
+    asks the policy and whose send/receive methods charge the policy's token
+    buckets. TLS sockets wrapped from a guarded socket keep its limits.
+
+    Host rules apply to an address through the names resolved to it in this
+    process within the last `RESOLVED_TTL` seconds, on any thread (asyncio
+    resolves on an executor thread and connects on the loop thread). If
+    several names resolved to the address, e.g. on a shared CDN, every one
+    of them must be allowed, so looking up an allowed name cannot unlock a
+    denied one.
+
+    When only the policy is enforced (`enable(enforce_state=False)`), the
+    socket module is patched only while the policy has rules or limits.
 
     Attributes:
         manager (NetworkManager): The manager controlling the state.
-        active (bool): Whether the guard is currently active (monkey-patched).
+        identify (callable): Returns the (user, pid) opening a connection.
+        armed (bool): Whether `enable()` was called (and `disable()` not since).
+        active (bool): Whether the socket module is currently monkey-patched.
     """
-    def __init__(self, network_manager):
+    MAX_RESOLVED = 4096   # Addresses remembered
+    RESOLVED_TTL = 300.0  # Seconds a resolved name stays attached to its address
+
+    def __init__(self, network_manager, identify=None):
         """
         Initialize the NetworkGuard.
 
         Args:
             network_manager (NetworkManager): The network manager instance.
+            identify (callable, optional): Returns (user, pid) for the caller.
+                Defaults to the kernel identity ("root", None).
         """
         self.manager = network_manager
+        self.identify = identify or (lambda: ("root", None))
         self._original_socket = socket.socket
         self._original_create_connection = socket.create_connection
         self._original_getaddrinfo = socket.getaddrinfo
+        self._original_sslsocket_class = ssl.SSLContext.sslsocket_class if ssl else None
+        self._resolved = {}  # address -> {host name: expiry (monotonic)}
+        self._resolved_lock = threading.Lock()
+        self._patch_lock = threading.RLock()
+        self.enforce_state = True
+        self.armed = False
         self.active = False
 
-    def enable(self):
+    def enable(self, enforce_state=True):
         """
-        Activate the network guard (monkey-patch socket).
+        Activate the network guard.
+
+        Args:
+            enforce_state (bool, optional): Block everything while the network
+                is disabled. With False only the policy is enforced, and the
+                socket module is patched only while the policy is not empty.
+        """
+        with self._patch_lock:
+            if self.armed:
+                return
+            self.enforce_state = enforce_state
+            self.armed = True
+            if enforce_state:
+                self.manager.start_watcher()
+                self._install()
+            else:
+                self.manager.policy.on_change = self._policy_changed
+                self._policy_changed()
+
+    def _policy_changed(self):
+        """
+        Patch or unpatch the socket module as the policy gains or loses rules.
+        """
+        with self._patch_lock:
+            if not self.armed or self.enforce_state:
+                return
+            if self.manager.policy.empty:
+                self._uninstall()
+            else:
+                self._install()
+
+    def _install(self):
+        """
+        Monkey-patch the socket module. Called with the patch lock held.
         """
         if self.active:
             return
-
-        def guarded_socket(*args, **kwargs):
-            if not self.manager.is_enabled():
-                raise OSError("Network is disabled by system administrator (NetworkGuard)")
-            return self._original_socket(*args, **kwargs)
+        enforce_state = self.enforce_state
+        manager = self.manager
+        original_create_connection = self._original_create_connection
+        original_getaddrinfo = self._original_getaddrinfo
 
         def guarded_create_connection(*args, **kwargs):
-            if not self.manager.is_enabled():
+            if enforce_state and not manager.enabled:
                 raise OSError("Network is disabled by system administrator (NetworkGuard)")
-            return self._original_create_connection(*args, **kwargs)
+            return original_create_connection(*args, **kwargs)
 
-        def guarded_getaddrinfo(*args, **kwargs):
-             if not self.manager.is_enabled():
+        def guarded_getaddrinfo(host, *args, **kwargs):
+            if enforce_state and not manager.enabled:
                 raise OSError("Network is disabled by system administrator (NetworkGuard)")
-             return self._original_getaddrinfo(*args, **kwargs)
+            results = original_getaddrinfo(host, *args, **kwargs)
+            if host and isinstance(host, str) and not _is_ip(host):
+                self._remember(host, results)
+            return results
 
-        socket.socket = guarded_socket
+        socket.socket = self._make_socket_class(enforce_state)
         socket.create_connection = guarded_create_connection
         socket.getaddrinfo = guarded_getaddrinfo
+        if ssl:
+            ssl.SSLContext.sslsocket_class = _MeteredSSLSocket
         self.active = True
         logging.info("[NetworkGuard] Enforced.")
 
-    def disable(self):
+    def _uninstall(self):
         """
-        Deactivate the network guard (restore original socket methods).
+        Restore the original socket module. Called with the patch lock held.
         """
         if not self.active:
             return
         socket.socket = self._original_socket
         socket.create_connection = self._original_create_connection
         socket.getaddrinfo = self._original_getaddrinfo
+        if ssl:
+            ssl.SSLContext.sslsocket_class = self._original_sslsocket_class
         self.active = False
-        logging.info("[NetworkGuard] Disabled.")
+        logging.info("[NetworkGuard] Released.")
+
+    def disable(self):
+        """
+        Deactivate the network guard (restore original socket methods).
+        """
+        with self._patch_lock:
+            if not self.armed:
+                return
+            if self.manager.policy.on_change == self._policy_changed:
+                self.manager.policy.on_change = None
+            self._uninstall()
+            if self.enforce_state:
+                self.manager.stop_watcher()
+            self.armed = False
+            logging.info("[NetworkGuard] Disabled.")
+
+    def _remember(self, host, results):
+        """
+        Attach a resolved host name to its addresses for `RESOLVED_TTL` seconds.
+        """
+        now = time.monotonic()
+        expiry = now + self.RESOLVED_TTL
+        with self._resolved_lock:
+            resolved = self._resolved
+            if len(resolved) >= self.MAX_RESOLVED:
+                for address in [a for a, names in resolved.items() if max(names.values()) <= now]:
+                    del resolved[address]
+                if len(resolved) >= self.MAX_RESOLVED:
+                    resolved.clear()
+            for result in results:
+                resolved.setdefault(result[4][0], {})[host] = expiry
+
+    def _resolved_names(self, address):
+        """
+        Host names resolved to an address that have not expired.
+        """
+        now = time.monotonic()
+        with self._resolved_lock:
+            names = self._resolved.get(address)
+            if not names:
+                return []
+            for host in [h for h, expiry in names.items() if expiry <= now]:
+                del names[host]
+            if not names:
+                del self._resolved[address]
+            return sorted(names)
+
+    def admit(self, address):
+        """
+        Check a connection against the policy.
+
+        Args:
+            address (tuple): (host or ip, port, ...) as passed to `connect`.
+
+        Returns:
+            tuple[TokenBucket]: Limits the connection's traffic is charged to.
+
+        Raises:
+            PermissionError: If the policy denies the connection.
+        """
+        target, port = address[0], address[1]
+        user, pid = self.identify()
+        if _is_ip(target):
+            hosts = self._resolved_names(target)
+            checks = [(host, target) for host in hosts] or [(None, target)]
+        else:
+            checks = [(target, None)]
+        buckets = []
+        for host, ip in checks:
+            decision = self.manager.policy.check(host, ip, port, user, pid)
+            if not decision.allowed:
+                raise PermissionError(
+                    errno.EACCES,
+                    f"Connection to {host or ip}:{port} denied by network policy (NetworkGuard)",
+                )
+            buckets.extend(b for b in decision.buckets if b not in buckets)
+        return tuple(buckets)
+
+    def check(self, host, port):
+        """
+        Check a request that may reuse an already connected (pooled) socket.
+
+        Args:
+            host (str): Destination host name or address.
+            port (int): Destination port.
+
+        Returns:
+            tuple[TokenBucket]: Limits that apply (empty if the guard is inactive).
+
+        Raises:
+            OSError: If the network is disabled or the policy denies the destination.
+        """
+        if not self.active:
+            return ()
+        if self.enforce_state and not self.manager.enabled:
+            raise OSError("Network is disabled by system administrator (NetworkGuard)")
+        return self.admit((host, port))
+
+    def _make_socket_class(self, enforce_state):
+        guard = self
+        manager = self.manager
+        base = self._original_socket
+        base_connect, base_connect_ex = base.connect, base.connect_ex
+        base_send, base_sendall, base_sendto = base.send, base.sendall, base.sendto
+        base_recv, base_recv_into = base.recv, base.recv_into
+
+        class GuardedSocket(base):
+            _meter = ()
+
+            def __init__(self, *args, **kwargs):
+                if enforce_state and not manager.enabled:
+                    raise OSError("Network is disabled by system administrator (NetworkGuard)")
+                super().__init__(*args, **kwargs)
+
+            def connect(self, address):
+                if self.family in _INET_FAMILIES:
+                    self._meter = guard.admit(address)
+                return base_connect(self, address)
+
+            def connect_ex(self, address):
+                if self.family in _INET_FAMILIES:
+                    self._meter = guard.admit(address)
+                return base_connect_ex(self, address)
+
+            def send(self, data, *args):
+                sent = base_send(self, data, *args)
+                if self._meter:
+                    _charge(self, sent)
+                return sent
+
+            def sendall(self, data, *args):
+                result = base_sendall(self, data, *args)
+                if self._meter:
+                    _charge(self, memoryview(data).nbytes)
+                return result
+
+            def sendto(self, data, *args):
+                sent = base_sendto(self, data, *args)
+                if self._meter:
+                    _charge(self, sent)
+                return sent
+
+            def recv(self, *args):
+                data = base_recv(self, *args)
+                if self._meter:
+                    _charge(self, len(data))
+                return data
+
+            def recv_into(self, *args):
+                received = base_recv_into(self, *args)
+                if self._meter:
+                    _charge(self, received)
+                return received
+
+        GuardedSocket.__name__ = GuardedSocket.__qualname__ = "socket"
+        GuardedSocket.__module__ = "socket"
+        return GuardedSocket
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_ip(value):
+    try:
+        ipaddress.ip_address(value.split("%", 1)[0] if isinstance(value, str) else value)
+    except ValueError:
+        return False
+    return True
+
+
+def _charge(sock, nbytes):
+    """Charge transferred bytes to a socket's buckets; blocking sockets wait out any debt."""
+    wait = 0.0
+    for bucket in sock._meter:
+        wait = max(wait, bucket.consume(nbytes))
+    if wait and sock.gettimeout() != 0.0:
+        time.sleep(wait)
+
+
+if ssl:
+    class _MeteredSSLSocket(ssl.SSLSocket):
+        """SSLSocket that inherits the bandwidth limits of the socket it wraps."""
+        _meter = ()
+
+        @classmethod
+        def _create(cls, sock, *args, **kwargs):
+            meter = getattr(sock, "_meter", ())
+            self = super()._create(sock, *args, **kwargs)
+            self._meter = meter
+            return self
+
+        def send(self, data, flags=0):
+            sent = super().send(data, flags)
+            if self._meter:
+                _charge(self, sent)
+            return sent
+
+        def recv(self, buflen=1024, flags=0):
+            data = super().recv(buflen, flags)
+            if self._meter:
+                _charge(self, len(data))
+            return data
+
+        def recv_into(self, buffer, nbytes=None, flags=0):
+            received = super().recv_into(buffer, nbytes, flags)
+            if self._meter:
+                _charge(self, received)
+            return received
@@ -0,0 +1,150 @@
+# kernel/pid.py
+"""
+PID Allocation.
+
+This module hands out process IDs. Like the Linux allocator it keeps a bitmap
+of PIDs in use and a cursor at the last PID handed out: new PIDs are taken
+from just after the cursor, so a freed PID is only reused once the cursor has
+wrapped around the whole PID space. PIDs are therefore unique among live
+processes and increase monotonically until the first wrap.
+"""
+
+import threading
+import weakref
+
+PID_MAX = 1 << 22        # Same upper bound as Linux' pid_max limit
+RESERVED_PIDS = 300      # After a wrap, low PIDs stay reserved for early system processes
+
+
+class PidAllocator:
+    """
+    Bitmap-backed PID allocator with delayed reuse.
+
+    Attributes:
+        pid_max (int): PIDs are allocated in the range [1, pid_max).
+        last_pid (int): The most recently allocated PID.
+    """
+
+    def __init__(self, pid_max=PID_MAX, reserved=RESERVED_PIDS):
+        """
+        Initialize the PidAllocator.
+
+        Args:
+            pid_max (int, optional): Exclusive upper bound of the PID space.
+            reserved (int, optional): PIDs below this value are skipped after a wrap.
+        """
+        if pid_max < 2:
+            raise ValueError("pid_max must be at least 2")
+        self.pid_max = pid_max
+        self.reserved = min(max(1, reserved), pid_max - 1)
+        self.last_pid = 0
+        self._bitmap = bytearray((pid_max + 7) >> 3)
+        self._bitmap[0] |= 1  # PID 0 is never handed out
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._in_use
+
+    def _is_set(self, pid):
+        return self._bitmap[pid >> 3] & (1 << (pid & 7))
+
+    def _find_free(self, start, end):
+        """First clear bit in [start, end), or None. Skips full bytes at once."""
+        bitmap = self._bitmap
+        pid = start
+        while pid < end:
+            if (pid & 7) == 0 and bitmap[pid >> 3] == 0xFF:
+                pid += 8
+                continue
+            if not bitmap[pid >> 3] & (1 << (pid & 7)):
+                return pid
+            pid += 1
+        return None
+
+    def allocate(self):
+        """
+        Allocate the next free PID after the last one handed out.
+
+        Returns:
+            int: The new PID.
+
+        Raises:
+            RuntimeError: If every PID is in use.
+        """
+        with self._lock:
+            pid = self._find_free(self.last_pid + 1, self.pid_max)
+            if pid is None:
+                pid = self._find_free(self.reserved, self.last_pid + 1)
+            if pid is None:
+                raise RuntimeError("PID space exhausted")
+            self._bitmap[pid >> 3] |= 1 << (pid & 7)
+            self._in_use += 1
+            self.last_pid = pid
+            return pid
+
+    def free(self, pid):
+        """
+        Return a PID to the pool. It is reused only after the allocator wraps.
+
+        Args:
+            pid (int): The PID to release.
+
+        Returns:
+            bool: True if the PID was in use.
+        """
+        if not 0 < pid < self.pid_max:
+            return False
+        with self._lock:
+            if not self._is_set(pid):
+                return False
+            self._bitmap[pid >> 3] &= ~(1 << (pid & 7)) & 0xFF
+            self._in_use -= 1
+            return True
+
+    def in_use(self, pid):
+        """
+        Check whether a PID is currently allocated.
+
+        Args:
+            pid (int): The PID.
+
+        Returns:
+            bool: True if allocated.
+        """
+        return 0 < pid < self.pid_max and bool(self._is_set(pid))
+
+
+# Kernel-wide allocator used by every Process.
+_allocator = PidAllocator()
+
+
+def allocate_pid(owner=None):
+    """
+    Allocate a PID from the kernel-wide allocator.
+
+    Args:
+        owner (object, optional): Object the PID belongs to; the PID is freed
+            automatically when it is garbage collected.
+
+    Returns:
+        int: The new PID.
+    """
+    allocator = _allocator
+    pid = allocator.allocate()
+    if owner is not None:
+        weakref.finalize(owner, allocator.free, pid)
+    return pid
+
+
+def free_pid(pid):
+    """
+    Release a PID allocated with `allocate_pid` without an owner.
+
+    Args:
+        pid (int): The PID.
+
+    Returns:
+        bool: True if the PID was in use.
+    """
+    return _allocator.free(pid)
@@ -10,9 +10,9 @@ import os
 import subprocess
 import sys
 import shutil
-import requests
 import json
 from pathlib import Path
+from loop.kernel.httpclient import get_http_client
 
 REGISTRY_URL = "https://raw.githubusercontent.com/Kiy-K/loop-registry/main/plugins.json"
 
@@ -109,7 +109,7 @@ class PluginInstaller:
         Fetches the registry and finds the URL for a plugin name.
         """
         try:
-            response = requests.get(REGISTRY_URL, timeout=10)
+            response = get_http_client().get(REGISTRY_URL, timeout=10)
             if response.status_code == 200:
                 registry = response.json()
                 # Assuming registry structure: {"plugins": {"name": "url", ...}} or [{"name": "...", "url": "..."}]
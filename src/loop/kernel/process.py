@@ -11,6 +11,20 @@ import time
 from collections import deque
 from enum import Enum, auto
 
+from loop.kernel.runqueue import NICE_DEFAULT, clamp_nice
+from loop.kernel.events import Wait, Sleep
+from loop.kernel.pid import allocate_pid
+from loop.kernel.ipc import Channel
+from loop.kernel.stats import LatencyHistogram
+
+# Scheduling classes: NORMAL processes are stepped in the kernel thread,
+# WORKER processes run in a dedicated OS worker (see loop.kernel.worker_pool).
+SCHED_NORMAL = "normal"
+SCHED_WORKER = "worker"
+
+_perf_counter_ns = time.perf_counter_ns
+_thread_time_ns = time.thread_time_ns
+
 
 class ProcessState(Enum):
     """
@@ -36,15 +50,25 @@ class Process:
         uid (str): User ID of the process owner.
         args (list): Arguments passed to the process.
         env (dict): Environment variables for the process.
-        inbox (list): Queue for incoming IPC messages.
+        inbox (Channel): Bounded queue for incoming IPC messages.
         signal (str): Last received signal.
         exit_code (int): Exit code of the process.
         tokens_used (int): Simulated compute usage (AI tokens).
         context_window (list): Simulated RAM for AI agents.
-        cpu_time (float): Total wall clock time consumed by the process.
+        cpu_time (float): Total CPU time consumed by the process's steps, in seconds.
+        cpu_time_ns (int): Total CPU (thread) time consumed by steps, in nanoseconds.
+        run_time_ns (int): Total wall time spent inside steps, in nanoseconds.
+        steps (int): Number of steps executed.
+        step_latency (LatencyHistogram): Wall-time histogram of individual steps.
+        nice (int): Scheduling nice value (-20 highest priority .. 19 lowest).
+        sched_class (str): Scheduling class (SCHED_NORMAL or SCHED_WORKER).
+        wait_event (tuple): Event key the process is blocked on (None if not blocked).
+        sleep_request (float): Pending sleep duration to be armed by the scheduler.
+        watchdog_action (str): Per-process watchdog reaction overriding the default
+            ("log", "interrupt" or "isolate"; None for the watchdog's default).
     """
 
-    def __init__(self, name, target, uid="root", args=None, env=None):
+    def __init__(self, name, target, uid="root", args=None, env=None, nice=NICE_DEFAULT):
         """
         Initialize a new Process.
 
@@ -54,29 +78,38 @@ class Process:
             uid (str, optional): User ID. Defaults to "root".
             args (list, optional): Process arguments.
             env (dict, optional): Process environment variables.
+            nice (int, optional): Scheduling nice value. Defaults to 0.
         """
         self.name = name
         self.target = target # Generator
         self.state = ProcessState.READY
 
-        # PID generation (Time based is fine for v0.1)
-        self.pid = int(time.time() * 1000) % 1000000
+        # Unique PID; released when the process object is garbage collected
+        self.pid = allocate_pid(self)
 
         self.created_at = time.time()
         self.uid = uid
         self.args = args or []
         self.env = env or {}
+        self.nice = clamp_nice(nice)
+        self.sched_class = SCHED_NORMAL
 
         # === IPC & Signals (From your code) ===
-        self.inbox = []
+        self.inbox = Channel()
         self.signal = None
         self.exit_code = None
+        self.wait_event = None
+        self.sleep_request = None
+        self.watchdog_action = None
 
         # === AI Hardware Abstraction (The "LooP" Touch) ===
         # Re-adding these so your 'ps' command doesn't crash!
         self.tokens_used = 0      # "Compute usage"
         self.context_window = []  # "RAM" for agents
-        self.cpu_time = 0         # Wall clock time
+
+        # === Accounting (cpu_time, run_time_ns and steps are derived) ===
+        self.cpu_time_ns = 0
+        self.step_latency = LatencyHistogram()
 
     def send(self, msg):
         """
@@ -84,8 +117,11 @@ class Process:
 
         Args:
             msg (any): The message to send.
+
+        Returns:
+            bool: True if queued, False if the inbox is full.
         """
-        self.inbox.append(msg)
+        return self.inbox.send(msg)
 
     def receive(self):
         """
@@ -94,7 +130,19 @@ class Process:
         Returns:
             any: The message, or None if inbox is empty.
         """
-        return self.inbox.pop(0) if self.inbox else None
+        return self.inbox.recv()
+
+    def receive_many(self, n=None):
+        """
+        Receive up to `n` IPC messages at once.
+
+        Args:
+            n (int, optional): Maximum number of messages. Defaults to all queued.
+
+        Returns:
+            list: The messages, oldest first.
+        """
+        return self.inbox.recv_many(n)
 
     def deliver_signal(self, sig):
         """
@@ -111,23 +159,43 @@ class Process:
              # For v0.1, we just flag it.
              pass
 
+    def block(self, event):
+        """
+        Block this process until `event` fires.
+
+        The scheduler parks the process in the wait queue for `event` once the
+        current step yields.
+
+        Args:
+            event (tuple): The event key (see `loop.kernel.events`).
+        """
+        self.wait_event = event
+        self.state = ProcessState.WAITING
+
     def run_step(self):
         """
         Run a single execution step.
 
         Since processes are generators, this calls `next()` on the generator.
-        It manages state transitions (RUNNING -> READY or TERMINATED) and
-        catches exceptions.
+        It manages state transitions (RUNNING -> READY, WAITING or TERMINATED)
+        and catches exceptions. Yielding a `Wait` blocks the process on its event;
+        yielding a `Sleep` parks it until the scheduler's timer fires.
         """
         if self.state == ProcessState.TERMINATED:
             return
 
-        start_time = time.time()
+        start_ns = _perf_counter_ns()
+        start_cpu_ns = _thread_time_ns()
         self.state = ProcessState.RUNNING
 
         try:
             # Execute until the process yields control
-            next(self.target)
+            request = next(self.target)
+            if isinstance(request, Wait):
+                self.block(request.event)
+            elif isinstance(request, Sleep):
+                self.sleep_request = request.seconds
+                self.state = ProcessState.WAITING
 
             # If we get here, the process yielded successfully
             if self.state == ProcessState.RUNNING:
@@ -135,13 +203,52 @@ class Process:
 
         except StopIteration:
             self.state = ProcessState.TERMINATED
-            self.exit_code = 0
+            if self.exit_code is None:
+                self.exit_code = 0
         except Exception as e:
             print(f"[process {self.pid}] Error in process: {e}")
             self.state = ProcessState.TERMINATED
             self.exit_code = 1
         finally:
-            self.cpu_time += (time.time() - start_time)
+            self.cpu_time_ns += _thread_time_ns() - start_cpu_ns
+            self.step_latency.record(_perf_counter_ns() - start_ns)
+
+    def account(self, wall_ns, cpu_ns):
+        """
+        Charge one step of execution to this process.
+
+        Used by executors that step the process themselves (e.g. asyncio tasks).
+
+        Args:
+            wall_ns (int): Wall time spent in the step, in nanoseconds.
+            cpu_ns (int): CPU time spent in the step, in nanoseconds.
+        """
+        self.cpu_time_ns += cpu_ns
+        self.step_latency.record(wall_ns)
+
+    @property
+    def cpu_time(self):
+        """CPU seconds consumed by this process's steps."""
+        return self.cpu_time_ns / 1e9
+
+    @property
+    def run_time_ns(self):
+        """Wall nanoseconds spent inside this process's steps."""
+        return self.step_latency.total_ns
+
+    @property
+    def steps(self):
+        """Number of steps executed."""
+        return self.step_latency.count
+
+    def set_nice(self, nice):
+        """
+        Change the scheduling priority of this process.
+
+        Args:
+            nice (int): New nice value, clamped to -20 .. 19.
+        """
+        self.nice = clamp_nice(nice)
 
     def charge_tokens(self, amount):
         """
@@ -0,0 +1,251 @@
+# kernel/runqueue.py
+"""
+Run Queue Primitives.
+
+This module provides the data structures backing the `Scheduler`:
+a priority run queue with O(1) enqueue/dequeue (one FIFO per priority level
+plus a bitmap of non-empty levels) and an ordered process table with O(1)
+membership tests and removal.
+"""
+
+from collections import deque
+
+# Nice values follow the UNIX convention: -20 (highest priority) .. 19 (lowest).
+NICE_MIN = -20
+NICE_MAX = 19
+NICE_DEFAULT = 0
+PRIORITY_LEVELS = NICE_MAX - NICE_MIN + 1
+
+
+def clamp_nice(nice):
+    """
+    Clamp a nice value into the supported range.
+
+    Args:
+        nice (int): Requested nice value.
+
+    Returns:
+        int: Nice value within [NICE_MIN, NICE_MAX].
+    """
+    return max(NICE_MIN, min(NICE_MAX, int(nice)))
+
+
+def nice_to_level(nice):
+    """
+    Map a nice value to a run queue level (0 is served first).
+
+    Args:
+        nice (int): The nice value.
+
+    Returns:
+        int: The priority level index.
+    """
+    return clamp_nice(nice) - NICE_MIN
+
+
+def timeslice_for(nice):
+    """
+    Number of consecutive steps a process may run per scheduler tick.
+
+    Regular and low-priority processes get one step; boosted processes
+    (negative nice) get one extra step per 5 points of boost.
+
+    Args:
+        nice (int): The nice value.
+
+    Returns:
+        int: Steps per tick (>= 1).
+    """
+    nice = clamp_nice(nice)
+    if nice >= 0:
+        return 1
+    return 1 + (-nice) // 5
+
+
+class RunQueue:
+    """
+    Multi-level FIFO run queue.
+
+    Each priority level owns a deque; a bitmap records which levels are
+    non-empty so the highest-priority entry is found with a single bit trick.
+
+    Attributes:
+        levels (list[deque]): One FIFO per priority level.
+        bitmap (int): Bit `i` is set when `levels[i]` is non-empty.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty run queue.
+        """
+        self.levels = [deque() for _ in range(PRIORITY_LEVELS)]
+        self.bitmap = 0
+        self._size = 0
+
+    def push(self, item, nice=NICE_DEFAULT):
+        """
+        Enqueue an item at the level matching its nice value. O(1).
+
+        Args:
+            item (any): The entry to enqueue.
+            nice (int, optional): Nice value selecting the level.
+        """
+        level = nice_to_level(nice)
+        self.levels[level].append(item)
+        self.bitmap |= 1 << level
+        self._size += 1
+
+    def pop(self):
+        """
+        Dequeue the oldest entry of the highest-priority non-empty level. O(1).
+
+        Returns:
+            any: The entry, or None if the queue is empty.
+        """
+        if not self.bitmap:
+            return None
+        level = (self.bitmap & -self.bitmap).bit_length() - 1
+        queue = self.levels[level]
+        item = queue.popleft()
+        if not queue:
+            self.bitmap &= ~(1 << level)
+        self._size -= 1
+        return item
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        for queue in self.levels:
+            queue.clear()
+        self.bitmap = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+
+class ProcessTable:
+    """
+    Ordered registry of the processes owned by a scheduler.
+
+    Behaves like the list it replaces (iteration in admission order, `len`,
+    `in`, indexing, `append`, `remove`) but membership, removal and lookup
+    by PID are O(1). Mutations are forwarded to the owning scheduler so its queues stay in sync.
+
+    Iteration walks the table itself; code that may run while the table
+    changes (another thread, or removing processes in the loop) iterates
+    over `snapshot()` instead. Indexing uses a list rebuilt only after a
+    change, so index loops stay linear.
+
+    Attributes:
+        owner (Scheduler): The scheduler notified on append/remove.
+    """
+
+    def __init__(self, owner=None):
+        """
+        Initialize the ProcessTable.
+
+        Args:
+            owner (Scheduler, optional): Scheduler receiving admit/evict callbacks.
+        """
+        self.owner = owner
+        self._procs = {}
+        self._by_pid = {}
+        self._order = None  # Positional view for indexing, rebuilt after changes
+
+    def append(self, proc):
+        """
+        Register a process (no-op if already present).
+
+        Args:
+            proc (Process): The process.
+        """
+        if proc in self._procs:
+            return
+        self._procs[proc] = None
+        self._order = None
+        self._by_pid[getattr(proc, "pid", None)] = proc
+        if self.owner is not None:
+            self.owner._admit(proc)
+
+    def remove(self, proc):
+        """
+        Unregister a process. O(1).
+
+        Args:
+            proc (Process): The process.
+
+        Raises:
+            ValueError: If the process is not registered (list semantics).
+        """
+        try:
+            del self._procs[proc]
+        except KeyError:
+            raise ValueError(f"{proc!r} not in process table") from None
+        self._order = None
+        pid = getattr(proc, "pid", None)
+        if self._by_pid.get(pid) is proc:
+            del self._by_pid[pid]
+        if self.owner is not None:
+            self.owner._evict(proc)
+
+    def discard(self, proc):
+        """
+        Unregister a process if present.
+
+        Args:
+            proc (Process): The process.
+
+        Returns:
+            bool: True if the process was registered.
+        """
+        if proc not in self._procs:
+            return False
+        self.remove(proc)
+        return True
+
+    def get(self, pid):
+        """
+        Look up a registered process by PID. O(1).
+
+        Args:
+            pid (int): Process ID.
+
+        Returns:
+            Process: The process, or None if no registered process has this PID.
+        """
+        return self._by_pid.get(pid)
+
+    def __contains__(self, proc):
+        return proc in self._procs
+
+    def __len__(self):
+        return len(self._procs)
+
+    def __bool__(self):
+        return bool(self._procs)
+
+    def snapshot(self):
+        """
+        Copy the registered processes, for iterating while the table may change.
+
+        Returns:
+            list[Process]: The processes in admission order.
+        """
+        return list(self._procs)
+
+    def __iter__(self):
+        return iter(self._procs)
+
+    def __getitem__(self, index):
+        order = self._order
+        if order is None:
+            order = self._order = list(self._procs)
+        return order[index]
+
+    def __repr__(self):
+        return f"ProcessTable({list(self._procs)!r})"
@@ -2,10 +2,37 @@
 """
 Process Scheduler.
 
-This module implements a simple round-robin scheduler for managing process execution.
+This module implements a priority-aware scheduler for managing process execution.
+Runnable processes live in O(1) multi-level run queues (one FIFO per nice level);
+each tick serves every runnable process once, highest priority first, using the
+classic active/expired array swap. Blocked processes are parked in wait queues
+keyed by event (see `loop.kernel.events`) and are not touched until the event
+fires. Sleeping processes are parked on a hierarchical timer wheel; when nothing
+is runnable the loop idles until the next timer deadline or wakeup.
+
+The step currently running is published as `current_step` so a `Watchdog`
+can interrupt it or isolate its process on a dedicated worker thread.
 """
 
+import itertools
+import threading
+import time
+from collections import deque
+
 from loop.kernel.process import ProcessState
+from loop.kernel.events import TIMER, exit_event, timer_event
+from loop.kernel.runqueue import RunQueue, ProcessTable, NICE_DEFAULT, timeslice_for
+from loop.kernel.timerwheel import TimerWheel
+from loop.kernel.stats import LatencyHistogram
+from loop.kernel.watchdog import StepTimeout, inject_exception
+
+
+class _ThreadState(threading.local):
+    process = None
+
+
+class _HandedOff(Exception):
+    """Unwinds a loop thread whose step was isolated; another thread now runs the loop."""
 
 
 class Scheduler:
@@ -13,20 +40,74 @@ class Scheduler:
     Manages and schedules processes.
 
     Attributes:
-        processes (list): List of active Process objects.
+        processes (ProcessTable): Ordered table of active Process objects.
         current_process (Process): The currently executing process.
         running (bool): Flag indicating if the scheduler loop is active.
         exit_reason (str): Reason for stopping the scheduler (e.g., 'REBOOT', 'SHUTDOWN').
+        waiting (dict): Parked processes mapped to the event they wait on (or None).
+        wait_queues (dict): Event key -> ordered dict of processes blocked on it.
+        ticks (int): Number of completed scheduling ticks.
+        idle_timeout (float): Maximum seconds to sleep when nothing is runnable.
+        timers (TimerWheel): Pending timers for sleeping processes.
+        tick_latency (LatencyHistogram): Wall-time histogram of scheduling ticks.
+        watchdog (Watchdog): The attached watchdog, or None.
+        current_step (tuple): (seq, process, thread id) of the step running in
+            the loop thread, or None. Only published while a watchdog is attached.
+        isolated (dict): Processes moved off the loop thread, mapped to their worker threads.
     """
+    IDLE_TIMEOUT = 0.1
+
     def __init__(self):
         """
         Initialize the Scheduler.
         """
-        self.processes = []
-        self.current_process = None
+        self._local = _ThreadState()
         self.running = True # Control flag for the loop
         self.accepting_new = True # Flag to control if new processes can be added
         self.exit_reason = "REBOOT" # Default to reboot if stopped, unless specified
+        self.ticks = 0
+        self.idle_timeout = self.IDLE_TIMEOUT
+
+        # Run queues. Entries are (seq, proc); a stale seq means the entry was
+        # superseded (process removed, parked or re-queued) and is skipped.
+        self._active = RunQueue()
+        self._expired = RunQueue()
+        self._thinking = deque()
+        self._thinking_batch = deque()
+        self.waiting = {}
+        self.wait_queues = {}
+        self._queued = {}
+        self._seq = itertools.count()
+        self.timers = TimerWheel()
+        self.tick_latency = LatencyHistogram()
+
+        # Events may be fired from other threads (API server, listener),
+        # so queue mutations are serialized and idle sleeps are interruptible.
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+
+        # Watchdog support (see loop.kernel.watchdog)
+        self.watchdog = None
+        self.current_step = None
+        self._step_seq = itertools.count()
+        self._interrupted = set()
+        self._handoff = set()
+        self._steps_left = None
+        self._loop_done = threading.Event()
+        self.isolated = {}
+
+        self.processes = ProcessTable(self)
+
+    @property
+    def current_process(self):
+        """
+        The process whose step is running on the calling thread (None in kernel context).
+        """
+        return self._local.process
+
+    @current_process.setter
+    def current_process(self, value):
+        self._local.process = value
 
     def shutdown(self):
         """
@@ -41,6 +122,7 @@ class Scheduler:
         Stop the scheduler loop.
         """
         self.running = False
+        self._kick()
 
     def is_running(self):
         """
@@ -64,53 +146,531 @@ class Scheduler:
 
         self.processes.append(process)
 
+    def remove(self, process):
+        """
+        Remove a process from the scheduler. O(1).
+
+        Args:
+            process (Process): The process to remove.
+
+        Returns:
+            bool: True if the process was registered.
+        """
+        return self.processes.discard(process)
+
+    def get_process(self, pid):
+        """
+        Look up a scheduled process by PID. O(1).
+
+        Args:
+            pid (int): Process ID.
+
+        Returns:
+            Process: The process, or None if not found.
+        """
+        return self.processes.get(pid)
+
+    def set_nice(self, process, nice):
+        """
+        Change the nice value of a process.
+
+        Takes effect the next time the process is enqueued.
+
+        Args:
+            process (Process): The process.
+            nice (int): New nice value (-20 .. 19).
+        """
+        process.set_nice(nice)
+
+    # ==========================
+    # Blocking & Events
+    # ==========================
+
+    def block(self, process, event):
+        """
+        Block a process on an event.
+
+        The process is registered in the wait queue immediately, so an event
+        fired before the current step yields is not lost.
+
+        Args:
+            process (Process): The process to block.
+            event (tuple): The event key (see `loop.kernel.events`).
+        """
+        with self._lock:
+            if process in self.waiting:
+                self._unpark(process)
+            process.block(event)
+            if process in self.processes:
+                self._queued.pop(process, None)
+                self._park(process)
+
+    def sleep(self, process, seconds):
+        """
+        Park a process until `seconds` have elapsed.
+
+        Args:
+            process (Process): The process to put to sleep.
+            seconds (float): Sleep duration.
+
+        Returns:
+            int: The timer identifier.
+        """
+        with self._lock:
+            process.sleep_request = None
+            timer_id = self.timers.schedule(seconds)
+            self.block(process, timer_event(timer_id))
+        return timer_id
+
+    def wake(self, process):
+        """
+        Move a parked (WAITING) process back to the run queue.
+
+        Args:
+            process (Process): The process to wake.
+
+        Returns:
+            bool: True if the process was parked and is now runnable.
+        """
+        with self._lock:
+            if process not in self.waiting:
+                return False
+            self._unpark(process)
+            process.wait_event = None
+            if process.state == ProcessState.WAITING:
+                process.state = ProcessState.READY
+            self._enqueue(process)
+        self._kick()
+        return True
+
+    def signal(self, process):
+        """
+        Tell the scheduler a signal was delivered to a process.
+
+        Parked processes are woken so they observe the signal on their next turn.
+
+        Args:
+            process (Process): The signalled process.
+        """
+        self.wake(process)
+
+    def notify(self, event, count=None):
+        """
+        Fire an event, waking the processes blocked on it in FIFO order.
+
+        Cheap when nobody waits: a single dict lookup.
+
+        Args:
+            event (tuple): The event key.
+            count (int, optional): Maximum number of waiters to wake. Defaults to all.
+
+        Returns:
+            int: Number of processes woken.
+        """
+        if event not in self.wait_queues:
+            return 0
+        with self._lock:
+            waiters = self.wait_queues.get(event)
+            if not waiters:
+                return 0
+            woken = 0
+            for proc in list(waiters):
+                if count is not None and woken >= count:
+                    break
+                self.wake(proc)
+                woken += 1
+            return woken
+
+    def waiters(self, event):
+        """
+        List the processes blocked on an event.
+
+        Args:
+            event (tuple): The event key.
+
+        Returns:
+            list[Process]: Blocked processes in FIFO order.
+        """
+        return list(self.wait_queues.get(event, ()))
+
+    def runnable_count(self):
+        """
+        Number of processes currently queued to run.
+
+        Returns:
+            int: Entries in the ready and thinking queues (may include stale entries).
+        """
+        return len(self._active) + len(self._expired) + len(self._thinking)
+
+    def idle(self, timeout=None):
+        """
+        Sleep until a process becomes runnable, the scheduler is stopped,
+        the next timer is due, or `timeout` elapses.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to `idle_timeout`.
+        """
+        self._wakeup.clear()
+        if self.runnable_count() or not self.running:
+            return
+        timeout = self.idle_timeout if timeout is None else timeout
+        with self._lock:
+            next_timer = self.timers.next_delay()
+        if next_timer is not None:
+            timeout = min(timeout, next_timer)
+        if timeout > 0:
+            self._wakeup.wait(timeout)
+
+    def _kick(self):
+        """Interrupt an idle wait (safe to call from any thread)."""
+        self._wakeup.set()
+
+    def expire_timers(self):
+        """
+        Fire the events of every timer that is due.
+
+        Returns:
+            int: Number of processes woken.
+        """
+        with self._lock:
+            expired = self.timers.advance()
+        woken = 0
+        for timer_id in expired:
+            woken += self.notify(timer_event(timer_id))
+        return woken
+
+    # ==========================
+    # Queue bookkeeping
+    # ==========================
+
+    def _admit(self, process):
+        """Called by the process table when a process is registered."""
+        with self._lock:
+            if getattr(process, "state", None) == ProcessState.WAITING:
+                self._park(process)
+            else:
+                self._enqueue(process)
+        self._kick()
+
+    def _evict(self, process):
+        """Called by the process table when a process is unregistered."""
+        with self._lock:
+            self._queued.pop(process, None)
+            if process in self.waiting:
+                self._unpark(process)
+            worker = self.isolated.pop(process, None)
+        if worker is not None:
+            worker.put(None)
+        self.notify(exit_event(getattr(process, "pid", None)))
+
+    def _enqueue(self, process):
+        with self._lock:
+            seq = next(self._seq)
+            self._queued[process] = seq
+            if getattr(process, "state", None) == ProcessState.THINKING:
+                self._thinking.append((seq, process))
+            else:
+                self._expired.push((seq, process), getattr(process, "nice", NICE_DEFAULT))
+
+    def _park(self, process):
+        with self._lock:
+            event = getattr(process, "wait_event", None)
+            self.waiting[process] = event
+            if event is not None:
+                self.wait_queues.setdefault(event, {})[process] = None
+
+    def _unpark(self, process):
+        """Remove a parked process from its wait queue; cancel its timer if sleeping."""
+        event = self.waiting.pop(process)
+        if event is None:
+            return
+        waiters = self.wait_queues.get(event)
+        if waiters is not None:
+            waiters.pop(process, None)
+            if not waiters:
+                del self.wait_queues[event]
+        if event[0] == TIMER:
+            self.timers.cancel(event[1])
+
+    def _claim(self, queue):
+        """Pop the next current entry from `queue` and return its process (None when empty)."""
+        with self._lock:
+            while queue:
+                seq, proc = queue.pop() if isinstance(queue, RunQueue) else queue.popleft()
+                if self._queued.get(proc) == seq:
+                    del self._queued[proc]
+                    return proc
+        return None
+
+    def _terminate(self, proc, reason=None):
+        proc.state = ProcessState.TERMINATED
+        if reason:
+            print(f"[scheduler] {proc.pid} {reason}")
+        self.processes.discard(proc)
+
+    def _dispatch(self, proc):
+        """
+        Run one timeslice of a dequeued process and requeue, park or reap it.
+        """
+        for _ in range(timeslice_for(getattr(proc, "nice", NICE_DEFAULT))):
+            # handle signals
+            if proc.signal == "SIGKILL":
+                self._terminate(proc, "killed")
+                return
+            if proc.signal == "SIGTERM":
+                self._terminate(proc, "terminated")
+                return
+
+            # ProcessState.READY, RUNNING or THINKING are actionable
+            if proc.state == ProcessState.TERMINATED:
+                self.processes.discard(proc)
+                return
+            if proc.state == ProcessState.WAITING:
+                self._park(proc)
+                return
+
+            if self.isolated and proc in self.isolated:
+                self.isolated[proc].put(proc)
+                return
+
+            if self.watchdog is None:
+                self._local.process = proc
+                try:
+                    proc.run_step()
+                finally:
+                    self._local.process = None
+            elif self._watched_step(proc):
+                # The loop moved to another thread while this step ran
+                self._requeue(proc)
+                self._kick()
+                raise _HandedOff()
+            if proc.state == ProcessState.TERMINATED:
+                self.processes.discard(proc)
+                return
+            if proc not in self.processes:
+                # Removed while running (e.g. by the service manager)
+                return
+            if proc.state in (ProcessState.WAITING, ProcessState.THINKING):
+                break
+
+        self._requeue(proc)
+
+    def _requeue(self, proc):
+        """Put a process back after its step(s): reap, park, put to sleep or enqueue it."""
+        if proc.state == ProcessState.TERMINATED:
+            self.processes.discard(proc)
+        elif proc not in self.processes:
+            return
+        elif proc.state == ProcessState.WAITING:
+            if getattr(proc, "sleep_request", None) is not None:
+                self.sleep(proc, proc.sleep_request)
+            else:
+                self._park(proc)
+        else:
+            self._enqueue(proc)
+
+    def _watched_step(self, proc):
+        """Run one step published in `current_step`; returns True if it was handed off."""
+        step = (next(self._step_seq), proc, threading.get_ident())
+        self._local.process = proc
+        self.current_step = step
+        try:
+            try:
+                proc.run_step()
+            finally:
+                handed_off = self._end_step(step)
+        except StepTimeout:
+            # Interrupt landed just after the step returned
+            handed_off = self._end_step(step)
+        return handed_off
+
+    def _end_step(self, step):
+        """Clear the running step; returns True if it was handed off to isolation."""
+        with self._lock:
+            self.current_process = None
+            if self.current_step is step:
+                self.current_step = None
+            seq = step[0]
+            if seq in self._interrupted:
+                self._interrupted.discard(seq)
+                inject_exception(step[2], None)  # cancel if not delivered yet
+            if seq in self._handoff:
+                self._handoff.discard(seq)
+                return True
+        return False
+
+    # ==========================
+    # Watchdog hooks
+    # ==========================
+
+    def interrupt(self, step, exc_type=StepTimeout):
+        """
+        Raise `exc_type` inside the generator of a running step.
+
+        Args:
+            step (tuple): The step, as read from `current_step`.
+            exc_type (type, optional): Exception class. Defaults to `StepTimeout`.
+
+        Returns:
+            bool: True if the step was still running and the exception was queued.
+        """
+        with self._lock:
+            if self.current_step is not step:
+                return False
+            self._interrupted.add(step[0])
+            return inject_exception(step[2], exc_type)
+
+    def isolate(self, step):
+        """
+        Move the process of a running step off the loop thread.
+
+        The loop continues on a new thread; the stuck thread finishes the step,
+        requeues the process and then leaves the loop. Later steps of the
+        process run on its own worker thread.
+
+        Args:
+            step (tuple): The step, as read from `current_step`.
+
+        Returns:
+            bool: True if the step was still running and has been handed off.
+        """
+        with self._lock:
+            if self.current_step is not step:
+                return False
+            self.current_step = None
+            self._handoff.add(step[0])
+            self._isolate_process(step[1])
+        threading.Thread(target=self._resume_loop, name="loop-scheduler", daemon=True).start()
+        return True
+
+    def isolate_process(self, process):
+        """
+        Run every step of a process on its own worker thread from now on.
+
+        For processes known to block (e.g. the shell waiting for input), so
+        they never stall the loop, with or without a watchdog.
+
+        Args:
+            process (Process): A registered process.
+        """
+        with self._lock:
+            self._isolate_process(process)
+
+    def _isolate_process(self, proc):
+        if proc in self.isolated or proc not in self.processes:
+            return
+        worker = _IsolationWorker(self, proc)
+        self.isolated[proc] = worker
+        worker.start()
+
+    def _run_isolated_step(self, proc):
+        """Run one step of an isolated process on its worker thread."""
+        self.current_process = proc
+        try:
+            proc.run_step()
+        finally:
+            self.current_process = None
+        self._requeue(proc)
+        self._kick()
+
+    def tick(self):
+        """
+        Run one scheduling tick.
+
+        Due timers are fired first. Then every process that was runnable when
+        the tick started gets one timeslice, ready processes first (by priority),
+        then thinking processes. Processes admitted, woken or requeued during
+        the tick run on the next one.
+        """
+        start_ns = time.perf_counter_ns()
+        self.expire_timers()
+        with self._lock:
+            self._active, self._expired = self._expired, self._active
+            # Shared so a loop resumed after a handoff picks up the leftovers
+            thinking = self._thinking_batch
+            thinking.extend(self._thinking)
+            self._thinking.clear()
+
+        while True:
+            proc = self._claim(self._active)
+            if proc is None:
+                break
+            self._dispatch(proc)
+
+        while True:
+            proc = self._claim(thinking)
+            if proc is None:
+                break
+            self._dispatch(proc)
+
+        self.ticks += 1
+        self.tick_latency.record(time.perf_counter_ns() - start_ns)
+
     def run(self, max_steps=None):
         """
         Start the scheduling loop.
 
-        Iterates through the list of processes and calls `run_step()` on each
-        active process. Handles process termination and signals (SIGKILL, SIGTERM).
+        Repeatedly runs `tick()`, which dispatches each runnable process from the
+        run queues. Handles process termination and signals (SIGKILL, SIGTERM).
+        When every process is blocked, the loop idles until an event wakes one
+        or the next timer is due.
 
         Args:
             max_steps (int, optional): Maximum number of loop iterations to run.
                                        Useful for testing or limited execution.
         """
         self.running = True
-        steps = 0
+        self._loop_done.clear()
+        try:
+            self._loop(max_steps)
+        except _HandedOff:
+            # This thread finished an isolated step; wait for the loop to end elsewhere
+            self._loop_done.wait()
+
+    def _loop(self, max_steps):
+        self._steps_left = max_steps
         while self.running and self.processes:
-            if max_steps is not None and steps >= max_steps:
-                break
-            steps += 1
-
-            # Create a copy to allow modification during iteration (e.g. kill)
-            for proc in list(self.processes):
-                self.current_process = proc
-
-                # handle signals
-                if proc.signal == "SIGKILL":
-                    proc.state = ProcessState.TERMINATED
-                    print(f"[scheduler] {proc.pid} killed")
-                    self.processes.remove(proc)
-                    continue
-
-                if proc.signal == "SIGTERM":
-                    proc.state = ProcessState.TERMINATED
-                    print(f"[scheduler] {proc.pid} terminated")
-                    self.processes.remove(proc)
-                    continue
-
-                # If process is not ready/running, skip (unless we have wait logic)
-                # ProcessState.READY or ProcessState.RUNNING are actionable
-                if proc.state not in [ProcessState.READY, ProcessState.RUNNING, ProcessState.THINKING]:
-                    if proc.state == ProcessState.TERMINATED:
-                         self.processes.remove(proc)
-                    continue
-
-                # Run a step
-                proc.run_step()
+            if self._steps_left is not None:
+                if self._steps_left <= 0:
+                    break
+                self._steps_left -= 1
+            if not self.runnable_count():
+                self.idle()
+            self.tick()
+        self._loop_done.set()
+
+    def _resume_loop(self):
+        """Continue `run()` on a new thread after the loop thread was handed off."""
+        try:
+            self._loop(self._steps_left)
+        except _HandedOff:
+            pass
+        except Exception as e:
+            print(f"[scheduler] Loop crashed: {e}")
+            self._loop_done.set()
+
+
+class _IsolationWorker(threading.Thread):
+    """Dedicated thread running the steps of one isolated process."""
+
+    def __init__(self, scheduler, proc):
+        super().__init__(name=f"loop-isolated-{proc.pid}", daemon=True)
+        self.scheduler = scheduler
+        self._requests = deque()
+        self._ready = threading.Semaphore(0)
 
-                if proc.state == ProcessState.TERMINATED:
-                    self.processes.remove(proc)
-                    # print(f"[scheduler] {proc.pid} exited")
+    def put(self, proc):
+        """Queue one step of `proc` (None stops the worker)."""
+        self._requests.append(proc)
+        self._ready.release()
 
-                self.current_process = None
+    def run(self):
+        while True:
+            self._ready.acquire()
+            proc = self._requests.popleft()
+            if proc is None:
+                return
+            try:
+                self.scheduler._run_isolated_step(proc)
+            except Exception as e:
+                print(f"[scheduler] Isolated step of {proc.pid} failed: {e}")
@@ -0,0 +1,210 @@
+# kernel/state_encoder.py
+"""
+Prompt State Encoders.
+
+The agent shows the DOM state to the model every turn, and the Python
+`str()` of the state dict spends a large share of the prompt on quotes,
+braces and repeated keys. A `StateEncoder` turns the state into prompt
+text; the agent's encoder is chosen by name (LOOP_STATE_ENCODER):
+
+- "repr": `str(state)`, the original format.
+- "json": minified JSON.
+- "compact": one block per section. Directory trees become an indented
+  path list (one entry per line, directories marked with a trailing "/"),
+  lists of records (processes, containers, pods) a table with a single
+  header row, and anything else minified JSON.
+
+`tests/benchmark_state_encoders.py` compares their token counts on
+representative states.
+"""
+
+import json
+from abc import ABC, abstractmethod
+
+DEFAULT_ENCODER = "compact"
+
+
+class StateEncoder(ABC):
+    """
+    Converts an agent state dict into prompt text.
+
+    Attributes:
+        name (str): Registry name.
+    """
+    name = None
+
+    @abstractmethod
+    def encode(self, state):
+        """
+        Encode a state.
+
+        Args:
+            state (dict): Section name -> value, as returned by `ReActAgent._observe`.
+
+        Returns:
+            str: Prompt text.
+        """
+        pass
+
+
+class ReprEncoder(StateEncoder):
+    name = "repr"
+
+    def encode(self, state):
+        return str(state)
+
+
+class JSONEncoder(StateEncoder):
+    name = "json"
+
+    def encode(self, state):
+        return _json(state)
+
+
+class CompactEncoder(StateEncoder):
+    name = "compact"
+
+    def encode(self, state):
+        blocks = []
+        for name, value in state.items():
+            if _is_tree(value):
+                blocks.append(f"[{name}]\n{encode_tree(value)}")
+            elif _is_table(value):
+                blocks.append(f"[{name}]\n{encode_table(value)}")
+            elif _is_word_list(value):
+                blocks.append(f"{name}: " + (", ".join(value) if value else "none"))
+            elif isinstance(value, str):
+                blocks.append(f"{name}: {value}")
+            else:
+                blocks.append(f"{name}: {_json(value)}")
+        return "\n".join(blocks)
+
+
+def encode_tree(node, name="/", indent=0):
+    """
+    Render a filesystem tree (as built by `SystemDOM`) as an indented path list.
+
+    Directories end in "/" (the root is "/"), attributes such as permissions
+    and owner follow the name, collapsed directories show their entry counts
+    and cut listings the number of omitted entries. Names containing
+    whitespace or starting with a quote are JSON-encoded, so the name ends
+    where the attributes begin.
+
+    Args:
+        node (dict): Tree node with "type" and, for directories, "children".
+        name (str, optional): Name shown for the node.
+        indent (int, optional): Nesting level.
+
+    Returns:
+        str: One line per entry.
+    """
+    lines = []
+    _tree_lines(node, name, indent, lines)
+    return "\n".join(lines)
+
+
+def _tree_lines(node, name, indent, lines):
+    pad = " " * indent
+    is_dir = node.get("type") == "directory"
+    if any(c.isspace() for c in name) or name.startswith('"'):
+        name = _json(name)
+    label = name if not is_dir or name.endswith("/") else name + "/"
+    parts = [pad + label]
+    for key, value in node.items():
+        if key in ("type", "children", "files", "dirs", "more"):
+            continue
+        parts.append(str(value))
+    if node.get("type") not in ("file", "directory"):
+        parts.append("?")
+    if "children" not in node and ("files" in node or "dirs" in node):
+        parts.append(f"({node.get('files', 0)} files, {node.get('dirs', 0)} dirs)")
+    lines.append(" ".join(parts))
+    for child_name, child in node.get("children", {}).items():
+        _tree_lines(child, child_name, indent + 1, lines)
+    if node.get("more"):
+        lines.append(f"{pad} ...{node['more']} more")
+
+
+def encode_table(rows):
+    """
+    Render a list of records as a table: a header row of the keys (in order of
+    first appearance), then one row per record. Cells are separated by "|";
+    nested values and strings that would break the layout are JSON-encoded.
+
+    Args:
+        rows (list[dict]): The records.
+
+    Returns:
+        str: The table.
+    """
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    lines = ["|".join(str(c) for c in columns)]
+    for row in rows:
+        lines.append("|".join(_cell(row.get(c)) for c in columns))
+    return "\n".join(lines)
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and not ("|" in value or "\n" in value or value != value.strip()):
+        return value
+    return _json(value)
+
+
+def _is_word_list(value):
+    return isinstance(value, list) and all(
+        isinstance(v, str) and v and "," not in v and "\n" not in v and v == v.strip() for v in value
+    )
+
+
+def _is_tree(value):
+    return isinstance(value, dict) and value.get("type") == "directory"
+
+
+def _is_table(value):
+    return bool(value) and isinstance(value, list) and all(isinstance(v, dict) for v in value)
+
+
+def _json(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+ENCODERS = {cls.name: cls() for cls in (ReprEncoder, JSONEncoder, CompactEncoder)}
+
+
+def register_encoder(encoder):
+    """
+    Make an encoder available by name.
+
+    Args:
+        encoder (StateEncoder): The encoder; its `name` is the registry key.
+    """
+    ENCODERS[encoder.name] = encoder
+
+
+def get_encoder(encoder=None):
+    """
+    Resolve an encoder.
+
+    Args:
+        encoder (str or StateEncoder, optional): Registry name or encoder instance.
+            Defaults to DEFAULT_ENCODER.
+
+    Returns:
+        StateEncoder: The encoder.
+
+    Raises:
+        ValueError: If no encoder has that name.
+    """
+    if isinstance(encoder, StateEncoder):
+        return encoder
+    name = encoder or DEFAULT_ENCODER
+    try:
+        return ENCODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown state encoder '{name}' (available: {', '.join(ENCODERS)})") from None
@@ -0,0 +1,123 @@
+# kernel/stats.py
+"""
+Scheduler Statistics.
+
+This module provides `LatencyHistogram`, a fixed-size log2 histogram used to
+record per-process step latencies and scheduler tick latencies. Recording is
+O(1) and allocation-free, so it can stay enabled on every step.
+"""
+
+# Bucket i holds samples in [2**(i-1), 2**i) microseconds; bucket 0 is < 1us.
+BUCKETS = 24  # last bucket: >= ~4.2s
+
+
+class LatencyHistogram:
+    """
+    Log2-bucketed latency histogram (nanosecond samples).
+
+    Attributes:
+        count (int): Number of samples.
+        total_ns (int): Sum of all samples.
+        max_ns (int): Largest sample.
+        buckets (list[int]): Sample counts per bucket.
+    """
+    __slots__ = ("count", "total_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        """
+        Initialize an empty LatencyHistogram.
+        """
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * BUCKETS
+
+    @staticmethod
+    def bucket_bound_ns(index):
+        """
+        Upper bound (exclusive) of a bucket, in nanoseconds.
+
+        Args:
+            index (int): Bucket index.
+
+        Returns:
+            int: The bound (None for the open-ended last bucket).
+        """
+        if index >= BUCKETS - 1:
+            return None
+        return 1000 << index
+
+    def record(self, ns):
+        """
+        Add a sample.
+
+        Args:
+            ns (int): Latency in nanoseconds.
+        """
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        index = (ns // 1000).bit_length()
+        self.buckets[index if index < BUCKETS else BUCKETS - 1] += 1
+
+    def mean_ns(self):
+        """
+        Average sample.
+
+        Returns:
+            float: Mean latency in nanoseconds (0 if empty).
+        """
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile_ns(self, pct):
+        """
+        Approximate percentile, reported as the upper bound of its bucket.
+
+        Args:
+            pct (float): Percentile in [0, 100].
+
+        Returns:
+            int: Latency bound in nanoseconds (0 if empty; `max_ns` for the last bucket).
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                bound = self.bucket_bound_ns(index)
+                return self.max_ns if bound is None else min(bound, self.max_ns)
+        return self.max_ns
+
+    def reset(self):
+        """
+        Drop every sample.
+        """
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * BUCKETS
+
+    def to_dict(self):
+        """
+        Summarize the histogram.
+
+        Returns:
+            dict: count, mean/p50/p99/max in microseconds and the non-empty buckets
+            as {"<bound_us>": count} (the last bucket is keyed "inf").
+        """
+        buckets = {}
+        for index, n in enumerate(self.buckets):
+            if n:
+                bound = self.bucket_bound_ns(index)
+                buckets["inf" if bound is None else str(bound // 1000)] = n
+        return {
+            "count": self.count,
+            "mean_us": self.mean_ns() / 1000,
+            "p50_us": self.percentile_ns(50) / 1000,
+            "p99_us": self.percentile_ns(99) / 1000,
+            "max_us": self.max_ns / 1000,
+            "buckets": buckets,
+        }
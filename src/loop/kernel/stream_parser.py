@@ -0,0 +1,119 @@
+# kernel/stream_parser.py
+"""
+Incremental Action Parser.
+
+`StreamingActionParser` is fed the agent's JSON response as the LLM streams
+it and reports each action the moment its object is closed, so the agent
+can start executing it while the model is still writing the rest of the
+response. It tracks only what it needs for that: string and escape state,
+and a stack of open containers with the key each one is the value of.
+
+Recognized actions are the top-level "action" object and every object in
+the top-level "actions" list, matching `ReActAgent._parse_actions`. Text
+before the opening brace (e.g. a markdown fence) and after the closing one
+is ignored.
+"""
+
+import json
+
+
+class StreamingActionParser:
+    """
+    Detects completed action objects in a streamed JSON response.
+
+    Attributes:
+        actions (list[tuple[str, list]]): (name, args) pairs found so far.
+        complete (bool): True once the top-level object has been closed.
+    """
+
+    def __init__(self):
+        self.actions = []
+        self.complete = False
+        self._text = ""
+        self._pos = 0
+        self._stack = []        # Open containers: [char, start, key, pending_key]
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+
+    def feed(self, chunk):
+        """
+        Consume the next chunk of the response.
+
+        Args:
+            chunk (str): Text as received from the LLM.
+
+        Returns:
+            list[tuple[str, list]]: Actions completed by this chunk, in order.
+        """
+        found = []
+        if self.complete:
+            return found
+        self._text += chunk
+        text = self._text
+        stack = self._stack
+        pos = self._pos
+        while pos < len(text):
+            ch = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start:pos + 1]
+            elif ch == '"':
+                if stack:
+                    self._in_string = True
+                    self._string_start = pos
+            elif ch in "{[":
+                key = None
+                if stack:
+                    parent = stack[-1]
+                    key = parent[3] if parent[0] == "{" else parent[2]
+                stack.append([ch, pos, key, None])
+            elif ch in "}]":
+                if stack:
+                    frame = stack.pop()
+                    if self._is_action(frame):
+                        action = self._decode(text[frame[1]:pos + 1])
+                        if action is not None:
+                            self.actions.append(action)
+                            found.append(action)
+                    if not stack:
+                        self.complete = True
+                        pos += 1
+                        break
+            elif ch == ":" and stack and stack[-1][0] == "{":
+                try:
+                    stack[-1][3] = json.loads(self._last_string)
+                except (TypeError, ValueError):
+                    stack[-1][3] = None
+            elif ch == "," and stack and stack[-1][0] == "{":
+                stack[-1][3] = None
+            pos += 1
+        self._pos = pos
+        return found
+
+    def _is_action(self, frame):
+        if frame[0] != "{":
+            return False
+        depth = len(self._stack)
+        if depth == 1:  # "action": {...} in the top-level object
+            return self._stack[0][3] == "action"
+        if depth == 2:  # {...} inside the top-level "actions": [...]
+            return self._stack[1][0] == "[" and self._stack[1][2] == "actions"
+        return False
+
+    @staticmethod
+    def _decode(fragment):
+        try:
+            spec = json.loads(fragment)
+        except ValueError:
+            return None
+        if not isinstance(spec, dict) or not spec.get("name"):
+            return None
+        args = spec.get("args", [])
+        return spec["name"], args if isinstance(args, list) else [args]
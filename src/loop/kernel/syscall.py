@@ -7,11 +7,18 @@ kernel-space resources (filesystem, network, process management).
 It handles permission checking and dispatches requests to the appropriate subsystems.
 """
 
+import inspect
 import time
 import json
 import os
+import threading
 import psutil
 from loop.kernel import rootfs
+from loop.kernel import syscall_table
+from loop.kernel.syscall_table import ROOT
+from contextlib import contextmanager
+from functools import partial
+from loop.kernel.events import ipc_event, ipc_space_event, exit_event, file_event
 from loop.kernel.users import UserManager
 from loop.kernel.network import NetworkManager
 from loop.kernel.cloud.docker_interface import DockerInterface
@@ -23,6 +30,7 @@ from loop.kernel.shell.launcher import AppLauncher
 from loop.kernel.shell.supervisor import Supervisor
 from loop.kernel.shell.window_manager import WindowManager
 from loop.kernel.plugins.installer import PluginInstaller
+from loop.kernel.httpclient import get_http_client
 from loop.kernel.plugins.loader import PluginLoader
 
 class SyscallHandler:
@@ -67,6 +75,9 @@ class SyscallHandler:
 
         self.sandbox = None
 
+        # Credentials cached for the duration of a sys_batch() on this thread
+        self._creds = threading.local()
+
     def set_scheduler(self, scheduler):
         """
         Set the scheduler instance.
@@ -147,10 +158,61 @@ class SyscallHandler:
         Returns:
             str: The UID, or "root" if running in kernel context.
         """
+        uid = getattr(self._creds, "uid", None)
+        if uid is not None:
+            return uid  # Inside sys_batch: validated once for the whole batch
         if self.scheduler and self.scheduler.current_process:
             return self.scheduler.current_process.uid
         return "root"  # Kernel/System context
 
+    def current_identity(self):
+        """
+        Identify the caller for per-user and per-process network policy.
+
+        Returns:
+            tuple: (uid, pid), pid being None in kernel context.
+        """
+        process = self.scheduler.current_process if self.scheduler else None
+        return self._get_current_uid(), (process.pid if process is not None else None)
+
+    def caller_context(self):
+        """
+        Capture the calling thread's identity for work handed to other threads.
+
+        The current process and batch credentials are thread-local, so a
+        worker thread would otherwise run its syscalls as root.
+
+        Returns:
+            callable: Returns a context manager that, on any thread, makes
+                syscalls run as the captured caller and restores that thread's
+                own identity on exit.
+        """
+        process = self.scheduler.current_process if self.scheduler else None
+        uid = getattr(self._creds, "uid", None)
+        return partial(self.acting_as, uid, process)
+
+    @contextmanager
+    def acting_as(self, uid, process=None):
+        """
+        Make syscalls on this thread run as another caller until the block exits.
+
+        Args:
+            uid (str): User to act as; None falls back to the process's user.
+            process (Process, optional): Process to act as.
+        """
+        scheduler = self.scheduler
+        saved_process = scheduler.current_process if scheduler else None
+        saved = (getattr(self._creds, "uid", None), getattr(self._creds, "cache", None))
+        if scheduler:
+            scheduler.current_process = process
+        self._creds.uid, self._creds.cache = uid, None
+        try:
+            yield
+        finally:
+            if scheduler:
+                scheduler.current_process = saved_process
+            self._creds.uid, self._creds.cache = saved
+
     def _get_current_groups(self):
         """
         Get the groups (roles) of the currently running process.
@@ -158,7 +220,150 @@ class SyscallHandler:
         uid = self._get_current_uid()
         if uid == "root":
             return ["root", "admin"]
-        return self.user_manager.get_roles(uid)
+        cache = getattr(self._creds, "cache", None)
+        if cache is None:
+            return self.user_manager.get_roles(uid)
+        if "roles" not in cache:
+            cache["roles"] = self.user_manager.get_roles(uid)
+        return cache["roles"]
+
+    def _has_permission(self, user, permission):
+        """
+        Check an RBAC permission, memoized for the duration of a batch.
+
+        Args:
+            user (str): Username.
+            permission (str): Permission name.
+
+        Returns:
+            bool: True if granted.
+        """
+        if user == "root":
+            return True
+        cache = getattr(self._creds, "cache", None)
+        if cache is None:
+            return self.user_manager.has_permission(user, permission)
+        key = ("perm", permission)
+        if key not in cache:
+            cache[key] = self.user_manager.has_permission(user, permission)
+        return cache[key]
+
+    # Dispatch
+    def _check_entry(self, entry, args=(), kwargs=None):
+        """Raise PermissionError unless the caller satisfies the table requirement of `entry`."""
+        required = entry.permission
+        if required is None and entry.name not in syscall_table.HOST_PATH_SYSCALLS:
+            return
+        uid = self._get_current_uid()
+        if uid == "root":
+            return
+        if required is None:
+            # Unresolved paths reach the whole host filesystem
+            bound = inspect.signature(getattr(self, entry.name)).bind(*args, **(kwargs or {}))
+            if bound.arguments.get("resolve", True) is not True:
+                raise PermissionError(f"{entry.name} with resolve=False denied for {uid}")
+            return
+        if required == ROOT or not self._has_permission(uid, required):
+            raise PermissionError(f"{entry.name} denied for {uid}")
+
+    def syscall(self, call, *args, **kwargs):
+        """
+        Invoke a syscall through the syscall table.
+
+        Args:
+            call (int | str): Syscall number or name (e.g. 10, "sys_ls" or "ls").
+            *args: Positional arguments for the syscall.
+            **kwargs: Keyword arguments for the syscall.
+
+        Returns:
+            any: The syscall result.
+
+        Raises:
+            ValueError: If the syscall is unknown.
+            PermissionError: If the caller lacks the required permission.
+        """
+        entry = syscall_table.lookup(call)
+        if entry is None:
+            raise ValueError(f"unknown syscall: {call!r}")
+        self._check_entry(entry, args, kwargs)
+        return getattr(self, entry.name)(*args, **kwargs)
+
+    def has_syscall(self, call):
+        """
+        Check whether a syscall exists in the table.
+
+        Args:
+            call (int | str): Syscall number or name.
+
+        Returns:
+            bool: True if it can be dispatched.
+        """
+        return syscall_table.lookup(call) is not None
+
+    def sys_batch(self, calls, user=None, password=None, stop_on_error=False, token=None, source=None):
+        """
+        Execute several syscalls in one round-trip.
+
+        Credentials are resolved once: with a session `token` (see
+        `UserManager.login`) or `user`/`password` the batch runs as that user,
+        otherwise as the calling process. A batch without credentials from a
+        thread that is not a scheduled process (e.g. an API server thread) is
+        rejected rather than run in kernel context. Roles and permission checks
+        are cached for the whole batch.
+
+        Each call is a dict {"call": nr_or_name, "args": [...], "kwargs": {...}}
+        or a tuple (nr_or_name, args[, kwargs]).
+
+        Args:
+            calls (list): The syscalls to run, in order.
+            user (str, optional): Run the batch as this user.
+            password (str, optional): Password for `user`.
+            stop_on_error (bool, optional): Skip the remaining calls after a failure.
+            token (str, optional): Session token; takes precedence over `user`/`password`.
+            source (str, optional): Client identifier used for login throttling.
+
+        Returns:
+            list[dict]: One {"ok": True, "result": ...} or {"ok": False, "error": ...}
+            entry per call, in order.
+        """
+        if token is not None:
+            user = self.user_manager.check_session(token)
+            if user is None:
+                return [{"ok": False, "error": "authentication failed"} for _ in calls]
+        elif user is not None:
+            if not self.user_manager.authenticate(user, password, source):
+                return [{"ok": False, "error": "authentication failed"} for _ in calls]
+        else:
+            user = getattr(self._creds, "uid", None)  # Nested in another batch
+            if user is None:
+                process = self.scheduler.current_process if self.scheduler else None
+                if process is None:
+                    return [{"ok": False, "error": "authentication required"} for _ in calls]
+                user = process.uid
+
+        outer = (getattr(self._creds, "uid", None), getattr(self._creds, "cache", None))
+        self._creds.uid = user
+        self._creds.cache = {}
+        results = []
+        failed = False
+        try:
+            for spec in calls:
+                if failed:
+                    results.append({"ok": False, "error": "skipped"})
+                    continue
+                try:
+                    if isinstance(spec, dict):
+                        call, args, kwargs = spec.get("call"), spec.get("args", ()), spec.get("kwargs", {})
+                    else:
+                        call, args = spec[0], spec[1] if len(spec) > 1 else ()
+                        kwargs = spec[2] if len(spec) > 2 else {}
+                    results.append({"ok": True, "result": self.syscall(call, *args, **(kwargs or {}))})
+                except Exception as e:
+                    results.append({"ok": False, "error": f"{type(e).__name__}: {e}"})
+                    failed = stop_on_error
+        finally:
+            self._creds.uid, self._creds.cache = outer
+        return results
 
     # Filesystem
     def sys_ls(self, path="/", resolve=True):
@@ -238,6 +443,7 @@ class SyscallHandler:
         with open(real_path, "w") as f:
             f.write(data)
 
+        self._notify(file_event(path))
         self.sys_log(f"[fs] write {path} by {self._get_current_uid()}")
         return True
 
@@ -264,6 +470,8 @@ class SyscallHandler:
 
         with open(real_path, "a") as f:
             f.write(text + "\n")
+
+        self._notify(file_event(path))
         return True
 
     def sys_delete(self, path, resolve=True):
@@ -288,6 +496,7 @@ class SyscallHandler:
                 os.rmdir(real_path)  # Only empty
             else:
                 os.remove(real_path)
+            self._notify(file_event(path))
             self.sys_log(f"[fs] delete {path} by {self._get_current_uid()}")
             return True
         except Exception:
@@ -309,47 +518,187 @@ class SyscallHandler:
 
         current_uid = self._get_current_uid()
 
-        for p in self.scheduler.processes:
-            if p.pid == pid:
-                if current_uid != "root" and p.uid != current_uid:
-                    self.sys_log(f"kill denied for {current_uid} on {pid}")
-                    return False
+        p = self.scheduler.get_process(pid)
+        if p is None:
+            return False
+        if current_uid != "root" and p.uid != current_uid:
+            self.sys_log(f"kill denied for {current_uid} on {pid}")
+            return False
 
-                p.deliver_signal(sig)
-                self.sys_log(f"signal {sig} to {pid}")
-                return True
-        return False
+        p.deliver_signal(sig)
+        self.scheduler.signal(p)
+        self.sys_log(f"signal {sig} to {pid}")
+        return True
 
-    def sys_send(self, pid, message):
+    def sys_send(self, pid, message, block=False):
         """
         Send an IPC message to a process.
 
+        Inboxes are bounded. When the destination inbox is full the message is
+        refused; with `block=True` the caller is also parked until the receiver
+        frees a slot, and should yield and call `sys_send` again.
+
         Args:
             pid (int): Process ID.
-            message (any): The message.
+            message (any): The message (passed by reference, never copied).
+            block (bool, optional): Block the caller while the inbox is full.
 
         Returns:
             bool: True if sent, False otherwise.
         """
         if not self.scheduler:
             return False
-        for p in self.scheduler.processes:
-            if p.pid == pid:
-                p.send(message)
-                return True
-        return False
+        p = self.scheduler.get_process(pid)
+        if p is None:
+            return False
+        if not p.send(message):
+            sender = self.scheduler.current_process
+            if block and sender is not None:
+                p.inbox.on_space = partial(self.scheduler.notify, ipc_space_event(pid))
+                self.scheduler.block(sender, ipc_space_event(pid))
+                if not p.inbox.full():
+                    # Drained between the send attempt and the block
+                    self.scheduler.wake(sender)
+            return False
+        self.scheduler.notify(ipc_event(pid))
+        return True
 
-    def sys_recv(self):
+    def sys_recv(self, block=False):
         """
         Receive an IPC message for the current process.
 
+        With `block=True` and an empty inbox, the caller is parked until a
+        message arrives; it should yield and call `sys_recv` again. The wait
+        is registered before the inbox is checked a second time, so a message
+        sent concurrently from another thread is not missed.
+
+        Args:
+            block (bool, optional): Block the caller when the inbox is empty.
+
         Returns:
             any: The message, or None.
         """
         if not self.scheduler or not self.scheduler.current_process:
             return None
         proc = self.scheduler.current_process
-        return proc.receive()
+        msg = proc.receive()
+        if msg is None and block:
+            self.scheduler.block(proc, ipc_event(proc.pid))
+            msg = proc.receive()  # Sent before the wait was registered
+            if msg is not None:
+                self.scheduler.wake(proc)
+        return msg
+
+    def sys_recv_many(self, n=None, block=False):
+        """
+        Receive up to `n` IPC messages for the current process in one call.
+
+        Args:
+            n (int, optional): Maximum number of messages. Defaults to all queued.
+            block (bool, optional): Block the caller when the inbox is empty.
+
+        Returns:
+            list: The messages, oldest first.
+        """
+        if not self.scheduler or not self.scheduler.current_process:
+            return []
+        proc = self.scheduler.current_process
+        batch = proc.receive_many(n)
+        if not batch and block:
+            self.scheduler.block(proc, ipc_event(proc.pid))
+            batch = proc.receive_many(n)  # Sent before the wait was registered
+            if batch:
+                self.scheduler.wake(proc)
+        return batch
+
+    async def sys_recv_async(self, timeout=None):
+        """
+        Await an IPC message from a coroutine process (AsyncScheduler only).
+
+        Args:
+            timeout (float, optional): Seconds to wait before giving up.
+
+        Returns:
+            any: The message, or None on timeout.
+        """
+        if not self.scheduler or not self.scheduler.current_process:
+            return None
+        proc = self.scheduler.current_process
+        while True:
+            msg = proc.receive()
+            if msg is not None:
+                return msg
+            arrived = await self.scheduler.wait_for(
+                ipc_event(proc.pid), timeout, predicate=lambda: bool(proc.inbox)
+            )
+            if not arrived:
+                return None
+
+    def sys_waitpid(self, pid):
+        """
+        Wait for a process to exit.
+
+        If the process is still alive, the caller is parked until it exits;
+        it should yield and call `sys_waitpid` again.
+
+        Args:
+            pid (int): Process ID to wait for.
+
+        Returns:
+            bool: True if the process has already exited, False if the caller was blocked.
+        """
+        if not self.scheduler:
+            return True
+        if self.scheduler.get_process(pid) is None:
+            return True
+        proc = self.scheduler.current_process
+        if proc:
+            self.scheduler.block(proc, exit_event(pid))
+        return False
+
+    def sys_wait_file(self, path):
+        """
+        Park the current process until the file at `path` is written, appended or deleted.
+
+        The caller should yield after this call.
+
+        Args:
+            path (str): Virtual file path.
+
+        Returns:
+            bool: True if the caller was blocked.
+        """
+        if not self.scheduler or not self.scheduler.current_process:
+            return False
+        self.scheduler.block(self.scheduler.current_process, file_event(path))
+        return True
+
+    def sys_sleep(self, seconds):
+        """
+        Put the current process to sleep for `seconds`.
+
+        The process is parked on the scheduler's timer wheel and should yield
+        right after this call. Outside of a process (kernel context) this
+        falls back to a blocking sleep.
+
+        Args:
+            seconds (float): Sleep duration.
+
+        Returns:
+            bool: True.
+        """
+        if self.scheduler and self.scheduler.current_process:
+            self.scheduler.sleep(self.scheduler.current_process, seconds)
+        else:
+            time.sleep(seconds)
+        return True
+
+    def _notify(self, event):
+        """
+        Fire a wait-queue event on the scheduler, if one is attached.
+        """
+        if self.scheduler:
+            self.scheduler.notify(event)
 
     def sys_proc_list(self):
         """
@@ -361,7 +710,7 @@ class SyscallHandler:
         if not self.scheduler:
             return []
         out = []
-        for p in self.scheduler.processes:
+        for p in self.scheduler.processes.snapshot():
             out.append(
                 {
                     "pid": p.pid,
@@ -373,6 +722,57 @@ class SyscallHandler:
             )
         return out
 
+    def sys_sched_stats(self, top=None, sort="cpu"):
+        """
+        Report scheduler and per-process execution statistics.
+
+        Args:
+            top (int, optional): Only include the `top` hottest processes.
+            sort (str, optional): Sort key for processes: "cpu", "max" (slowest
+                single step), "p99" or "steps". Defaults to "cpu".
+
+        Returns:
+            dict: Scheduler counters, the tick latency summary and a list of
+            per-process entries (CPU/wall time, step count and latency summary).
+        """
+        if not self.scheduler:
+            return {}
+        keys = {
+            "cpu": lambda p: p.cpu_time_ns,
+            "max": lambda p: p.step_latency.max_ns,
+            "p99": lambda p: p.step_latency.percentile_ns(99),
+            "steps": lambda p: p.step_latency.count,
+        }
+        if sort not in keys:
+            raise ValueError(f"unknown sort key: {sort}")
+
+        snapshot = self.scheduler.processes.snapshot()
+        procs = sorted(snapshot, key=keys[sort], reverse=True)
+        if top is not None:
+            procs = procs[:top]
+        total_cpu_ns = sum(p.cpu_time_ns for p in snapshot) or 1
+        return {
+            "ticks": self.scheduler.ticks,
+            "processes": len(self.scheduler.processes),
+            "runnable": self.scheduler.runnable_count(),
+            "waiting": len(self.scheduler.waiting),
+            "tick_latency": self.scheduler.tick_latency.to_dict(),
+            "procs": [
+                {
+                    "pid": p.pid,
+                    "name": p.name,
+                    "state": p.state.name,
+                    "nice": p.nice,
+                    "cpu_ms": p.cpu_time_ns / 1e6,
+                    "cpu_pct": 100.0 * p.cpu_time_ns / total_cpu_ns,
+                    "wall_ms": p.run_time_ns / 1e6,
+                    "steps": p.steps,
+                    "latency": p.step_latency.to_dict(),
+                }
+                for p in procs
+            ],
+        }
+
     def sys_host_proc_list(self):
         """
         List processes running on the Host OS.
@@ -431,9 +831,7 @@ class SyscallHandler:
             bool: True if successful, False if denied.
         """
         user = self._get_current_uid()
-        if user != "root" and not self.user_manager.has_permission(
-            user, "manage_network"
-        ):
+        if not self._has_permission(user, "manage_network"):
             return False
 
         enable = str(status).lower() in ("true", "1", "on", "yes", "enable")
@@ -441,15 +839,133 @@ class SyscallHandler:
         self.sys_log(f"Network set to {enable} by {user}")
         return True
 
-    def sys_net_check_access(self):
+    def sys_net_check_access(self, host=None, port=None):
         """
         Check if current user can access network.
 
+        Args:
+            host (str, optional): Destination host name or address to check against the policy.
+            port (int, optional): Destination port.
+
         Returns:
             bool: True if allowed.
         """
         user = self._get_current_uid()
-        return self.network_manager.check_access(user)
+        return self.network_manager.check_access(user, host=host, port=port)
+
+    def sys_net_policy_add(self, action, hosts=None, cidrs=None, ports=None, users=None,
+                           rate=None, burst=None, unmetered=False):
+        """
+        Append a network policy rule.
+        Requires root or 'manage_network' permission.
+
+        Args:
+            action (str): "allow" or "deny".
+            hosts (list[str], optional): Host names (subdomains included).
+            cidrs (list[str], optional): Destination networks.
+            ports (list[int], optional): Destination ports.
+            users (list[str], optional): Users the rule applies to.
+            rate (float, optional): Per-user bandwidth limit in bytes/sec.
+            burst (float, optional): Burst size in bytes.
+            unmetered (bool, optional): Exempt from user/process limits.
+
+        Returns:
+            dict: The rule, or an error.
+        """
+        user = self._get_current_uid()
+        if not self._has_permission(user, "manage_network"):
+            return {"error": "Permission Denied"}
+        try:
+            rule = self.network_manager.policy.add_rule(
+                action, hosts=hosts, cidrs=cidrs, ports=ports, users=users,
+                rate=rate, burst=burst, unmetered=unmetered,
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+        self.sys_log(f"Network policy rule added by {user}: {rule.to_dict()}")
+        return rule.to_dict()
+
+    def sys_net_policy_list(self):
+        """
+        Describe the network policy.
+
+        Returns:
+            dict: Default action, rules and bandwidth limits.
+        """
+        return self.network_manager.policy.to_dict()
+
+    def sys_net_policy_clear(self):
+        """
+        Remove every network policy rule and limit.
+        Requires root or 'manage_network' permission.
+
+        Returns:
+            bool: True if successful, False if denied.
+        """
+        user = self._get_current_uid()
+        if not self._has_permission(user, "manage_network"):
+            return False
+        self.network_manager.policy.clear()
+        self.sys_log(f"Network policy cleared by {user}")
+        return True
+
+    def sys_net_limit(self, rate, burst=None, user=None, pid=None):
+        """
+        Set (or with rate=None remove) a bandwidth limit for a user or process.
+        Requires root or 'manage_network' permission.
+
+        Args:
+            rate (float): Bytes per second, or None to remove the limit.
+            burst (float, optional): Burst size in bytes.
+            user (str, optional): User to limit.
+            pid (int, optional): Process to limit.
+
+        Returns:
+            bool: True if successful, False if denied or no target given.
+        """
+        caller = self._get_current_uid()
+        if not self._has_permission(caller, "manage_network"):
+            return False
+        if (user is None) == (pid is None):
+            return False
+        policy = self.network_manager.policy
+        try:
+            if user is not None:
+                policy.limit_user(user, rate, burst)
+            else:
+                policy.limit_process(pid, rate, burst)
+        except ValueError:
+            return False
+        return True
+
+    def sys_http_request(self, method, url, headers=None, params=None, json=None, data=None, timeout=None):
+        """
+        Perform an HTTP request over the kernel's pooled client.
+        Requires 'use_network' permission.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Absolute URL.
+            headers (dict, optional): Request headers.
+            params (dict, optional): Query parameters.
+            json (any, optional): JSON body.
+            data (str | bytes, optional): Raw body.
+            timeout (float, optional): Timeout in seconds.
+
+        Returns:
+            dict: {"status", "headers", "text"} or {"error": ...}.
+        """
+        user = self._get_current_uid()
+        if not self._has_permission(user, "use_network"):
+            return {"error": "Permission Denied"}
+        kwargs = {"headers": headers, "params": params, "json": json, "data": data}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        try:
+            response = get_http_client().request(method, url, **kwargs)
+        except Exception as e:
+            return {"error": str(e)}
+        return {"status": response.status_code, "headers": dict(response.headers), "text": response.text}
 
     # Execution
     def sys_exec_nasm(self, source_code):
@@ -464,9 +980,7 @@ class SyscallHandler:
             dict: The execution result or error.
         """
         user = self._get_current_uid()
-        if user != "root" and not self.user_manager.has_permission(
-            user, "execute_code"
-        ):
+        if not self._has_permission(user, "execute_code"):
             return {"error": "Permission Denied"}
 
         if not self.sandbox:
@@ -480,10 +994,7 @@ class SyscallHandler:
     # Docker Integration
     def _check_docker_permission(self):
         """Helper to check docker permissions."""
-        user = self._get_current_uid()
-        if user == "root":
-            return True
-        return self.user_manager.has_permission(user, "manage_docker")
+        return self._has_permission(self._get_current_uid(), "manage_docker")
 
     def sys_docker_login(
         self, username, password, registry="https://index.docker.io/v1/"
@@ -651,10 +1162,7 @@ class SyscallHandler:
     # Kubernetes Integration
     def _check_k8s_permission(self):
         """Helper to check k8s permissions."""
-        user = self._get_current_uid()
-        if user == "root":
-            return True
-        return self.user_manager.has_permission(user, "manage_k8s")
+        return self._has_permission(self._get_current_uid(), "manage_k8s")
 
     def sys_k8s_deploy(self, name, image, replicas=1, namespace="default"):
         """
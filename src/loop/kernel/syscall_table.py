@@ -0,0 +1,122 @@
+# kernel/syscall_table.py
+"""
+System Call Table.
+
+This module assigns every public syscall of `SyscallHandler` a stable number
+and the permission it requires, in the spirit of a kernel syscall table.
+`SyscallHandler.syscall()` and `SyscallHandler.sys_batch()` dispatch through
+it: the requirement is checked once from the table instead of each caller
+probing the handler with `hasattr()`.
+
+Permission column:
+    None      any user
+    ROOT      uid "root" only
+    "<perm>"  root, or a user whose roles grant the RBAC permission
+
+The filesystem calls in HOST_PATH_SYSCALLS take `resolve=False` to skip the
+rootfs jail (used by the sandbox after its own checks); through the table
+only root may pass it.
+"""
+
+from collections import namedtuple
+
+ROOT = "root"
+
+SyscallEntry = namedtuple("SyscallEntry", ["nr", "name", "permission"])
+
+SYSCALL_TABLE = (
+    # Users & authentication
+    SyscallEntry(0, "sys_login", None),
+    SyscallEntry(1, "sys_user_list", None),
+    SyscallEntry(2, "sys_user_add", ROOT),
+    SyscallEntry(3, "sys_user_delete", ROOT),
+    # Filesystem
+    SyscallEntry(10, "sys_ls", None),
+    SyscallEntry(11, "sys_read", None),
+    SyscallEntry(12, "sys_write", None),
+    SyscallEntry(13, "sys_append", None),
+    SyscallEntry(14, "sys_delete", None),
+    SyscallEntry(15, "sys_wait_file", None),
+    # Processes & IPC
+    SyscallEntry(20, "sys_kill", None),
+    SyscallEntry(21, "sys_send", None),
+    SyscallEntry(22, "sys_recv", None),
+    SyscallEntry(23, "sys_recv_many", None),
+    SyscallEntry(24, "sys_waitpid", None),
+    SyscallEntry(25, "sys_sleep", None),
+    SyscallEntry(26, "sys_proc_list", None),
+    SyscallEntry(27, "sys_sched_stats", None),
+    # Host shell
+    SyscallEntry(30, "sys_host_proc_list", None),
+    SyscallEntry(31, "sys_host_proc_kill", ROOT),
+    SyscallEntry(32, "sys_host_app_launch", ROOT),
+    SyscallEntry(33, "sys_app_launch", ROOT),
+    SyscallEntry(34, "sys_host_win_focus", None),
+    # Network
+    SyscallEntry(40, "sys_net_status", None),
+    SyscallEntry(41, "sys_net_set_status", "manage_network"),
+    SyscallEntry(42, "sys_net_check_access", None),
+    SyscallEntry(43, "sys_net_policy_add", "manage_network"),
+    SyscallEntry(44, "sys_net_policy_list", None),
+    SyscallEntry(46, "sys_net_policy_clear", "manage_network"),
+    SyscallEntry(47, "sys_net_limit", "manage_network"),
+    SyscallEntry(48, "sys_http_request", "use_network"),
+    # Execution
+    SyscallEntry(45, "sys_exec_nasm", "execute_code"),
+    # Docker
+    SyscallEntry(50, "sys_docker_login", "manage_docker"),
+    SyscallEntry(51, "sys_docker_logout", "manage_docker"),
+    SyscallEntry(52, "sys_docker_build", "manage_docker"),
+    SyscallEntry(53, "sys_docker_run", "manage_docker"),
+    SyscallEntry(54, "sys_docker_ps", "manage_docker"),
+    SyscallEntry(55, "sys_docker_stop", "manage_docker"),
+    SyscallEntry(56, "sys_docker_logs", "manage_docker"),
+    # Kubernetes
+    SyscallEntry(60, "sys_k8s_deploy", "manage_k8s"),
+    SyscallEntry(61, "sys_k8s_scale", "manage_k8s"),
+    SyscallEntry(62, "sys_k8s_delete", "manage_k8s"),
+    SyscallEntry(63, "sys_k8s_get_pods", "manage_k8s"),
+    SyscallEntry(64, "sys_k8s_logs", "manage_k8s"),
+    # Plugins
+    SyscallEntry(70, "sys_plugin_list", None),
+    SyscallEntry(71, "sys_plugin_install", ROOT),
+    SyscallEntry(72, "sys_plugin_uninstall", ROOT),
+    # System control
+    SyscallEntry(80, "sys_shutdown", ROOT),
+    SyscallEntry(81, "sys_reboot", ROOT),
+    SyscallEntry(82, "sys_get_state", None),
+    SyscallEntry(83, "sys_log", None),
+    # Memory
+    SyscallEntry(90, "sys_memory_store", None),
+    SyscallEntry(91, "sys_memory_search", None),
+    SyscallEntry(92, "sys_memory_recall", None),
+    SyscallEntry(93, "sys_memory_delete", None),
+    # UI
+    SyscallEntry(100, "sys_ui_scan", None),
+    SyscallEntry(101, "sys_ui_act", None),
+)
+
+HOST_PATH_SYSCALLS = frozenset({"sys_ls", "sys_read", "sys_write", "sys_append", "sys_delete"})
+
+SYSCALLS_BY_NAME = {entry.name: entry for entry in SYSCALL_TABLE}
+SYSCALLS_BY_NR = {entry.nr: entry for entry in SYSCALL_TABLE}
+
+
+def lookup(call):
+    """
+    Resolve a syscall by number or name.
+
+    Args:
+        call (int | str): Syscall number, full name ("sys_ls") or short name ("ls").
+
+    Returns:
+        SyscallEntry: The table entry, or None if unknown.
+    """
+    if isinstance(call, int):
+        return SYSCALLS_BY_NR.get(call)
+    if isinstance(call, str):
+        entry = SYSCALLS_BY_NAME.get(call)
+        if entry is None and not call.startswith("sys_"):
+            entry = SYSCALLS_BY_NAME.get("sys_" + call)
+        return entry
+    return None
@@ -29,3 +29,15 @@ def test_api_adapter_input():
 
     # Prompt should be in output
     assert adapter.get_output() == "> "
+
+def test_api_adapter_stream_tokens():
+    adapter = APIAdapter()
+    assert adapter.get_tokens() == ""
+
+    adapter.stream('{"thought": ')
+    adapter.stream('"hi"}')
+
+    assert adapter.get_tokens() == '{"thought": "hi"}'
+    assert adapter.get_tokens() == ""
+    # Tokens never mix with regular output
+    assert adapter.get_output() is None
@@ -0,0 +1,194 @@
+# kernel/timerwheel.py
+"""
+Hierarchical Timer Wheel.
+
+This module implements the timer store used by the `Scheduler` for sleeping
+processes. It follows the classic cascading design: the first wheel has one
+slot per tick, and every outer wheel has slots covering a whole revolution of
+the wheel below it. Scheduling and cancelling are O(1); expired timers are
+collected by advancing the wheel to the current time, cascading outer slots
+inward as the inner wheel wraps.
+"""
+
+import itertools
+import math
+import time
+
+
+class TimerWheel:
+    """
+    Cascading timer wheel with a fixed tick resolution.
+
+    Attributes:
+        resolution (float): Seconds per tick.
+        clock (callable): Monotonic time source.
+        current_tick (int): The next tick to be processed.
+    """
+    # Bits per wheel: 256 ticks in the inner wheel, 64 slots in each outer wheel.
+    ROOT_BITS = 8
+    LEVEL_BITS = 6
+    LEVELS = 4
+
+    def __init__(self, resolution=0.01, clock=time.monotonic):
+        """
+        Initialize the TimerWheel.
+
+        Args:
+            resolution (float, optional): Seconds per tick. Defaults to 10ms.
+            clock (callable, optional): Time source. Defaults to `time.monotonic`.
+        """
+        self.resolution = resolution
+        self.clock = clock
+        self._origin = clock()
+        self.current_tick = 0
+
+        sizes = [1 << self.ROOT_BITS] + [1 << self.LEVEL_BITS] * (self.LEVELS - 1)
+        self._wheels = [[[] for _ in range(size)] for size in sizes]
+        self._timers = {}  # timer_id -> expiry tick
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._timers)
+
+    def _now_tick(self):
+        return int((self.clock() - self._origin) / self.resolution)
+
+    def _place(self, timer_id, expires):
+        """Put a timer into the slot matching its distance from `current_tick`."""
+        delta = expires - self.current_tick
+        if delta < 0:
+            self._wheels[0][self.current_tick & ((1 << self.ROOT_BITS) - 1)].append(timer_id)
+            return
+
+        for level in range(self.LEVELS):
+            span = self.ROOT_BITS + level * self.LEVEL_BITS
+            if delta < (1 << span) or level == self.LEVELS - 1:
+                shift = 0 if level == 0 else self.ROOT_BITS + (level - 1) * self.LEVEL_BITS
+                mask = len(self._wheels[level]) - 1
+                if level == self.LEVELS - 1:
+                    # Clamp far-future timers to the outermost revolution;
+                    # they are re-placed when their slot cascades.
+                    max_delta = (1 << (self.ROOT_BITS + level * self.LEVEL_BITS)) - 1
+                    expires = self.current_tick + min(delta, max_delta)
+                self._wheels[level][(expires >> shift) & mask].append(timer_id)
+                return
+
+    def schedule(self, delay):
+        """
+        Register a timer expiring `delay` seconds from now. O(1).
+
+        Args:
+            delay (float): Seconds until expiry (negative values expire on the next advance).
+
+        Returns:
+            int: Timer identifier.
+        """
+        # Bring the wheel up to date so the delta is measured from "now".
+        if not self._timers:
+            self.current_tick = max(self.current_tick, self._now_tick())
+        timer_id = next(self._ids)
+        # One extra tick so a timer never fires before its full delay elapsed.
+        expires = self._now_tick() + 1 + max(0, math.ceil(round(delay / self.resolution, 6)))
+        self._timers[timer_id] = expires
+        self._place(timer_id, expires)
+        return timer_id
+
+    def cancel(self, timer_id):
+        """
+        Cancel a pending timer. O(1); its slot entry is discarded lazily.
+
+        Args:
+            timer_id (int): Timer identifier.
+
+        Returns:
+            bool: True if the timer was pending.
+        """
+        if self._timers.pop(timer_id, None) is None:
+            return False
+        if not self._timers:
+            self._clear_slots()
+        return True
+
+    def _clear_slots(self):
+        """Drop lazily-cancelled entries once no timer is pending."""
+        for wheel in self._wheels:
+            for index, slot in enumerate(wheel):
+                if slot:
+                    wheel[index] = []
+
+    def _cascade(self, level):
+        """Re-place the timers of the current slot of `level`; return the slot index."""
+        shift = self.ROOT_BITS + (level - 1) * self.LEVEL_BITS
+        index = (self.current_tick >> shift) & (len(self._wheels[level]) - 1)
+        slot = self._wheels[level][index]
+        self._wheels[level][index] = []
+        for timer_id in slot:
+            expires = self._timers.get(timer_id)
+            if expires is not None:
+                self._place(timer_id, expires)
+        return index
+
+    def advance(self):
+        """
+        Process every tick up to the current time.
+
+        Returns:
+            list[int]: Identifiers of the timers that expired, in expiry order.
+        """
+        target = self._now_tick()
+        if not self._timers:
+            self.current_tick = max(self.current_tick, target + 1)
+            return []
+
+        expired = []
+        root_mask = (1 << self.ROOT_BITS) - 1
+        while self.current_tick <= target and self._timers:
+            index = self.current_tick & root_mask
+            if index == 0:
+                level = 1
+                while level < self.LEVELS and self._cascade(level) == 0:
+                    level += 1
+            slot = self._wheels[0][index]
+            if slot:
+                self._wheels[0][index] = []
+                for timer_id in slot:
+                    expires = self._timers.get(timer_id)
+                    if expires is None:
+                        continue
+                    if expires <= self.current_tick:
+                        del self._timers[timer_id]
+                        expired.append(timer_id)
+                    else:
+                        # Clamped far-future timer: not due yet
+                        self._place(timer_id, expires)
+            self.current_tick += 1
+
+        if not self._timers:
+            self._clear_slots()
+            self.current_tick = max(self.current_tick, target + 1)
+        return expired
+
+    def next_delay(self):
+        """
+        Upper bound on the seconds until the next timer may expire.
+
+        Scans at most one revolution of the inner wheel; if nothing is due
+        there, returns the time until the next cascade.
+
+        Returns:
+            float: Seconds to wait (0 if a timer is already due), or None if no timers are pending.
+        """
+        if not self._timers:
+            return None
+        root_size = 1 << self.ROOT_BITS
+        start = self.current_tick
+        for offset in range(root_size):
+            tick = start + offset
+            if (tick & (root_size - 1)) == 0:
+                break
+            for timer_id in self._wheels[0][tick & (root_size - 1)]:
+                if timer_id in self._timers:
+                    return max(0.0, tick * self.resolution - (self.clock() - self._origin))
+        else:
+            tick = start + root_size
+        return max(0.0, tick * self.resolution - (self.clock() - self._origin))
@@ -0,0 +1,179 @@
+# kernel/tools.py
+"""
+Agent Tool Definitions.
+
+Structured descriptions of the actions the agent can take, used for the
+providers' native function calling instead of listing the actions in the
+prompt text. A `Tool` carries a JSON schema of its parameters, renders it in
+each provider's format, and converts the named arguments of a tool call
+back into the positional argument list `AgentSandbox.execute()` and the
+registered tools take.
+
+Gemini rejects object parameters without declared properties, so free-form
+maps (e.g. environment variables) are declared to it as JSON strings and
+decoded again in `positional()`.
+"""
+
+import inspect
+import json
+
+REQUIRED = object()  # Marks a parameter without a default
+
+_ANNOTATION_TYPES = {int: "integer", float: "number", bool: "boolean", list: "array", dict: "object", str: "string"}
+
+
+class Tool:
+    """
+    A callable action described for function calling.
+
+    Attributes:
+        name (str): Action name.
+        description (str): What the action does.
+        params (list[tuple[str, str, object]]): (name, JSON type, default or REQUIRED).
+        variadic (str): Name of an array parameter whose items are passed as
+            separate trailing arguments, or None.
+    """
+    __slots__ = ("name", "description", "params", "variadic")
+
+    def __init__(self, name, description, params=(), variadic=None):
+        """
+        Initialize the Tool.
+
+        Args:
+            name (str): Action name.
+            description (str): What the action does.
+            params (iterable[tuple], optional): (name, JSON type, default or REQUIRED).
+            variadic (str, optional): Array parameter expanded into trailing arguments.
+        """
+        self.name = name
+        self.description = description
+        self.params = list(params)
+        self.variadic = variadic
+
+    @classmethod
+    def from_callable(cls, func, description=None, name=None):
+        """
+        Describe a Python function, typing parameters from their annotations.
+
+        Args:
+            func (callable): The function.
+            description (str, optional): Defaults to the docstring.
+            name (str, optional): Defaults to the function name.
+
+        Returns:
+            Tool: The description.
+        """
+        params = []
+        variadic = None
+        for p in inspect.signature(func).parameters.values():
+            if p.kind in (p.VAR_KEYWORD, p.KEYWORD_ONLY):
+                continue
+            if p.kind == p.VAR_POSITIONAL:
+                params.append((p.name, "array", ()))
+                variadic = p.name
+                continue
+            json_type = _ANNOTATION_TYPES.get(p.annotation, "string")
+            params.append((p.name, json_type, REQUIRED if p.default is p.empty else p.default))
+        desc = (description or func.__doc__ or "No description provided.").strip().replace("\n", " ")
+        return cls(name or func.__name__, desc, params, variadic)
+
+    def schema(self):
+        """
+        JSON schema of the parameters.
+
+        Returns:
+            dict: An object schema.
+        """
+        properties = {}
+        for name, json_type, _ in self.params:
+            prop = {"type": json_type}
+            if json_type == "array":
+                prop["items"] = {"type": "string"}
+            properties[name] = prop
+        return {
+            "type": "object",
+            "properties": properties,
+            "required": [name for name, _, default in self.params if default is REQUIRED],
+        }
+
+    def to_openai(self):
+        return {"type": "function", "function": {"name": self.name, "description": self.description, "parameters": self.schema()}}
+
+    def to_anthropic(self):
+        return {"name": self.name, "description": self.description, "input_schema": self.schema()}
+
+    def to_gemini(self):
+        declaration = {"name": self.name, "description": self.description}
+        if self.params:
+            schema = self.schema()
+            for prop in schema["properties"].values():
+                if prop["type"] == "object":
+                    prop.update(type="string", description="A JSON object.")
+            declaration["parameters"] = schema
+        return declaration
+
+    def positional(self, arguments):
+        """
+        Convert the named arguments of a tool call to a positional list.
+        Object arguments given as JSON strings are decoded.
+
+        Args:
+            arguments (dict): Arguments as sent by the model.
+
+        Returns:
+            list: Arguments in parameter order, defaults filled in.
+        """
+        arguments = arguments or {}
+        args = []
+        for name, json_type, default in self.params:
+            if name == self.variadic:
+                value = arguments.get(name) or []
+                args.extend(value if isinstance(value, list) else [value])
+            elif name in arguments:
+                value = arguments[name]
+                if json_type == "object" and isinstance(value, str):
+                    try:
+                        value = json.loads(value)  # Sent as a JSON string to Gemini
+                    except ValueError:
+                        pass  # Let the action report the malformed argument
+                args.append(value)
+            elif default is REQUIRED:
+                break  # Let the action report the missing argument
+            else:
+                args.append(default)
+        return args
+
+
+SANDBOX_TOOLS = [
+    Tool("list_dir", "List a directory.", [("path", "string", REQUIRED)]),
+    Tool("read_file", "Read a file.", [("path", "string", REQUIRED)]),
+    Tool("write_file", "Write content to a file, replacing it.", [("path", "string", REQUIRED), ("content", "string", REQUIRED)]),
+    Tool("append_file", "Append content to a file.", [("path", "string", REQUIRED), ("content", "string", REQUIRED)]),
+    Tool("run_process", "Run an app: 'browser', 'calc', 'explorer', 'system', 'user'.",
+         [("app_name", "string", REQUIRED), ("args", "array", ())], variadic="args"),
+    Tool("read_screen", "Scan the active window for UI elements. Returns a JSON DOM. Use this BEFORE interacting."),
+    Tool("interact", "Interact with a UI element using its UID.",
+         [("uid", "string", REQUIRED), ("action", "string", REQUIRED), ("payload", "string", None)]),
+    Tool("sys_memory_store", "Store useful facts for later.", [("content", "string", REQUIRED), ("metadata", "object", None)]),
+    Tool("sys_memory_search", "Search for past information.", [("query", "string", REQUIRED)]),
+    Tool("sys_memory_recall", "Same as sys_memory_search.", [("query", "string", REQUIRED)]),
+    Tool("sys_memory_delete", "Delete memory.", [("key_id_or_query", "string", REQUIRED)]),
+    Tool("sys_docker_build", "Build a Docker image.",
+         [("path", "string", REQUIRED), ("tag", "string", REQUIRED), ("dockerfile", "string", "Dockerfile")]),
+    Tool("sys_docker_run", "Run a Docker container.",
+         [("image", "string", REQUIRED), ("name", "string", None), ("ports", "object", None), ("env", "object", None)]),
+    Tool("sys_docker_stop", "Stop a Docker container.", [("container_id", "string", REQUIRED)]),
+    Tool("sys_docker_logs", "Get the logs of a Docker container.", [("container_id", "string", REQUIRED)]),
+    Tool("sys_k8s_deploy", "Create a Kubernetes deployment.",
+         [("name", "string", REQUIRED), ("image", "string", REQUIRED), ("replicas", "integer", 1), ("namespace", "string", "default")]),
+    Tool("sys_k8s_scale", "Scale a Kubernetes deployment.",
+         [("name", "string", REQUIRED), ("replicas", "integer", REQUIRED), ("namespace", "string", "default")]),
+    Tool("sys_k8s_delete", "Delete a Kubernetes deployment.", [("name", "string", REQUIRED), ("namespace", "string", "default")]),
+    Tool("sys_k8s_logs", "Get the logs of a Kubernetes pod.", [("pod_name", "string", REQUIRED), ("namespace", "string", "default")]),
+    Tool("launch_app", "Launch a host application by name (e.g., 'Launch Chrome').", [("app_name", "string", REQUIRED)]),
+]
+
+AGENT_TOOLS = [
+    Tool("update_todo", "Replace your ToDo list.", [("items", "array", REQUIRED)]),
+    Tool("done", "Call this when the task is complete."),
+]
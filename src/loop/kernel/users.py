@@ -4,14 +4,51 @@ User Management System.
 
 This module handles user accounts, password hashing (via Argon2), and
 Role-Based Access Control (RBAC). It persists user data to a JSON file.
+
+Changes are not written by rewriting that file. Each save appends the
+changed user records to a journal next to it (`users.json.journal`) with a
+single write and fsync per batch; once the journal outgrows the user table it
+is compacted into a new snapshot, written to a temporary file, fsynced and
+swapped in with `os.replace`. Every journal starts with the SHA-256 of the
+snapshot it extends, so a journal left over from a crash or a snapshot
+replaced by hand is ignored rather than replayed on top of the wrong base,
+while copying or restoring the directory (new inode and mtime) keeps it.
+
+The files are not re-read on every check. Users and roles are kept in memory
+and reloaded only when the file changes: its (mtime, size, inode) stamp is
+re-checked at most every `STAT_INTERVAL` seconds, and immediately after any
+`UserManager` in this process saves or `UserManager.notify_changed()` is
+called (e.g. by a CLI tool that edited the file). Permission decisions are
+memoized in a user x action matrix that is dropped on every reload, so a
+repeated `has_permission` is a dict lookup.
+
+Logins are throttled per user and source, per user and per source,
+`authenticate_async()` runs Argon2 on the shared authentication pool, and
+`login()` issues session tokens so API clients authenticate once (see
+`loop.kernel.auth`).
 """
 
+import asyncio
 import hashlib
 from argon2 import PasswordHasher
 import json
 import os
+import threading
+import time
 from pathlib import Path
 from loop.kernel import rootfs
+from loop.kernel.auth import (
+    MAX_ACCOUNT_FAILURES,
+    MAX_SOURCE_FAILURES,
+    MAX_USER_FAILURES,
+    FailureLimiter,
+    SessionCache,
+    get_auth_pool,
+)
+
+_monotonic = time.monotonic
+
+COMPACT_MIN_ENTRIES = 256  # Journal records always tolerated before compaction
 
 
 class UserManager:
@@ -21,20 +58,35 @@ class UserManager:
     Attributes:
         DB_FILE (Path): The path to the JSON database file (~/.loop/etc/users.json).
         _ph (PasswordHasher): Argon2 password hasher instance.
-        users (dict): In-memory cache of user data.
+        sessions (SessionCache): Session tokens issued by `login()`.
+        users (dict): In-memory cache of user data. Assigning it drops the
+            permission matrix; after mutating it in place call `invalidate()`.
     """
     # Use absolute path resolved via rootfs logic (though manually constructed here for class attr)
     # Ideally, we should not define this at class level if it depends on runtime env,
     # but rootfs.LOOP_ROOT is constant per run.
     DB_FILE = rootfs.LOOP_ROOT / "etc" / "users.json"
     _ph = PasswordHasher()
+    STAT_INTERVAL = 0.5  # Seconds between checks of the database file stamp
+    _generation = 0      # Bumped whenever any instance saves or is notified of a change
 
     def __init__(self):
         """
         Initialize the UserManager.
         Loads users from the database or creates default users (root, guest).
         """
+        self._lock = threading.RLock()
+        self._stamp = (None, None)
+        self._base = None  # SHA-256 of the snapshot the journal extends
+        self._journal_entries = 0
+        self._journal_valid = True
+        self._seen_generation = UserManager._generation
+        self._next_stat = 0.0
         self.users = {}
+        self.sessions = SessionCache()
+        self._user_failures = FailureLimiter(MAX_USER_FAILURES)
+        self._account_failures = FailureLimiter(MAX_ACCOUNT_FAILURES)
+        self._source_failures = FailureLimiter(MAX_SOURCE_FAILURES)
         # Pre-calculate a dummy hash for constant-time authentication failures
         self._dummy_hash = self._hash("dummy_password_for_timing_mitigation")
 
@@ -57,6 +109,65 @@ class UserManager:
         if changed:
             self._save()
 
+    @property
+    def users(self):
+        return self._users
+
+    @users.setter
+    def users(self, value):
+        self._users = value
+        self._matrix = {}
+
+    @classmethod
+    def notify_changed(cls):
+        """
+        Signal that the user database was modified outside this instance.
+
+        Every UserManager in the process reloads the file on its next access.
+        """
+        UserManager._generation += 1
+
+    def invalidate(self):
+        """
+        Drop the cached permission matrix and re-check the database file on next access.
+        """
+        self._matrix = {}
+        self._next_stat = 0.0
+
+    @property
+    def journal_file(self):
+        """Path of the change journal that extends `DB_FILE`."""
+        return self.DB_FILE.with_name(self.DB_FILE.name + ".journal")
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+    def _file_stamp(self):
+        return (self._stat(self.DB_FILE), self._stat(self.journal_file))
+
+    def _refresh(self, force=False):
+        """
+        Reload the database if it changed since it was last loaded.
+
+        Args:
+            force (bool, optional): Check the file stamp even if the last
+                check was less than `STAT_INTERVAL` ago. Used before writes.
+        """
+        if self._seen_generation != UserManager._generation:
+            self._load()
+            return
+        now = _monotonic()
+        if not force and now < self._next_stat:
+            return
+        self._next_stat = now + self.STAT_INTERVAL
+        if self._file_stamp() != self._stamp:
+            self._load()
+
     def _hash(self, pw):
         """
         Hash a password using Argon2.
@@ -88,54 +199,202 @@ class UserManager:
 
     def _load(self):
         """
-        Load users from the JSON database file.
+        Load users from the JSON database file and replay its journal.
         Handles migration from older formats if necessary.
         """
-        if self.DB_FILE.exists():
+        with self._lock:
+            self._seen_generation = UserManager._generation
+            self._next_stat = _monotonic() + self.STAT_INTERVAL
+            # Stamp before reading so a write racing with the read triggers another reload
+            self._stamp = self._file_stamp()
+            self._base = None
+            if self._stamp[0] is None:
+                return
             try:
-                with open(self.DB_FILE, "r") as f:
-                    data = json.load(f)
-                    # Migration for old format (user: hash) to new format (user: {password: hash, roles: []})
-                    self.users = {}
-                    for u, v in data.items():
-                        if isinstance(v, str):
-                            self.users[u] = {"password": v, "roles": ["admin"] if u == "root" else ["user"]}
-                        else:
-                            self.users[u] = v
+                with open(self.DB_FILE, "rb") as f:
+                    raw = f.read()
+                data = json.loads(raw)
+                # Migration for old format (user: hash) to new format (user: {password: hash, roles: []})
+                users = {}
+                for u, v in data.items():
+                    if isinstance(v, str):
+                        users[u] = {"password": v, "roles": ["admin"] if u == "root" else ["user"]}
+                    else:
+                        users[u] = v
+                self._base = hashlib.sha256(raw).hexdigest()
+                self._journal_entries = self._replay_journal(users, self._base, self._stamp[0])
+                self.users = users
             except Exception as e:
                 print(f"[UserManager] Error loading users: {e}")
                 self.users = {}
 
-    def _save(self):
+    def _replay_journal(self, users, base, stamp=None):
         """
-        Save the current user data to the JSON database file.
-        Restricts file permissions to 600 (read/write by owner only).
+        Apply the journal records on top of a freshly loaded snapshot.
+
+        Args:
+            users (dict): The snapshot, updated in place.
+            base (str): SHA-256 of the snapshot file.
+            stamp (list, optional): Stat stamp of the snapshot file, matched by
+                journals written before snapshots were identified by content.
+
+        Returns:
+            int: Number of records applied.
         """
+        self._journal_valid = True
         try:
-            # Ensure directory exists before saving (redundant but safe)
-            self.DB_FILE.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(self.DB_FILE, "w") as f:
-                json.dump(self.users, f, indent=2)
+            f = open(self.journal_file, "r")
+        except FileNotFoundError:
+            return 0
+        count = 0
+        with f:
+            header = f.readline()
+            try:
+                written_on = json.loads(header).get("base")
+                valid = written_on == base or (stamp is not None and written_on == stamp)
+            except ValueError:
+                valid = False
+            if not valid:
+                # Written against another snapshot (crash during compaction or a
+                # hand-edited users.json): the snapshot wins, compact on next save
+                self._journal_valid = False
+                return 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn final write
+                if record.get("op") == "del":
+                    users.pop(record["user"], None)
+                else:
+                    users[record["user"]] = record["data"]
+                count += 1
+        return count
+
+    def _save(self, changed=None):
+        """
+        Persist user data. Restricts file permissions to 600 (read/write by owner only).
 
-            # Secure the file: Read/Write for owner only
-            os.chmod(self.DB_FILE, 0o600)
-        except Exception as e:
-            print(f"[UserManager] Error saving users: {e}")
+        Args:
+            changed (iterable[str], optional): Users whose records changed or were
+                deleted; they are appended to the journal. Without it, or when
+                the journal is due for compaction, a full snapshot is written.
+        """
+        with self._lock:
+            self._matrix = {}
+            try:
+                # Ensure directory exists before saving (redundant but safe)
+                self.DB_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+                if changed is not None:
+                    changed = list(changed)
+                if (changed is None or not self._journal_valid or self._base is None
+                        or self._journal_entries + len(changed) > max(COMPACT_MIN_ENTRIES, len(self.users))):
+                    self._compact()
+                elif changed:
+                    self._append_journal(changed)
+            except Exception as e:
+                print(f"[UserManager] Error saving users: {e}")
+            # Our copy is current; other instances reload on their next access
+            self._stamp = self._file_stamp()
+            UserManager.notify_changed()
+            self._seen_generation = UserManager._generation
+
+    def _append_journal(self, changed):
+        lines = []
+        for user in changed:
+            data = self.users.get(user)
+            record = {"op": "del", "user": user} if data is None else {"op": "set", "user": user, "data": data}
+            lines.append(json.dumps(record, separators=(",", ":")))
+        fd = os.open(self.journal_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        try:
+            if os.fstat(fd).st_size == 0:
+                lines.insert(0, json.dumps({"base": self._base}))
+            payload = ("\n".join(lines) + "\n").encode("utf-8")
+            while payload:
+                payload = payload[os.write(fd, payload):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._journal_entries += len(changed)
+
+    def _compact(self):
+        """
+        Write a full snapshot atomically and drop the journal it supersedes.
+        """
+        tmp = self.DB_FILE.with_name(self.DB_FILE.name + ".tmp")
+        payload = json.dumps(self.users, separators=(",", ":")).encode("utf-8")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.DB_FILE)
+        self._base = hashlib.sha256(payload).hexdigest()
+        # Secure the file: Read/Write for owner only
+        os.chmod(self.DB_FILE, 0o600)
+        # The snapshot holds every journaled change; a crash before the unlink
+        # leaves a journal whose base no longer matches, which is ignored
+        try:
+            os.unlink(self.journal_file)
+        except FileNotFoundError:
+            pass
+        self._fsync_dir()
+        self._journal_entries = 0
+        self._journal_valid = True
+
+    def _fsync_dir(self):
+        try:
+            fd = os.open(self.DB_FILE.parent, os.O_RDONLY)
+        except OSError:
+            return  # Not supported on this platform
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
-    def authenticate(self, user, pw):
+    def authenticate(self, user, pw, source=None):
         """
         Authenticate a user.
 
+        Failed attempts are counted per (user, source) pair, per user and per
+        source; while any has reached its limit the attempt is refused without
+        checking the password. The tight (user, source) limit means failures
+        from one client do not lock the user out everywhere, while the looser
+        per-user limit still caps guesses from rotating source addresses. The
+        attempt is reserved before the (slow) verification and withdrawn if it
+        succeeds, so concurrent guesses cannot overshoot the limits.
+
         Args:
             user (str): Username.
             pw (str): Password.
+            source (str, optional): Where the attempt comes from (e.g. client address).
 
         Returns:
             bool: True if valid credentials, False otherwise.
         """
-        # Reload to ensure we have latest updates from CLI tools
-        self._load()
+        user_key = (user, source)
+        if not self._user_failures.acquire(user_key):
+            return False
+        if not self._account_failures.acquire(user):
+            self._user_failures.release(user_key)
+            return False
+        if not self._source_failures.acquire(source):
+            self._account_failures.release(user)
+            self._user_failures.release(user_key)
+            return False
+        if self._verify_user(user, pw):
+            self._user_failures.reset(user_key)
+            self._account_failures.release(user)
+            self._source_failures.release(source)
+            return True
+        return False
+
+    def _verify_user(self, user, pw):
+        # Pick up updates from CLI tools
+        self._refresh()
         if user not in self.users:
             # Perform a dummy verification to mitigate timing attacks (user enumeration)
             self._verify(self._dummy_hash, pw)
@@ -148,6 +407,85 @@ class UserManager:
             return False
         return self._verify(hash_val, pw)
 
+    async def authenticate_async(self, user, pw, source=None):
+        """
+        Authenticate a user on the authentication pool without blocking the event loop.
+
+        Args:
+            user (str): Username.
+            pw (str): Password.
+            source (str, optional): Where the attempt comes from.
+
+        Returns:
+            bool: True if valid credentials, False otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_auth_pool(), self.authenticate, user, pw, source)
+
+    def login(self, user, pw, source=None):
+        """
+        Authenticate a user and open a session.
+
+        Args:
+            user (str): Username.
+            pw (str): Password.
+            source (str, optional): Where the attempt comes from.
+
+        Returns:
+            str: A session token, or None if authentication failed.
+        """
+        if self.authenticate(user, pw, source):
+            return self.sessions.issue(user)
+        return None
+
+    async def login_async(self, user, pw, source=None):
+        """
+        Like `login()`, verifying the password on the authentication pool.
+
+        Args:
+            user (str): Username.
+            pw (str): Password.
+            source (str, optional): Where the attempt comes from.
+
+        Returns:
+            str: A session token, or None if authentication failed.
+        """
+        if await self.authenticate_async(user, pw, source):
+            return self.sessions.issue(user)
+        return None
+
+    def check_session(self, token):
+        """
+        Resolve a session token without re-verifying the password.
+
+        Args:
+            token (str): Token returned by `login()`.
+
+        Returns:
+            str: The username, or None if the token is invalid, expired or the
+            user no longer exists.
+        """
+        user = self.sessions.validate(token)
+        if user is None:
+            return None
+        self._refresh()
+        if user not in self.users:
+            self.sessions.revoke_user(user)
+            return None
+        return user
+
+    def logout(self, token):
+        """
+        Close a session.
+
+        Args:
+            token (str): Token returned by `login()`.
+
+        Returns:
+            bool: True if the session existed.
+        """
+        return self.sessions.revoke(token)
+
     def get_roles(self, user):
         """
         Get the roles assigned to a user.
@@ -158,7 +496,7 @@ class UserManager:
         Returns:
             list[str]: List of role names.
         """
-        self._load()
+        self._refresh()
         if user in self.users:
             return self.users[user].get("roles", [])
         return []
@@ -174,11 +512,11 @@ class UserManager:
         Returns:
             bool: True if role added, False if user not found.
         """
-        self._load()
+        self._refresh(force=True)
         if user in self.users:
             if role not in self.users[user]["roles"]:
                 self.users[user]["roles"].append(role)
-                self._save()
+                self._save([user])
                 return True
         return False
 
@@ -193,11 +531,11 @@ class UserManager:
         Returns:
             bool: True if role removed, False if user not found.
         """
-        self._load()
+        self._refresh(force=True)
         if user in self.users:
             if role in self.users[user]["roles"]:
                 self.users[user]["roles"].remove(role)
-                self._save()
+                self._save([user])
                 return True
         return False
 
@@ -205,6 +543,29 @@ class UserManager:
         """
         Check if user has permission for action.
 
+        Decisions are memoized in the permission matrix until the user
+        database changes.
+
+        Args:
+            user (str): Username.
+            action (str): The action to perform.
+
+        Returns:
+            bool: True if permitted, False otherwise.
+        """
+        if self._seen_generation != UserManager._generation or _monotonic() >= self._next_stat:
+            self._refresh()
+        matrix = self._matrix
+        allowed = matrix.get((user, action))
+        if allowed is None:
+            # Stored in the matrix captured above: a concurrent reload swaps in a new one
+            allowed = matrix[(user, action)] = self._evaluate(user, action)
+        return allowed
+
+    def _evaluate(self, user, action):
+        """
+        Compute a permission decision from the user's roles (uncached).
+
         Args:
             user (str): Username.
             action (str): The action to perform.
@@ -216,7 +577,8 @@ class UserManager:
         if user == "root":
             return True
 
-        roles = self.get_roles(user)
+        user_data = self.users.get(user)
+        roles = user_data.get("roles", []) if user_data else []
         if "admin" in roles:
             return True
 
@@ -244,7 +606,7 @@ class UserManager:
         Returns:
             list[str]: A list of usernames.
         """
-        self._load()
+        self._refresh()
         return list(self.users.keys())
 
     def add_user(self, user, pw, requestor="root"):
@@ -262,13 +624,67 @@ class UserManager:
         if not self.has_permission(requestor, "create_user"):
             return False
 
-        self._load()
+        self._refresh(force=True)
         if user in self.users:
             return False
         self.users[user] = {"password": self._hash(pw), "roles": ["user"]}
-        self._save()
+        self._save([user])
         return True
 
+    def add_users(self, entries, requestor="root"):
+        """
+        Add several users, persisting once for the whole batch.
+
+        Passwords are hashed in parallel on the authentication pool.
+
+        Args:
+            entries (iterable[tuple[str, str]]): (username, password) pairs.
+            requestor (str, optional): User requesting the action. Defaults to "root".
+
+        Returns:
+            list[str]: The users added (existing and duplicate names are skipped).
+        """
+        if not self.has_permission(requestor, "create_user"):
+            return []
+
+        self._refresh(force=True)
+        pending = {}
+        for user, pw in entries:
+            if user not in self.users and user not in pending:
+                pending[user] = pw
+        if not pending:
+            return []
+        hashes = get_auth_pool().map(self._hash, pending.values())
+        for user, hash_val in zip(pending, hashes):
+            self.users[user] = {"password": hash_val, "roles": ["user"]}
+        self._save(pending)
+        return list(pending)
+
+    def add_roles(self, assignments):
+        """
+        Grant roles to several users, persisting once for the whole batch.
+
+        Args:
+            assignments (dict[str, iterable[str]]): Roles to add per username.
+
+        Returns:
+            list[str]: The users whose roles changed (unknown users are skipped).
+        """
+        self._refresh(force=True)
+        changed = []
+        for user, roles in assignments.items():
+            user_data = self.users.get(user)
+            if user_data is None:
+                continue
+            current = user_data.setdefault("roles", [])
+            added = [r for r in dict.fromkeys(roles) if r not in current]
+            if added:
+                current.extend(added)
+                changed.append(user)
+        if changed:
+            self._save(changed)
+        return changed
+
     def delete_user(self, user, requestor="root"):
         """
         Delete a user.
@@ -283,9 +699,10 @@ class UserManager:
         if not self.has_permission(requestor, "delete_user"):
             return False
 
-        self._load()
+        self._refresh(force=True)
         if user in self.users and user != "root": # Protect root
             del self.users[user]
-            self._save()
+            self._save([user])
+            self.sessions.revoke_user(user)
             return True
         return False
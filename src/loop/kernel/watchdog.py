@@ -0,0 +1,177 @@
+# kernel/watchdog.py
+"""
+Preemption Watchdog.
+
+Processes are generators and are only preempted when they yield, so a step
+that loops or blocks forever freezes the whole scheduler. The `Watchdog` is
+a background thread that samples the step currently running in the scheduler
+and reacts when one exceeds its time slice:
+
+    "log"        record the offending PID with a stack sample
+    "interrupt"  also raise `StepTimeout` inside the running generator
+    "isolate"    also move the process to a dedicated worker thread: the
+                 scheduler loop continues on a fresh thread while the stuck
+                 step finishes where it is, and later steps of that process
+                 run off the loop thread
+
+Interrupts are delivered as asynchronous exceptions, which Python only raises
+between bytecodes: a step blocked inside C code (e.g. a socket read) sees it
+once that call returns. Isolation works in both cases.
+"""
+
+import ctypes
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+ACTIONS = ("log", "interrupt", "isolate")
+
+
+class StepTimeout(Exception):
+    """Raised inside a process generator whose step exceeded the watchdog time slice."""
+
+
+def inject_exception(thread_id, exc_type):
+    """
+    Raise `exc_type` asynchronously in another thread (or clear a pending one).
+
+    Args:
+        thread_id (int): Target thread identifier.
+        exc_type (type): Exception class, or None to cancel a pending injection.
+
+    Returns:
+        bool: True if exactly one thread was affected.
+    """
+    exc = ctypes.py_object(exc_type) if exc_type is not None else None
+    affected = ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), exc)
+    if affected > 1:
+        # Should not happen; undo so no other thread is hit
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), None)
+        return False
+    return affected == 1
+
+
+class Watchdog:
+    """
+    Detects scheduler steps that exceed a time slice.
+
+    Attributes:
+        scheduler (Scheduler): The watched scheduler.
+        timeslice (float): Seconds a single step may run before it is flagged.
+        action (str): Default reaction ("log", "interrupt" or "isolate"); a
+            process may override it with its `watchdog_action` attribute.
+        overruns (deque): Most recent overrun records (dicts with pid, name,
+            elapsed, action and stack).
+    """
+    MAX_RECORDS = 100
+
+    def __init__(self, scheduler, timeslice=2.0, action="log", interval=None):
+        """
+        Initialize the Watchdog.
+
+        Args:
+            scheduler (Scheduler): The scheduler to watch.
+            timeslice (float, optional): Step time limit in seconds. Defaults to 2s.
+            action (str, optional): Default reaction. Defaults to "log".
+            interval (float, optional): Sampling period. Defaults to a quarter of
+                the time slice (bounded to 10ms .. 0.5s).
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"unknown watchdog action: {action}")
+        self.scheduler = scheduler
+        self.timeslice = timeslice
+        self.action = action
+        self.interval = interval if interval is not None else min(0.5, max(0.01, timeslice / 4))
+        self.overruns = deque(maxlen=self.MAX_RECORDS)
+        self._seen = None       # (step seq, first seen at)
+        self._handled = None    # step seq already reported
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Attach to the scheduler and start the watchdog thread (no-op if running).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.scheduler.watchdog = self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Detach from the scheduler and stop the watchdog thread.
+        """
+        self._stop.set()
+        if self.scheduler.watchdog is self:
+            self.scheduler.watchdog = None
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[watchdog] Check failed: {e}")
+
+    def check(self):
+        """
+        Sample the running step once and react if it overran its time slice.
+
+        Steps are timed from the first sample that sees them, so detection
+        may lag by up to one sampling interval.
+
+        Returns:
+            dict: The overrun record, or None.
+        """
+        step = self.scheduler.current_step
+        if step is None:
+            self._seen = None
+            return None
+        seq, proc, thread_id = step
+        now = time.monotonic()
+        if self._seen is None or self._seen[0] != seq:
+            self._seen = (seq, now)
+            return None
+        elapsed = now - self._seen[1]
+        if elapsed < self.timeslice or self._handled == seq:
+            return None
+        self._handled = seq
+
+        action = getattr(proc, "watchdog_action", None) or self.action
+        record = {
+            "pid": proc.pid,
+            "name": proc.name,
+            "elapsed": elapsed,
+            "action": action,
+            "stack": self.sample_stack(thread_id),
+            "time": time.time(),
+        }
+        self.overruns.append(record)
+        print(f"[watchdog] {proc.pid} ({proc.name}) step running for {elapsed:.2f}s -> {action}")
+
+        if action == "interrupt":
+            self.scheduler.interrupt(step, StepTimeout)
+        elif action == "isolate":
+            self.scheduler.isolate(step)
+        return record
+
+    @staticmethod
+    def sample_stack(thread_id):
+        """
+        Capture the current stack of a thread.
+
+        Args:
+            thread_id (int): Thread identifier.
+
+        Returns:
+            str: The formatted stack (empty if the thread is gone).
+        """
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            return ""
+        return "".join(traceback.format_stack(frame))
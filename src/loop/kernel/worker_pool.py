@@ -0,0 +1,383 @@
+# kernel/worker_pool.py
+"""
+Worker Pool (SCHED_WORKER scheduling class).
+
+This module lets CPU-bound processes run on other cores. A `RemoteProcess`
+is pinned to a dedicated OS worker forked from a bounded `WorkerPool`; inside
+the kernel it is represented by a lightweight proxy that stays in the
+scheduler's process table, so `ps`, `sys_send` and `sys_kill` work unchanged.
+Messages and signals are forwarded over a pipe; a monitor thread wakes the
+proxy through the scheduler's wait queues whenever the worker has output or
+exits, so idle workers cost the kernel thread nothing.
+
+Worker bodies must be picklable (module-level) callables. They receive a
+`WorkerContext` as first argument and may either run to completion or
+return a generator, which is iterated with signal checks between steps.
+"""
+
+import inspect
+import multiprocessing
+import os
+import threading
+from collections import deque
+from multiprocessing.connection import wait as wait_connections
+
+from loop.kernel.process import Process, SCHED_WORKER
+from loop.kernel.events import ipc_event, worker_event, worker_slot_event
+
+
+class WorkerContext:
+    """
+    Handle passed to a worker body for IPC with the kernel.
+
+    Attributes:
+        pid (int): Kernel PID of the pinned process.
+        signal (str): Last signal forwarded by the kernel (None if none).
+    """
+
+    def __init__(self, conn, pid):
+        """
+        Initialize the WorkerContext.
+
+        Args:
+            conn (Connection): Child end of the kernel pipe.
+            pid (int): Kernel PID of the pinned process.
+        """
+        self.pid = pid
+        self.signal = None
+        self._conn = conn
+        self._inbox = deque()
+
+    def _pump(self, timeout=0.0):
+        while self._conn.poll(timeout):
+            kind, payload = self._conn.recv()
+            if kind == "msg":
+                self._inbox.append(payload)
+            elif kind == "signal":
+                self.signal = payload
+            timeout = 0.0
+
+    def recv(self, timeout=0.0):
+        """
+        Receive an IPC message sent with `sys_send` to this process.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a message.
+
+        Returns:
+            any: The message, or None.
+        """
+        if not self._inbox:
+            self._pump(timeout)
+        return self._inbox.popleft() if self._inbox else None
+
+    def send(self, pid, message):
+        """
+        Send an IPC message to another kernel process.
+
+        Args:
+            pid (int): Destination PID.
+            message (any): Picklable message.
+        """
+        self._conn.send(("send", (pid, message)))
+
+    def check_signal(self):
+        """
+        Poll for forwarded signals.
+
+        Returns:
+            str: The last signal received, or None.
+        """
+        self._pump()
+        return self.signal
+
+
+def _worker_main(conn, pid, func, func_args):
+    """Entry point of a forked worker."""
+    ctx = WorkerContext(conn, pid)
+    code = 0
+    try:
+        body = func(ctx, *func_args)
+        if inspect.isgenerator(body):
+            for _ in body:
+                if ctx.check_signal() in ("SIGTERM", "SIGKILL"):
+                    body.close()
+                    code = -15
+                    break
+    except Exception as e:
+        print(f"[worker {pid}] Error in process: {e}")
+        code = 1
+    try:
+        conn.send(("exit", code))
+    finally:
+        conn.close()
+
+
+class RemoteProcess(Process):
+    """
+    Kernel-side proxy of a process pinned to a worker.
+
+    Attributes:
+        pool (WorkerPool): The pool hosting the worker.
+        func (callable): Worker body.
+        func_args (tuple): Extra arguments for the body.
+    """
+
+    def __init__(self, name, pool, func, func_args=(), uid="root", args=None, env=None, nice=0):
+        """
+        Initialize the RemoteProcess.
+
+        Args:
+            name (str): Name of the process.
+            pool (WorkerPool): The worker pool.
+            func (callable): Picklable worker body `func(ctx, *func_args)`.
+            func_args (tuple, optional): Extra arguments for the body.
+            uid (str, optional): User ID. Defaults to "root".
+            args (list, optional): Process arguments.
+            env (dict, optional): Process environment variables.
+            nice (int, optional): Nice value of the proxy.
+        """
+        super().__init__(name, None, uid=uid, args=args, env=env, nice=nice)
+        self.pool = pool
+        self.func = func
+        self.func_args = tuple(func_args)
+        self.sched_class = SCHED_WORKER
+        self.target = self._proxy()
+
+    def _proxy(self):
+        """Generator run by the scheduler: start the worker, then relay its output."""
+        scheduler = self.pool.scheduler
+        while True:
+            # Block before trying so a slot freed in between is not missed
+            scheduler.block(self, worker_slot_event())
+            if self.pool._start(self):
+                scheduler.wake(self)
+                break
+            yield
+        while not self.pool._drain(self):
+            scheduler.block(self, worker_event(self.pid))
+            self.pool._arm(self)
+            yield
+
+    def send(self, msg):
+        """
+        Forward an IPC message to the worker (buffered until it starts).
+
+        Args:
+            msg (any): Picklable message.
+
+        Returns:
+            bool: True if forwarded or buffered, False if the buffer is full.
+        """
+        if self.pool._forward(self, ("msg", msg)):
+            return True
+        return self.inbox.send(msg)
+
+    def deliver_signal(self, sig):
+        """
+        Deliver a signal: SIGTERM/SIGKILL stop the worker, others are forwarded.
+
+        Args:
+            sig (str): The signal identifier.
+        """
+        super().deliver_signal(sig)
+        if sig in ("SIGTERM", "SIGKILL"):
+            self.pool._stop_worker(self, hard=(sig == "SIGKILL"))
+        else:
+            self.pool._forward(self, ("signal", sig))
+
+
+class WorkerPool:
+    """
+    Bounded set of forked workers hosting SCHED_WORKER processes.
+
+    Attributes:
+        scheduler (Scheduler): The kernel scheduler.
+        max_workers (int): Maximum number of concurrent workers.
+        workers (dict): RemoteProcess -> (multiprocessing.Process, Connection).
+    """
+
+    def __init__(self, scheduler, max_workers=None, mp_context=None):
+        """
+        Initialize the WorkerPool.
+
+        Args:
+            scheduler (Scheduler): The kernel scheduler.
+            max_workers (int, optional): Worker cap. Defaults to the CPU count.
+            mp_context (optional): multiprocessing context. Defaults to the platform default.
+        """
+        self.scheduler = scheduler
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.workers = {}
+        self._mp = mp_context or multiprocessing.get_context()
+        self._lock = threading.RLock()
+        self._armed = {}
+        self._monitor = None
+        self._stopping = threading.Event()
+        self._wake_r, self._wake_w = self._mp.Pipe(duplex=False)
+
+    def spawn(self, name, func, *func_args, uid="root", nice=0):
+        """
+        Create a SCHED_WORKER process and add it to the scheduler.
+
+        Args:
+            name (str): Process name.
+            func (callable): Picklable worker body `func(ctx, *func_args)`.
+            *func_args: Extra arguments for the body.
+            uid (str, optional): Owner. Defaults to "root".
+            nice (int, optional): Nice value of the proxy.
+
+        Returns:
+            RemoteProcess: The proxy process.
+        """
+        proc = RemoteProcess(name, self, func, func_args, uid=uid, nice=nice)
+        self.scheduler.add(proc)
+        return proc
+
+    # ==========================
+    # Worker lifecycle
+    # ==========================
+
+    def _start(self, proc):
+        """Fork a worker for `proc` if a slot is free. Returns True on success."""
+        with self._lock:
+            if proc in self.workers:
+                return True
+            if len(self.workers) >= self.max_workers:
+                return False
+            parent_conn, child_conn = self._mp.Pipe()
+            worker = self._mp.Process(
+                target=_worker_main,
+                args=(child_conn, proc.pid, proc.func, proc.func_args),
+                name=f"loop-worker-{proc.pid}",
+                daemon=True,
+            )
+            worker.start()
+            child_conn.close()
+            self.workers[proc] = (worker, parent_conn)
+            # Flush messages sent before the worker existed
+            for msg in proc.inbox.recv_many():
+                parent_conn.send(("msg", msg))
+            self._ensure_monitor()
+        return True
+
+    def _forward(self, proc, packet):
+        with self._lock:
+            entry = self.workers.get(proc)
+            if entry is None:
+                return False
+            try:
+                entry[1].send(packet)
+            except (OSError, EOFError):
+                return False
+            return True
+
+    def _drain(self, proc):
+        """Handle pending output of a worker. Returns True once it has exited."""
+        with self._lock:
+            entry = self.workers.get(proc)
+            if entry is None:
+                return True
+            conn = entry[1]
+            try:
+                while conn.poll():
+                    kind, payload = conn.recv()
+                    if kind == "exit":
+                        proc.exit_code = payload
+                        self._reap(proc)
+                        return True
+                    if kind == "send":
+                        self._route(*payload)
+            except (EOFError, OSError):
+                worker = entry[0]
+                worker.join(timeout=1.0)
+                proc.exit_code = worker.exitcode if worker.exitcode is not None else 1
+                self._reap(proc)
+                return True
+        return False
+
+    def _route(self, pid, message):
+        """Deliver a message from a worker to a kernel process (sys_send semantics)."""
+        p = self.scheduler.get_process(pid)
+        if p is None:
+            return False
+        p.send(message)
+        self.scheduler.notify(ipc_event(pid))
+        return True
+
+    def _stop_worker(self, proc, hard=False):
+        with self._lock:
+            entry = self.workers.get(proc)
+            if entry is None:
+                return
+            worker = entry[0]
+            if hard:
+                worker.kill()
+            else:
+                worker.terminate()
+            worker.join(timeout=1.0)
+            if proc.exit_code is None:
+                proc.exit_code = -9 if hard else -15
+            self._reap(proc)
+
+    def _reap(self, proc):
+        with self._lock:
+            entry = self.workers.pop(proc, None)
+            self._armed = {c: p for c, p in self._armed.items() if p is not proc}
+        if entry is not None:
+            entry[1].close()
+            self.scheduler.notify(worker_slot_event(), count=1)
+
+    # ==========================
+    # Monitor
+    # ==========================
+
+    def _arm(self, proc):
+        """Watch the worker pipe of `proc`; its proxy is woken when it becomes readable."""
+        with self._lock:
+            entry = self.workers.get(proc)
+            if entry is None:
+                return
+            self._armed[entry[1]] = proc
+        self._wake_w.send_bytes(b"\0")
+
+    def _ensure_monitor(self):
+        if self._monitor is None or not self._monitor.is_alive():
+            self._stopping.clear()
+            self._monitor = threading.Thread(target=self._monitor_loop, name="loop-worker-monitor", daemon=True)
+            self._monitor.start()
+
+    def _monitor_loop(self):
+        while not self._stopping.is_set():
+            with self._lock:
+                armed = dict(self._armed)
+            ready = wait_connections(list(armed) + [self._wake_r], timeout=1.0)
+            for conn in ready:
+                if conn is self._wake_r:
+                    try:
+                        self._wake_r.recv_bytes()
+                    except (EOFError, OSError):
+                        return
+                    continue
+                proc = armed[conn]
+                with self._lock:
+                    if self._armed.get(conn) is not proc:
+                        continue
+                    del self._armed[conn]
+                self.scheduler.notify(worker_event(proc.pid))
+
+    def shutdown(self):
+        """
+        Terminate every worker and stop the monitor thread.
+        """
+        with self._lock:
+            procs = list(self.workers)
+        for proc in procs:
+            self._stop_worker(proc, hard=False)
+        self._stopping.set()
+        try:
+            self._wake_w.send_bytes(b"\0")
+        except OSError:
+            pass
+        if self._monitor is not None:
+            self._monitor.join(timeout=2.0)
@@ -1,4 +1,4 @@
-import requests
+from loop.kernel.httpclient import get_http_client
 from loop.plugins import Plugin
 from loop.plugins.registry import PluginRegistry
 
@@ -57,7 +57,7 @@ class GithubPlugin(Plugin):
 
         url = "https://api.github.com/user/repos" if not username else f"https://api.github.com/users/{username}/repos"
         try:
-            resp = requests.get(url, headers=headers)
+            resp = get_http_client().get(url, headers=headers)
             resp.raise_for_status()
             repos = resp.json()
             return "\n".join([f"{r['full_name']} (Stars: {r['stargazers_count']})" for r in repos])
@@ -83,7 +83,7 @@ class GithubPlugin(Plugin):
         url = f"https://api.github.com/repos/{repo}/issues"
         data = {"title": title, "body": body}
         try:
-            resp = requests.post(url, headers=headers, json=data)
+            resp = get_http_client().post(url, headers=headers, json=data)
             resp.raise_for_status()
             issue = resp.json()
             return f"Issue created: {issue['html_url']}"
@@ -107,7 +107,7 @@ class GithubPlugin(Plugin):
 
         url = f"https://api.github.com/repos/{repo}/pulls?state={state}"
         try:
-            resp = requests.get(url, headers=headers)
+            resp = get_http_client().get(url, headers=headers)
             resp.raise_for_status()
             prs = resp.json()
             if not prs:
@@ -1,4 +1,4 @@
-import requests
+from loop.kernel.httpclient import get_http_client
 from loop.plugins import Plugin
 from loop.plugins.registry import PluginRegistry
 
@@ -42,7 +42,7 @@ class SlackNotifierPlugin(Plugin):
 
         try:
             payload = {"text": message}
-            resp = requests.post(webhook_url, json=payload)
+            resp = get_http_client().post(webhook_url, json=payload)
             resp.raise_for_status()
             return "Message sent to Slack."
         except Exception as e:
@@ -1,13 +1,16 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
+from typing import Any, List, Optional
 import threading
 import time
 import asyncio
 import json
+import os
 from loop.kernel.kernel import LoopKernel
 from loop.kernel.io import APIAdapter
 from loop.kernel.agent import ReActAgent
+from loop.kernel.agent_pool import AgentPool
 
 app = FastAPI()
 
@@ -15,10 +18,32 @@ app = FastAPI()
 kernel = None
 io_adapter = None
 kernel_thread = None
+agent_pool = None
 
 class CommandRequest(BaseModel):
     command: str
 
+class LoginRequest(BaseModel):
+    user: str
+    password: str
+
+class LogoutRequest(BaseModel):
+    token: str
+
+class TaskRequest(BaseModel):
+    task: str
+    token: Optional[str] = None
+
+class SyscallBatchRequest(BaseModel):
+    calls: List[Any]
+    user: Optional[str] = None
+    password: Optional[str] = None
+    token: Optional[str] = None
+    stop_on_error: bool = False
+
+def _client_source(request: Request):
+    return request.client.host if request.client else None
+
 def run_kernel_loop(k):
     """
     Background thread to drive the Kernel/Shell loop.
@@ -31,7 +56,7 @@ def run_kernel_loop(k):
 
 @app.on_event("startup")
 def startup_event():
-    global kernel, io_adapter, kernel_thread
+    global kernel, io_adapter, kernel_thread, agent_pool
 
     # 1. Initialize API Adapter
     io_adapter = APIAdapter()
@@ -46,12 +71,20 @@ def startup_event():
     # we want a shared or persistent agent state that the GUI interacts with.
     # Note: If the shell starts a new agent for every 'agent' command, it won't see this context.
     # Ideally, the Shell should use kernel.agent if available.
-    kernel.agent = ReActAgent(kernel.sys)
+    kernel.agent = ReActAgent(kernel.sys, stream=True, io=io_adapter)
+
+    # 4. Agent pool for concurrent /tasks, sharing the kernel's sandbox and memory
+    agent_pool = AgentPool(kernel.sys, workers=int(os.environ.get("LOOP_AGENT_WORKERS", "4")))
 
-    # 4. Start Kernel in background thread
+    # 5. Start Kernel in background thread
     kernel_thread = threading.Thread(target=run_kernel_loop, args=(kernel,), daemon=True)
     kernel_thread.start()
 
+@app.on_event("shutdown")
+def shutdown_event():
+    if agent_pool:
+        agent_pool.shutdown(wait=False)
+
 @app.get("/health")
 def health_check():
     if kernel and kernel_thread.is_alive():
@@ -71,6 +104,143 @@ def execute_command(req: CommandRequest):
     io_adapter.input(req.command)
     return {"status": "queued"}
 
+@app.post("/login")
+async def login(req: LoginRequest, request: Request):
+    """
+    Open a session. Argon2 runs on the authentication pool, not the event loop.
+    """
+    if not kernel:
+        return JSONResponse({"error": "Kernel not ready"}, status_code=503)
+    token = await kernel.user_manager.login_async(req.user, req.password, source=_client_source(request))
+    if token is None:
+        return JSONResponse({"error": "authentication failed"}, status_code=401)
+    return {"token": token, "expires_in": kernel.user_manager.sessions.ttl}
+
+@app.post("/logout")
+def logout(req: LogoutRequest):
+    """
+    Close a session opened with /login.
+    """
+    if not kernel:
+        return JSONResponse({"error": "Kernel not ready"}, status_code=503)
+    return {"status": "ok" if kernel.user_manager.logout(req.token) else "unknown"}
+
+@app.post("/syscall/batch")
+def syscall_batch(req: SyscallBatchRequest, request: Request):
+    """
+    Execute several syscalls in one request (see SyscallHandler.sys_batch).
+
+    Requires a session token or user/password: the server's threads are not
+    processes, so an anonymous batch would have no identity to run as.
+    """
+    if not kernel:
+        return JSONResponse({"error": "Kernel not ready"}, status_code=503)
+    if req.token is None and req.user is None:
+        return JSONResponse({"error": "authentication required"}, status_code=401)
+    results = kernel.sys.sys_batch(
+        req.calls, user=req.user, password=req.password, stop_on_error=req.stop_on_error,
+        token=req.token, source=_client_source(request),
+    )
+    return {"results": results}
+
+def _task_user(token):
+    """
+    Resolve the session token of a /tasks request. Tasks run as the
+    submitting user and are only visible to them, so a token is required.
+
+    Returns:
+        tuple: (user, error response).
+    """
+    if token is None:
+        return None, JSONResponse({"error": "authentication required"}, status_code=401)
+    user = kernel.user_manager.check_session(token)
+    if user is None:
+        return None, JSONResponse({"error": "invalid or expired session"}, status_code=401)
+    return user, None
+
+def _owned_task(task_id, token):
+    """
+    Look up a task of the caller.
+
+    Returns:
+        tuple: (task, error response). Other users' tasks are reported as unknown.
+    """
+    if not agent_pool:
+        return None, JSONResponse({"error": "Kernel not ready"}, status_code=503)
+    user, error = _task_user(token)
+    if error:
+        return None, error
+    task = agent_pool.get(task_id, user=user)
+    if task is None:
+        return None, JSONResponse({"error": "unknown task"}, status_code=404)
+    return task, None
+
+@app.post("/tasks")
+def submit_task(req: TaskRequest):
+    """
+    Queue an agent task on the agent pool. The agent runs as the caller.
+    """
+    if not agent_pool:
+        return JSONResponse({"error": "Kernel not ready"}, status_code=503)
+    user, error = _task_user(req.token)
+    if error:
+        return error
+    return agent_pool.submit(req.task, user=user).to_dict()
+
+@app.get("/tasks")
+def list_tasks(token: Optional[str] = None):
+    """
+    List the caller's tasks.
+    """
+    if not agent_pool:
+        return JSONResponse({"error": "Kernel not ready"}, status_code=503)
+    user, error = _task_user(token)
+    if error:
+        return error
+    return {"tasks": [t.to_dict() for t in agent_pool.list(user=user)]}
+
+@app.get("/tasks/{task_id}")
+def get_task(task_id: str, token: Optional[str] = None):
+    """
+    Poll a task.
+    """
+    task, error = _owned_task(task_id, token)
+    if error:
+        return error
+    return task.to_dict()
+
+@app.delete("/tasks/{task_id}")
+def cancel_task(task_id: str, token: Optional[str] = None):
+    """
+    Cancel a queued or running task.
+    """
+    task, error = _owned_task(task_id, token)
+    if error:
+        return error
+    return {"cancelled": agent_pool.cancel(task_id, user=task.user), "status": task.status}
+
+@app.get("/tasks/{task_id}/stream")
+async def stream_task(task_id: str, since: int = 0, token: Optional[str] = None):
+    """
+    Stream a task's events as newline-delimited JSON until it finishes.
+    """
+    task, error = _owned_task(task_id, token)
+    if error:
+        return error
+
+    async def events():
+        index = since
+        while True:
+            # Wait for events on a worker thread, keeping the event loop free
+            batch, index = await asyncio.to_thread(task.events, index, 1.0)
+            for event in batch:
+                yield json.dumps(event) + "\n"
+            if not batch and task.done:
+                yield json.dumps({"type": "result", "content": task.to_dict()}) + "\n"
+                return
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -87,6 +257,11 @@ async def websocket_endpoint(websocket: WebSocket):
                     # The instruction says: 'Send {"type": "text", "content": ...}'
                     await websocket.send_json({"type": "text", "content": output})
 
+                # 1b. Streamed LLM tokens, coalesced into one message per poll
+                tokens = io_adapter.get_tokens()
+                if tokens:
+                    await websocket.send_json({"type": "token", "content": tokens})
+
                 # 2. Check Signals (Control)
                 signal = io_adapter.get_signal()
                 if signal:
@@ -104,7 +279,7 @@ async def websocket_endpoint(websocket: WebSocket):
                      # 3. Notify Client
                      await websocket.send_json({"type": "signal", "content": signal})
 
-                if not output and not signal:
+                if not output and not signal and not tokens:
                     await asyncio.sleep(0.05)
             else:
                 await asyncio.sleep(1)
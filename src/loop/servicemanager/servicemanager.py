@@ -247,8 +247,7 @@ class ServiceManager:
             # If force was already True, we can't do much more but scrub state.
 
         # Cleanup State
-        if proc in self.scheduler.processes:
-            self.scheduler.processes.remove(proc)
+        self.scheduler.remove(proc)
 
     def shutdown(self, timeout: float = 30.0, grace_period: float = 5.0, force: bool = False) -> ShutdownReport:
         """
@@ -302,9 +301,8 @@ class ServiceManager:
         self.shutdown_state = ShutdownState.CLEANUP
 
         # Scrub any remaining
-        remaining = [p for p in self.services.values() if p in self.scheduler.processes]
-        for proc in remaining:
-            self.scheduler.processes.remove(proc)
+        for proc in self.services.values():
+            self.scheduler.remove(proc)
 
         self.services.clear()
         self.all_processes.clear()
@@ -167,6 +167,8 @@ class Shell:
                 return self._run_program(args)
 
             elif op == "ps":
+                if args and args[0] in ("top", "-t", "--top"):
+                    return self._ps_top(args[1:])
                 # Use syscall instead of supervisor direct access if possible
                 procs = self.sys.sys_proc_list()
                 out = ["PID    NAME    STATE    UID"]
@@ -237,7 +239,7 @@ class Shell:
                 # Lazy Init Agent
                 if not self.agent:
                     self.io.write("[Shell] Initializing Agent Layer...\n")
-                    self.agent = ReActAgent(self.sys)
+                    self.agent = ReActAgent(self.sys, stream=True, io=self.io)
 
                 self.io.write(f"[Shell] Dispatching task to Agent: '{task}'\n")
                 return self.agent.run(task)
@@ -251,6 +253,7 @@ class Shell:
                     "  append <f> <text> - append file\n"
                     "  run <prog> args   - run program in /bin\n"
                     "  ps                - list processes\n"
+                    "  ps top [n] [key]  - hottest processes (key: cpu|max|p99|steps)\n"
                     "  reboot            - restart OS\n"
                     "  shutdown          - shutdown OS\n"
                     "  help              - show this\n"
@@ -275,6 +278,36 @@ class Shell:
         except Exception as e:
             return f"[error] {e}"
 
+    # ========== PROFILING ==========
+    def _ps_top(self, args):
+        """
+        Render a top-like view of the hottest processes.
+
+        Args:
+            args (list): Optional row count and sort key (cpu, max, p99, steps).
+
+        Returns:
+            str: The formatted table.
+        """
+        top = int(args[0]) if args and args[0].isdigit() else 10
+        sort = next((a for a in args if not a.isdigit()), "cpu")
+        stats = self.sys.sys_sched_stats(top=top, sort=sort)
+        tick = stats["tick_latency"]
+        out = [
+            f"ticks: {stats['ticks']}  procs: {stats['processes']}  "
+            f"runnable: {stats['runnable']}  waiting: {stats['waiting']}  "
+            f"tick p50/p99/max: {tick['p50_us']:.0f}/{tick['p99_us']:.0f}/{tick['max_us']:.0f}us",
+            "PID     NAME         STATE      NI   %CPU   CPU(ms)    STEPS  AVG(us)  P99(us)  MAX(us)",
+        ]
+        for p in stats["procs"]:
+            lat = p["latency"]
+            out.append(
+                f"{p['pid']:<7} {p['name'][:12]:<12} {p['state']:<10} {p['nice']:>3} "
+                f"{p['cpu_pct']:>6.1f} {p['cpu_ms']:>9.1f} {p['steps']:>8} "
+                f"{lat['mean_us']:>8.0f} {lat['p99_us']:>8.0f} {lat['max_us']:>8.0f}"
+            )
+        return "\n".join(out)
+
     # ========== PROGRAM EXECUTION ==========
     def _run_program(self, args):
         """
@@ -0,0 +1,76 @@
+import os
+import socket
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from loop.kernel.netpolicy import ALLOW, DENY, NetworkPolicy
+from loop.kernel.network import NetworkGuard, NetworkManager
+
+N_RULES = 1000
+
+
+def build_policy():
+    policy = NetworkPolicy(default=DENY)
+    for i in range(N_RULES):
+        policy.add_rule(ALLOW, hosts=[f"svc{i}.example.com"], ports=[443])
+        policy.add_rule(ALLOW if i % 2 else DENY, cidrs=[f"10.{i // 256}.{i % 256}.0/24"])
+    policy.limit_user("agent", 10_000_000)
+    return policy
+
+
+def benchmark_match(policy, n=200_000):
+    start = time.perf_counter()
+    for i in range(n):
+        policy.match(host=f"svc{i % N_RULES}.example.com", port=443, user="agent")
+    host_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(n):
+        policy.match(ip=f"10.{(i % N_RULES) // 256}.{i % 256}.7", port=443, user="agent")
+    ip_elapsed = time.perf_counter() - start
+    print(f"Host match (uncached): {host_elapsed / n * 1e6:.2f} us/check ({n / host_elapsed:,.0f} checks/sec)")
+    print(f"CIDR match (uncached): {ip_elapsed / n * 1e6:.2f} us/check ({n / ip_elapsed:,.0f} checks/sec)")
+
+
+def benchmark_check(policy, n=1_000_000):
+    start = time.perf_counter()
+    for _ in range(n):
+        policy.check(host="svc7.example.com", port=443, user="agent", pid=1)
+    elapsed = time.perf_counter() - start
+    print(f"Cached decision:       {elapsed / n * 1e6:.2f} us/check ({n / elapsed:,.0f} checks/sec)")
+
+
+def benchmark_connect(n=2000):
+    srv = socket.create_server(("127.0.0.1", 0), backlog=n)
+    port = srv.getsockname()[1]
+
+    def run():
+        start = time.perf_counter()
+        for _ in range(n):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.connect(("127.0.0.1", port))
+            sock.close()
+            srv.accept()[0].close()
+        return (time.perf_counter() - start) / n * 1e6
+
+    plain = run()
+    manager = NetworkManager(MagicMock())
+    manager.policy = build_policy()
+    manager.policy.add_rule(ALLOW, cidrs=["127.0.0.0/8"])
+    guard = NetworkGuard(manager, identify=lambda: ("agent", 1))
+    guard.enable(enforce_state=False)
+    try:
+        guarded = run()
+    finally:
+        guard.disable()
+    srv.close()
+    print(f"Connect: {plain:.1f} us unguarded, {guarded:.1f} us guarded ({guarded - plain:+.1f} us)")
+
+
+if __name__ == "__main__":
+    policy = build_policy()
+    benchmark_match(policy)
+    benchmark_check(policy)
+    benchmark_connect()
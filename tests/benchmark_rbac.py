@@ -0,0 +1,39 @@
+import time
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from loop.kernel.users import UserManager
+
+ACTIONS = ("use_network", "manage_network", "execute_code", "manage_docker", "manage_k8s")
+
+
+def benchmark_checks(um, n_checks, reload_each=False):
+    users = [f"user{i}" for i in range(50)]
+    start = time.perf_counter()
+    for i in range(n_checks):
+        if reload_each:
+            # Previous behaviour: re-read users.json on every check
+            um._load()
+        um.has_permission(users[i % len(users)], ACTIONS[i % len(ACTIONS)])
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        UserManager.DB_FILE = Path(tmp) / "users.json"
+        um = UserManager()
+        for i in range(50):
+            um.users[f"user{i}"] = {"password": "x", "roles": ["user"]}
+        um._save()
+
+        n = 20_000
+        elapsed = benchmark_checks(um, n, reload_each=True)
+        print(f"Reload per check: {n} checks in {elapsed:.4f}s ({n / elapsed:,.0f} checks/sec)")
+
+        n = 2_000_000
+        elapsed = benchmark_checks(um, n)
+        print(f"Cached matrix:    {n} checks in {elapsed:.4f}s ({n / elapsed:,.0f} checks/sec)")
@@ -0,0 +1,40 @@
+import time
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.process import Process
+
+
+def spinner():
+    while True:
+        yield
+
+
+def benchmark_scheduler(n_procs=10000, ticks=50):
+    scheduler = Scheduler()
+    start = time.perf_counter()
+    for i in range(n_procs):
+        scheduler.add(Process(f"bench_{i}", spinner(), nice=i % 40 - 20))
+    spawn = time.perf_counter() - start
+    print(f"Spawned {n_procs} processes in {spawn:.4f}s")
+
+    start = time.perf_counter()
+    scheduler.run(max_steps=ticks)
+    elapsed = time.perf_counter() - start
+    print(f"Ran {ticks} ticks in {elapsed:.4f}s ({ticks / elapsed:.1f} ticks/sec)")
+
+    # Terminate half the processes and measure reaping cost
+    for i, proc in enumerate(scheduler.processes):
+        if i % 2:
+            proc.deliver_signal("SIGTERM")
+    start = time.perf_counter()
+    scheduler.run(max_steps=1)
+    print(f"Reaped {n_procs // 2} processes in {time.perf_counter() - start:.4f}s "
+          f"({len(scheduler.processes)} remaining)")
+
+
+if __name__ == "__main__":
+    benchmark_scheduler()
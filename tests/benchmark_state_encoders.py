@@ -0,0 +1,84 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from loop.kernel.dom import DEFAULT_FS_DEPTH, DEFAULT_FS_TOKEN_BUDGET, SystemDOM
+from loop.kernel.filesystem import FileSystem
+from loop.kernel.state_encoder import ENCODERS
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+MODELS = ["gpt-4o", "gpt-4", "gpt-3.5-turbo"]
+
+
+def make_handler(n_dirs, n_files, n_procs, n_containers, n_pods):
+    handler = MagicMock()
+    handler.fs = FileSystem()
+    for d in range(n_dirs):
+        handler.fs.mkdir(f"/home/guest/project{d}")
+        for f in range(n_files):
+            handler.fs.write_file(f"/home/guest/project{d}/module_{f}.py", "x")
+    handler.sys_proc_list.return_value = [
+        {"pid": i, "name": f"worker-{i}", "user": "guest" if i % 3 else "root", "status": "running", "cpu": round(i * 0.7 % 9, 1)}
+        for i in range(1, n_procs + 1)
+    ]
+    handler.user_manager.list_users.return_value = ["root", "guest", "admin"]
+    handler.sys_docker_ps.return_value = {"success": True, "data": [
+        {"id": f"{i:012x}", "name": f"svc-{i}", "image": f"registry.local/svc-{i}:1.{i}", "status": "Up 3 hours", "ports": {"8080/tcp": 8000 + i}}
+        for i in range(n_containers)
+    ]}
+    handler.sys_k8s_get_pods.return_value = {"success": True, "data": [
+        {"name": f"api-{i}-7d9f8", "namespace": "default", "status": "Running", "restarts": i % 2, "node": f"node-{i % 3}"}
+        for i in range(n_pods)
+    ]}
+    return handler
+
+
+def make_states():
+    """Representative observations: fresh system, working project, busy cluster (lazy and full trees)."""
+    states = {}
+    for label, shape in [("small", (0, 0, 5, 0, 0)), ("medium", (4, 10, 40, 8, 8)), ("large", (20, 30, 150, 30, 40))]:
+        handler = make_handler(*shape)
+        dom = SystemDOM(handler, fs_depth=DEFAULT_FS_DEPTH, fs_token_budget=DEFAULT_FS_TOKEN_BUDGET)
+        states[label] = dom.get_state()
+        dom.close()
+        if label == "large":
+            dom = SystemDOM(handler)
+            states["large-full-tree"] = dom.get_state()
+            dom.close()
+    return states
+
+
+def counters():
+    """Token counters per model; chars / 4 (the agent's own estimate) without tiktoken."""
+    result = {"chars/4": lambda text: len(text) // 4}
+    if tiktoken is not None:
+        for model in MODELS:
+            encoding = tiktoken.encoding_for_model(model)
+            result[model] = lambda text, encoding=encoding: len(encoding.encode(text))
+    return result
+
+
+def benchmark(states, count):
+    """Tokens per (state, encoder)."""
+    return {
+        label: {name: count(encoder.encode(state)) for name, encoder in ENCODERS.items()}
+        for label, state in states.items()
+    }
+
+
+if __name__ == "__main__":
+    states = make_states()
+    for counter_name, count in counters().items():
+        print(f"Tokens ({counter_name}):")
+        print(f"  {'state':<16}" + "".join(f"{name:>10}" for name in ENCODERS) + "   cheapest")
+        for label, tokens in benchmark(states, count).items():
+            base = tokens["repr"]
+            cheapest = min(tokens, key=tokens.get)
+            cells = "".join(f"{tokens[name]:>10,}" for name in ENCODERS)
+            print(f"  {label:<16}{cells}   {cheapest} ({tokens[cheapest] / base:.0%} of repr)")
@@ -0,0 +1,58 @@
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from loop.kernel.users import UserManager
+
+N_USERS = 5000
+N_CHANGES = 500
+
+
+def make_manager(tmp):
+    UserManager.DB_FILE = Path(tmp) / "users.json"
+    um = UserManager()
+    fake_hash = um._dummy_hash
+    um.users.update({f"user{i}": {"password": fake_hash, "roles": ["user"]} for i in range(N_USERS)})
+    um._save()
+    return um
+
+
+def benchmark_full_rewrite(um):
+    """Previous behaviour: rewrite the whole file with indent=2 per change."""
+    start = time.perf_counter()
+    for i in range(N_CHANGES):
+        um.users[f"user{i}"]["roles"].append("old")
+        with open(um.DB_FILE, "w") as f:
+            json.dump(um.users, f, indent=2)
+    return time.perf_counter() - start
+
+
+def benchmark_journal(um):
+    start = time.perf_counter()
+    for i in range(N_CHANGES):
+        um.add_role(f"user{i}", "dev")
+    return time.perf_counter() - start
+
+
+def benchmark_bulk(um):
+    start = time.perf_counter()
+    um.add_roles({f"user{i}": ["ops"] for i in range(N_CHANGES)})
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        um = make_manager(tmp)
+        elapsed = benchmark_full_rewrite(um)
+        print(f"Full rewrite: {N_CHANGES} changes / {N_USERS} users in {elapsed:.4f}s ({N_CHANGES / elapsed:,.0f} changes/sec)")
+    with tempfile.TemporaryDirectory() as tmp:
+        um = make_manager(tmp)
+        elapsed = benchmark_journal(um)
+        print(f"Journal:      {N_CHANGES} changes / {N_USERS} users in {elapsed:.4f}s ({N_CHANGES / elapsed:,.0f} changes/sec)")
+        elapsed = benchmark_bulk(um)
+        print(f"Bulk batch:   {N_CHANGES} changes / {N_USERS} users in {elapsed:.4f}s ({N_CHANGES / elapsed:,.0f} changes/sec)")
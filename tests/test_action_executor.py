@@ -0,0 +1,195 @@
+import json
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+# Pre-patch libraries
+sys.modules["pyautogui"] = MagicMock()
+sys.modules["pynput"] = MagicMock()
+sys.modules["pynput.keyboard"] = MagicMock()
+
+from loop.kernel.action_executor import ActionExecutor, plan_lanes
+from loop.kernel.agent import ReActAgent
+from loop.kernel.process import Process
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.syscall import SyscallHandler
+
+
+def test_plan_lanes_orders_same_path_writes():
+    actions = [
+        ("write_file", ["/tmp/a.txt", "1"]),
+        ("read_file", ["/tmp/b.txt"]),
+        ("append_file", ["/tmp//a.txt", "2"]),
+        ("read_file", ["/tmp/a.txt"]),
+        ("read_screen", []),
+        ("interact", ["click", 1, 1]),
+    ]
+    assert plan_lanes(actions) == [[0, 2, 3], [1], [4, 5]]
+
+
+def test_plan_lanes_runs_programs_after_writes():
+    actions = [
+        ("write_file", ["/tmp/run.sh", "echo hi"]),
+        ("read_file", ["/tmp/other.txt"]),
+        ("read_file", ["/tmp/run.sh"]),
+        ("run_process", ["system", ["/tmp/run.sh"]]),
+        ("read_screen", []),
+    ]
+    assert plan_lanes(actions) == [[0, 2, 3, 4], [1]]
+    # Without a preceding write, programs still run in parallel
+    assert plan_lanes([("run_process", ["calc", []]), ("write_file", ["/a", "x"])]) == [[0], [1]]
+
+
+def test_streamed_program_waits_for_earlier_writes():
+    executor = ActionExecutor(max_workers=4)
+    log = []
+
+    def execute(name, args):
+        if name == "write_file":
+            time.sleep(0.05)
+        log.append(name)
+        return name
+
+    try:
+        batch = executor.batch(execute)
+        batch.add("write_file", ["/tmp/run.sh", "echo hi"])
+        batch.add("run_process", ["system", ["/tmp/run.sh"]])
+        batch.add("read_file", ["/tmp/other.txt"])
+        assert batch.wait() == ["write_file", "run_process", "read_file"]
+    finally:
+        executor.shutdown()
+    assert log.index("write_file") < log.index("run_process")
+
+
+def test_executor_runs_lanes_concurrently():
+    executor = ActionExecutor(max_workers=4)
+    barrier = threading.Barrier(3, timeout=5)
+
+    def execute(name, args):
+        barrier.wait()  # Deadlocks unless all three run at once
+        return name
+
+    try:
+        results = executor.run([("a", []), ("b", []), ("c", [])], execute)
+    finally:
+        executor.shutdown()
+    assert results == ["a", "b", "c"]
+
+
+def test_executor_preserves_write_order_and_reports_errors():
+    executor = ActionExecutor(max_workers=4)
+    log = []
+
+    def execute(name, args):
+        if name == "boom":
+            raise RuntimeError("failed")
+        if name == "write_file":
+            time.sleep(0.02 if args[1] == "first" else 0)
+        log.append(args[1])
+        return args[1]
+
+    actions = [
+        ("write_file", ["/x", "first"]),
+        ("write_file", ["/x", "second"]),
+        ("boom", []),
+    ]
+    try:
+        results = executor.run(actions, execute)
+    finally:
+        executor.shutdown()
+    assert results[:2] == ["first", "second"]
+    assert log.index("first") < log.index("second")
+    assert results[2] == "Error executing boom: failed"
+
+
+def make_handler():
+    handler = SyscallHandler(scheduler=Scheduler(), user_manager=MagicMock(), network_manager=MagicMock())
+    handler.scheduler.current_process = Process("task", lambda: None, uid="guest")
+    return handler
+
+
+def test_executor_lanes_keep_the_callers_identity():
+    handler = make_handler()
+    executor = ActionExecutor(max_workers=2, caller_context=handler.caller_context)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def execute(name, args):
+        barrier.wait()  # Both lanes on pool threads at once
+        return handler._get_current_uid()
+
+    try:
+        assert executor.run([("a", []), ("b", [])], execute) == ["guest", "guest"]
+        # The pool threads go back to kernel context afterwards
+        assert executor._get_pool().submit(handler._get_current_uid).result() == "root"
+    finally:
+        executor.shutdown()
+
+
+def test_streamed_batch_keeps_the_callers_identity():
+    handler = make_handler()
+    executor = ActionExecutor(max_workers=2, caller_context=handler.caller_context)
+    try:
+        batch = executor.batch(lambda name, args: handler._get_current_uid())
+        handler.scheduler.current_process = None  # Captured when the batch opened
+        batch.add("read_file", ["/a"])
+        batch.add("read_file", ["/b"])
+        assert batch.wait() == ["guest", "guest"]
+    finally:
+        executor.shutdown()
+
+
+def make_agent(responses):
+    agent = ReActAgent(MagicMock())
+    agent.dom = MagicMock()
+    agent.dom.get_state.return_value = {}
+    agent.resource_monitor = MagicMock()
+    agent.resource_monitor.check_limits.return_value = None
+    agent.action_logger = MagicMock()
+    agent.sandbox = MagicMock()
+    agent._generate_with_retry = MagicMock(side_effect=responses)
+    return agent
+
+
+def test_agent_runs_multiple_actions_in_one_turn():
+    agent = make_agent([
+        json.dumps({"thought": "read both", "actions": [
+            {"name": "read_file", "args": ["a.txt"]},
+            {"name": "shout", "args": ["hi"]},
+        ]}),
+        json.dumps({"thought": "finished", "action": {"name": "done", "args": []}}),
+    ])
+    agent.sandbox.execute.side_effect = lambda name, args: f"contents of {args[0]}"
+    agent.extra_tools["shout"] = {"func": lambda text: text.upper(), "description": "shout(text)"}
+
+    assert agent.run("read files") == "Task Completed"
+
+    agent.sandbox.execute.assert_called_once_with("read_file", ["a.txt"])
+    results = [h for h in agent.history if h.startswith("Turn 1 Result")]
+    assert len(results) == 1
+    assert "[1] read_file" in results[0] and "contents of a.txt" in results[0]
+    assert "[2] shout" in results[0] and "HI" in results[0]
+    assert agent.action_logger.log_action.call_count == 3
+
+
+def test_agent_runs_actions_before_done():
+    agent = make_agent([
+        json.dumps({"thought": "write and finish", "actions": [
+            {"name": "write_file", "args": ["out.txt", "x"]},
+            {"name": "done", "args": []},
+        ]}),
+    ])
+    agent.sandbox.execute.return_value = "ok"
+
+    assert agent.run("write") == "Task Completed"
+    agent.sandbox.execute.assert_called_once_with("write_file", ["out.txt", "x"])
+    assert "Turn 1 Result: ok" in agent.history
+
+
+def test_parse_response_returns_first_action():
+    agent = ReActAgent(MagicMock())
+    text = json.dumps({"thought": "t", "actions": [
+        {"name": "list_dir", "args": ["."]},
+        {"name": "read_file", "args": ["a"]},
+    ]})
+    assert agent._parse_response(text) == ("t", [], "list_dir", ["."])
@@ -0,0 +1,157 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from loop.kernel.agent_pool import CANCELLED, COMPLETED, FAILED, AgentPool
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.syscall import SyscallHandler
+
+
+class FakeAgent:
+    """Stands in for ReActAgent: one turn per 'step' until released."""
+
+    def __init__(self, sys, io, gate):
+        self.sys = sys
+        self.io = io
+        self.gate = gate
+        self.history = []
+
+    def run(self, task, cancel=None):
+        self.history = [task]
+        self.uid = self.sys._get_current_uid()
+        self.io.stream(f"working on {task}")
+        if task == "fail":
+            raise RuntimeError("boom")
+        while not self.gate.wait(0.01):
+            if cancel is not None and cancel.is_set():
+                return "Cancelled"
+        return f"did {task}"
+
+
+@pytest.fixture
+def pool():
+    gate = threading.Event()
+    agents = []
+
+    def factory(sys, io):
+        agent = FakeAgent(sys, io, gate)
+        agents.append(agent)
+        return agent
+
+    pool = AgentPool(MagicMock(), workers=2, agent_factory=factory)
+    pool.gate, pool.agents = gate, agents
+    yield pool
+    gate.set()
+    pool.shutdown()
+
+
+def wait_running(*tasks):
+    for _ in range(500):
+        if all(t.status == "running" for t in tasks):
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("tasks did not start")
+
+
+def wait_done(task, timeout=5):
+    index = 0
+    while not task.done:
+        _, index = task.events(index, timeout)
+    return task
+
+
+def test_tasks_run_concurrently_with_isolated_agents(pool):
+    a = pool.submit("a", user="alice")
+    b = pool.submit("b", user="bob")
+    c = pool.submit("c", user="alice")
+    wait_running(a, b)
+    assert c.status == "queued"  # Only two workers
+
+    pool.gate.set()
+    for task in (a, b, c):
+        wait_done(task)
+    assert [t.result for t in (a, b, c)] == ["did a", "did b", "did c"]
+    assert len(pool.agents) == 2
+    assert all(agent.sys is pool.sys for agent in pool.agents)
+    assert [t.id for t in pool.list(user="alice")] == [a.id, c.id]
+
+
+def test_tasks_need_a_user(pool):
+    with pytest.raises(ValueError):
+        pool.submit("anonymous", user=None)
+
+
+def test_tasks_run_as_the_submitting_user():
+    handler = SyscallHandler(scheduler=Scheduler(), user_manager=MagicMock(), network_manager=MagicMock())
+    gate = threading.Event()
+    gate.set()
+    agents = []
+
+    def factory(sys, io):
+        agents.append(FakeAgent(sys, io, gate))
+        return agents[-1]
+
+    pool = AgentPool(handler, workers=1, agent_factory=factory)
+    try:
+        wait_done(pool.submit("a", user="alice"))
+        assert agents[0].uid == "alice"
+        wait_done(pool.submit("b", user="bob"))
+        assert agents[0].uid == "bob"
+    finally:
+        pool.shutdown()
+
+
+def test_tasks_are_only_visible_to_their_owner(pool):
+    task = pool.submit("mine", user="alice")
+    assert pool.get(task.id, user="alice") is task
+    assert pool.get(task.id, user="bob") is None
+    assert not pool.cancel(task.id, user="bob")
+    assert not task.cancel_event.is_set()
+    assert pool.list(user="bob") == []
+    assert pool.cancel(task.id, user="alice")
+
+
+def test_events_stream_tokens_and_status(pool):
+    pool.gate.set()
+    task = wait_done(pool.submit("stream me", user="alice"))
+    events, _ = task.events()
+    assert {"type": "token", "content": "working on stream me"} in events
+    assert [e["content"] for e in events if e["type"] == "status"] == ["queued", "running", "completed"]
+    assert task.status == COMPLETED
+
+
+def test_cancel_queued_and_running(pool):
+    running = [pool.submit("r1", user="alice"), pool.submit("r2", user="alice")]
+    queued = pool.submit("q", user="alice")
+    wait_running(*running)
+    assert pool.cancel(queued.id)
+    assert queued.status == CANCELLED
+
+    assert pool.cancel(running[0].id)
+    wait_done(running[0])
+    assert running[0].status == CANCELLED
+    assert running[0].result == "Cancelled"
+    assert not pool.cancel(running[0].id)
+    assert not pool.cancel("missing")
+
+
+def test_failed_task_reports_error(pool):
+    task = wait_done(pool.submit("fail", user="alice"))
+    assert task.status == FAILED
+    assert task.error == "boom"
+
+
+def test_agent_stops_before_next_turn_when_cancelled():
+    import sys
+    sys.modules["pyautogui"] = MagicMock()
+    sys.modules["pynput"] = MagicMock()
+    sys.modules["pynput.keyboard"] = MagicMock()
+    from loop.kernel.agent import ReActAgent
+
+    agent = ReActAgent(MagicMock())
+    agent.llm = MagicMock()
+    cancel = threading.Event()
+    cancel.set()
+    assert agent.run("anything", cancel=cancel) == "Cancelled"
+    agent.llm.generate.assert_not_called()
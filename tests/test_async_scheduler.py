@@ -0,0 +1,102 @@
+import asyncio
+import time
+import pytest
+from loop.kernel.async_scheduler import AsyncScheduler
+from loop.kernel.process import Process, ProcessState
+from loop.kernel.events import ipc_event
+
+
+@pytest.fixture
+def scheduler():
+    s = AsyncScheduler()
+    yield s
+    s.close()
+
+
+def test_coroutines_wait_concurrently(scheduler):
+    finished = []
+
+    async def agent(tag):
+        await asyncio.sleep(0.1)  # stands in for network I/O
+        finished.append(tag)
+
+    for i in range(20):
+        scheduler.add(Process(f"agent_{i}", agent(i), "root"))
+
+    start = time.monotonic()
+    scheduler.run()
+    elapsed = time.monotonic() - start
+
+    assert sorted(finished) == list(range(20))
+    assert elapsed < 1.0  # 20 x 0.1s in parallel, not serial
+    assert len(scheduler.processes) == 0
+
+
+def test_mixed_generators_and_coroutines(scheduler):
+    events = []
+
+    def legacy():
+        for i in range(3):
+            events.append(("gen", i))
+            yield
+
+    async def modern():
+        events.append(("coro", "start"))
+        await asyncio.sleep(0)
+        events.append(("coro", "end"))
+
+    gen_proc = Process("legacy", legacy(), "root")
+    coro_proc = Process("modern", modern, "root")  # async def function is accepted too
+    scheduler.add(gen_proc)
+    scheduler.add(coro_proc)
+
+    scheduler.run()
+
+    assert [e for e in events if e[0] == "gen"] == [("gen", 0), ("gen", 1), ("gen", 2)]
+    assert ("coro", "end") in events
+    assert coro_proc.state == ProcessState.TERMINATED
+    assert coro_proc.exit_code == 0
+
+
+def test_current_process_and_event_wait(scheduler):
+    seen = {}
+
+    async def consumer():
+        me = scheduler.current_process
+        seen["me"] = me
+        ok = await scheduler.wait_for(ipc_event(me.pid), timeout=2, predicate=lambda: bool(me.inbox))
+        seen["msg"] = me.receive() if ok else None
+
+    def producer(target):
+        yield
+        target.send("ping")
+        scheduler.notify(ipc_event(target.pid))
+
+    consumer_proc = Process("consumer", consumer(), "root")
+    scheduler.add(consumer_proc)
+    scheduler.add(Process("producer", producer(consumer_proc), "root"))
+
+    scheduler.run()
+
+    assert seen["me"] is consumer_proc
+    assert seen["msg"] == "ping"
+    assert scheduler.current_process is None
+
+
+def test_signal_cancels_coroutine(scheduler):
+    async def forever():
+        while True:
+            await asyncio.sleep(1)
+
+    p = Process("forever", forever(), "root")
+    scheduler.add(p)
+    scheduler.run(max_steps=2)
+    assert p in scheduler.tasks
+
+    p.deliver_signal("SIGKILL")
+    scheduler.signal(p)
+    scheduler.run(max_steps=5)
+
+    assert p.state == ProcessState.TERMINATED
+    assert p.exit_code == -9
+    assert p not in scheduler.processes
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+from loop.kernel.auth import FailureLimiter, SessionCache
+from loop.kernel.users import UserManager
+
+
+@pytest.fixture
+def um(tmp_path, monkeypatch):
+    monkeypatch.setattr(UserManager, "DB_FILE", tmp_path / "users.json")
+    um = UserManager()
+    um.add_user("alice", "secret")
+    return um
+
+
+def test_failure_limiter_window(monkeypatch):
+    limiter = FailureLimiter(limit=2, window=10.0)
+    now = [100.0]
+    monkeypatch.setattr("loop.kernel.auth.time.monotonic", lambda: now[0])
+    assert limiter.allowed("u")
+    limiter.record_failure("u")
+    limiter.record_failure("u")
+    assert not limiter.allowed("u")
+    assert limiter.allowed(None)
+    now[0] += 11.0
+    assert limiter.allowed("u")
+
+
+def test_session_cache_expiry_and_revoke(monkeypatch):
+    sessions = SessionCache(ttl=5.0)
+    now = [0.0]
+    monkeypatch.setattr("loop.kernel.auth.time.monotonic", lambda: now[0])
+    t1, t2 = sessions.issue("alice"), sessions.issue("alice")
+    assert t1 != t2
+    assert sessions.validate(t1) == "alice"
+    assert sessions.revoke_user("alice") == 2
+    assert sessions.validate(t2) is None
+
+    t3 = sessions.issue("bob")
+    now[0] += 6.0
+    assert sessions.validate(t3) is None
+
+
+def test_authenticate_async(um):
+    async def main():
+        return await asyncio.gather(
+            um.authenticate_async("alice", "secret"),
+            um.authenticate_async("alice", "wrong"),
+            um.authenticate_async("nobody", "secret"),
+        )
+    assert asyncio.run(main()) == [True, False, False]
+
+
+def test_login_throttling(um):
+    for _ in range(5):
+        assert not um.authenticate("alice", "bad", source="10.0.0.1")
+    # Throttled from that source, even with the right password
+    assert not um.authenticate("alice", "secret", source="10.0.0.1")
+    # Other clients are not locked out
+    assert um.authenticate("alice", "secret", source="10.0.0.2")
+    um._user_failures.reset(("alice", "10.0.0.1"))
+    assert um.authenticate("alice", "secret", source="10.0.0.1")
+
+
+def test_concurrent_guesses_cannot_pass_limit(um, monkeypatch):
+    barrier = threading.Barrier(10, timeout=5)
+    verified = []
+    verify = um._verify_user
+
+    def slow_verify(user, pw):
+        verified.append(pw)
+        return verify(user, pw)
+
+    monkeypatch.setattr(um, "_verify_user", slow_verify)
+
+    def guess(i):
+        barrier.wait()
+        return um.authenticate("alice", f"bad{i}", source="10.0.0.3")
+
+    threads = [threading.Thread(target=guess, args=(i,)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(verified) == 5
+
+
+def test_failure_limiter_reservations():
+    limiter = FailureLimiter(limit=2)
+    assert limiter.acquire("u") and limiter.acquire("u")
+    assert not limiter.acquire("u")
+    limiter.release("u")
+    assert limiter.acquire("u")
+    assert limiter.acquire(None)
+
+
+def test_source_throttling(um):
+    for i in range(20):
+        um.authenticate(f"ghost{i}", "bad", source="10.0.0.9")
+    assert not um.authenticate("alice", "secret", source="10.0.0.9")
+    assert um.authenticate("alice", "secret", source="10.0.0.10")
+
+
+def test_session_login_skips_argon2(um, monkeypatch):
+    token = um.login("alice", "secret")
+    assert token
+    calls = []
+    monkeypatch.setattr(um, "_verify", lambda *a: calls.append(a) or False)
+    assert um.check_session(token) == "alice"
+    assert calls == []
+
+    um.delete_user("alice")
+    assert um.check_session(token) is None
+    assert um.login("alice", "secret") is None
+
+
+def test_account_throttling_across_sources(um, monkeypatch):
+    monkeypatch.setattr(um._account_failures, "limit", 8)
+    for i in range(8):
+        assert not um.authenticate("alice", "bad", source=f"10.1.0.{i}")
+    # Rotating source addresses does not reset the per-user count
+    assert not um.authenticate("alice", "secret", source="10.1.1.1")
+    um._account_failures.reset("alice")
+    assert um.authenticate("alice", "secret", source="10.1.1.1")
@@ -0,0 +1,274 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from loop.kernel import dom as dom_module
+from loop.kernel.dom import SECTIONS, SystemDOM
+from loop.kernel.filesystem import FileSystem
+
+
+@pytest.fixture
+def sys_handler():
+    handler = MagicMock()
+    handler.fs = FileSystem()
+    handler.sys_proc_list.return_value = [{"pid": 1, "name": "init"}]
+    handler.user_manager.list_users.return_value = ["root", "guest"]
+    handler.sys_docker_ps.return_value = {"success": True, "data": []}
+    handler.sys_k8s_get_pods.return_value = {"success": False}
+    return handler
+
+
+def test_state_keeps_shape(sys_handler):
+    state = SystemDOM(sys_handler).get_state()
+    assert list(state) == list(SECTIONS)
+    assert state["filesystem"]["children"]["home"]["children"]["guest"]["owner"] == "guest"
+    assert state["users"] == ["root", "guest"]
+    assert state["k8s_pods"] == []
+
+
+def test_delta_reports_only_changed_sections(sys_handler):
+    dom = SystemDOM(sys_handler)
+    first = dom.get_delta(0)
+    assert set(first["changed"]) == set(SECTIONS)
+    assert first["unchanged"] == []
+
+    assert dom.get_delta(first["version"]) == {"version": first["version"], "changed": {}, "unchanged": list(SECTIONS)}
+
+    sys_handler.user_manager.list_users.return_value = ["root", "guest", "alice"]
+    delta = dom.get_delta(first["version"])
+    assert list(delta["changed"]) == ["users"]
+    assert delta["version"] == first["version"] + 1
+    assert dom.section_versions()["users"] == delta["version"]
+
+
+def test_filesystem_subtrees_are_reused(sys_handler):
+    fs = sys_handler.fs
+    dom = SystemDOM(sys_handler)
+    before = dom.get_state()["filesystem"]
+
+    fs.write_file("/home/guest/notes.txt", "hi")
+    fs.write_file("/home/guest/notes.txt", "contents only")  # Not a structural change
+    after = dom.get_state()["filesystem"]
+
+    assert after is not before
+    assert "notes.txt" in after["children"]["home"]["children"]["guest"]["children"]
+    # Untouched directories are the very same cached objects
+    assert after["children"]["usr"] is before["children"]["usr"]
+    assert after["children"]["var"] is before["children"]["var"]
+
+    version = dom.version
+    assert dom.get_state()["filesystem"] is after
+    assert dom.version == version
+
+    fs.chmod("/usr", mode="r")
+    assert dom.get_state()["filesystem"]["children"]["usr"]["permissions"] == "r"
+    fs.delete_file("/home/guest/notes.txt")
+    assert "notes.txt" not in dom.get_state()["filesystem"]["children"]["home"]["children"]["guest"]["children"]
+
+
+def test_host_tree_tracks_changes(sys_handler, tmp_path, monkeypatch):
+    del sys_handler.fs
+    monkeypatch.setattr(dom_module.rootfs, "get_resolved_root", lambda: tmp_path)
+    (tmp_path / "home" / "guest").mkdir(parents=True)
+    (tmp_path / "etc").mkdir()
+    (tmp_path / "etc" / "users.json").write_text("{}")
+
+    dom = SystemDOM(sys_handler)
+    before = dom.get_state()["filesystem"]
+    assert before["children"]["etc"]["children"] == {"users.json": {"type": "file"}}
+
+    (tmp_path / "home" / "guest" / "a.txt").write_text("x")
+    after = dom.get_state()["filesystem"]
+    assert after["children"]["home"]["children"]["guest"]["children"] == {"a.txt": {"type": "file"}}
+    assert after["children"]["etc"] is before["children"]["etc"]
+
+    version = dom.version
+    dom.get_state()
+    assert dom.version == version
+
+
+def test_agent_keeps_snapshot_and_adds_changed_sections(sys_handler):
+    import sys
+    sys.modules["pyautogui"] = MagicMock()
+    sys.modules["pynput"] = MagicMock()
+    sys.modules["pynput.keyboard"] = MagicMock()
+    from loop.kernel.agent import ReActAgent
+
+    assert ReActAgent(sys_handler).state_deltas is False
+
+    agent = ReActAgent(sys_handler, state_deltas=True)
+    first = agent._observe()
+    assert set(first) == set(SECTIONS)
+
+    sys_handler.sys_proc_list.return_value = [{"pid": 1, "name": "init"}, {"pid": 2, "name": "shell"}]
+    second = agent._observe()
+    assert list(second)[:len(SECTIONS)] == list(SECTIONS)
+    assert second["processes"] == first["processes"]
+    assert second["processes (current)"][1]["name"] == "shell"
+    assert "filesystem (current)" not in second
+
+    # Each turn is a standalone prompt: the workspace must still be in it
+    prompt = agent._construct_prompt("task", second)
+    assert "[filesystem]" in prompt and "guest/" in prompt
+    assert prompt.index("[filesystem]") < prompt.index("[processes (current)]")
+
+    third = agent._observe()
+    assert "processes (current)" in third  # Changes are relative to the snapshot
+
+
+@pytest.fixture
+def big_fs(sys_handler):
+    fs = sys_handler.fs
+    for i in range(40):
+        fs.mkdir(f"/home/guest/project{i}")
+        fs.mkdir(f"/home/guest/project{i}/src")
+        for j in range(25):
+            fs.write_file(f"/home/guest/project{i}/src/module{j}.py", "x")
+    return fs
+
+
+def test_lazy_view_respects_depth(sys_handler, big_fs):
+    dom = SystemDOM(sys_handler, fs_depth=2)
+    view = dom.get_state()["filesystem"]
+    home = view["children"]["home"]
+    assert "children" in home
+    # Third level is collapsed into counts
+    assert home["children"]["guest"]["type"] == "directory"
+    assert "children" not in home["children"]["guest"]
+    assert home["children"]["guest"]["dirs"] == 40
+    assert home["children"]["guest"]["files"] == 0
+
+
+@pytest.mark.parametrize("budget", [200, 800, 3000])
+def test_lazy_view_stays_within_token_budget(sys_handler, big_fs, budget):
+    dom = SystemDOM(sys_handler, fs_depth=10, fs_token_budget=budget)
+    view = dom.get_state()["filesystem"]
+    assert len(json.dumps(view)) // 4 <= budget
+    guest = view["children"]["home"]["children"]["guest"]
+    # Cut listings report what was left out
+    assert "more" in guest or "dirs" in guest or len(guest["children"]) == 40
+
+
+def test_touched_paths_are_expanded_first(sys_handler, big_fs):
+    dom = SystemDOM(sys_handler, fs_depth=2, fs_token_budget=600)
+    dom.touch("/home/guest/project33/src/module7.py")
+    view = dom.get_state()["filesystem"]
+    src = view["children"]["home"]["children"]["guest"]["children"]["project33"]["children"]["src"]
+    assert "module7.py" in src["children"]
+    assert list(src["children"])[0] == "module7.py"
+    assert len(json.dumps(view)) // 4 <= 600
+
+
+def test_agent_touches_paths_of_actions(sys_handler):
+    import sys
+    sys.modules["pyautogui"] = MagicMock()
+    sys.modules["pynput"] = MagicMock()
+    sys.modules["pynput.keyboard"] = MagicMock()
+    from loop.kernel.agent import ReActAgent
+
+    agent = ReActAgent(sys_handler)
+    agent.sandbox = MagicMock()
+    agent._execute_action("read_file", ["home/guest/./notes.txt"])
+    assert list(agent.dom._focus) == ["/home/guest/notes.txt"]
+
+
+def test_providers_run_concurrently(sys_handler):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def collect():
+        barrier.wait()  # Deadlocks unless both run at once
+        return {"success": True, "data": [{"id": "c1"}]}
+
+    sys_handler.sys_docker_ps.side_effect = collect
+    sys_handler.sys_k8s_get_pods.side_effect = collect
+    dom = SystemDOM(sys_handler, timeouts={"docker": 5, "k8s_pods": 5})
+    state = dom.get_state()
+    assert state["docker"] == state["k8s_pods"] == [{"id": "c1"}]
+    assert "stale" not in state
+    dom.close()
+
+
+def test_slow_provider_serves_stale_snapshot(sys_handler):
+    release = threading.Event()
+    calls = []
+
+    def pods():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return {"success": True, "data": [f"pod-{len(calls)}"]}
+
+    sys_handler.sys_k8s_get_pods.side_effect = pods
+    dom = SystemDOM(sys_handler, timeouts={"k8s_pods": 0.05})
+    assert dom.get_state()["k8s_pods"] == ["pod-1"]
+
+    start = time.monotonic()
+    delta = dom.get_delta(dom.version)
+    assert time.monotonic() - start < 1
+    assert delta["stale"] == ["k8s_pods"]
+    assert "k8s_pods" in delta["unchanged"]
+
+    dom.get_state()
+    assert len(calls) == 2  # No second call while one is in flight
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while not dom._providers["k8s_pods"].future.done() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The late result is picked up (or a newer one, if the next call is quick enough)
+    assert dom.get_state()["k8s_pods"] in (["pod-2"], ["pod-3"])
+    dom.close()
+
+
+def test_failing_provider_keeps_last_snapshot(sys_handler):
+    dom = SystemDOM(sys_handler)
+    assert dom.get_state()["processes"] == [{"pid": 1, "name": "init"}]
+
+    sys_handler.sys_proc_list.side_effect = RuntimeError("proc unavailable")
+    state = dom.get_state()
+    assert state["processes"] == [{"pid": 1, "name": "init"}]
+    assert state["stale"] == ["processes"]
+    dom.close()
+
+
+def test_plugin_provider_adds_section(sys_handler):
+    dom = SystemDOM(sys_handler)
+    dom.register_provider("gpus", lambda: [{"id": 0, "util": 0.5}])
+    assert dom.sections == list(SECTIONS) + ["gpus"]
+    assert dom.get_delta(0)["changed"]["gpus"] == [{"id": 0, "util": 0.5}]
+
+    dom.unregister_provider("gpus")
+    assert "gpus" not in dom.get_state()
+    dom.close()
+
+
+def test_providers_run_as_the_caller():
+    from loop.kernel.syscall import SyscallHandler
+    from loop.kernel.users import UserManager
+
+    um = MagicMock(spec=UserManager)
+    um.has_permission.side_effect = lambda user, perm: user == "ops"
+    um.list_users.return_value = ["root", "guest", "ops"]
+    handler = SyscallHandler(scheduler=None, user_manager=um, network_manager=MagicMock())
+    handler.docker_interface = MagicMock()
+    handler.docker_interface.list_containers.return_value = {"success": True, "data": [{"id": "c1"}]}
+    handler.k8s_interface = MagicMock()
+
+    dom = SystemDOM(handler, timeouts={"docker": 5})
+    with handler.acting_as("guest"):
+        assert dom.get_state()["docker"] == []
+    handler.docker_interface.list_containers.assert_not_called()
+
+    with handler.acting_as("ops"):
+        assert dom.get_state()["docker"] == [{"id": "c1"}]
+    # A slow provider does not serve the previous user's snapshot
+    um.has_permission.side_effect = lambda user, perm: user == "ops" or time.sleep(0.5)
+    dom._providers["docker"].timeout = 0.05
+    with handler.acting_as("guest"):
+        state = dom.get_state()
+    assert state["docker"] == []
+    assert "docker" in state["stale"]
+    dom.close()
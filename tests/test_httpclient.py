@@ -0,0 +1,103 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from loop.kernel.httpclient import HttpClient
+from loop.kernel.netpolicy import DENY
+from loop.kernel.network import NetworkGuard, NetworkManager
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        server = self.server
+        server.connections.add(self.client_address)
+        server.hits += 1
+        status = server.statuses.pop(0) if server.statuses else 200
+        body = b"ok"
+        server.cookies.append(self.headers.get("Cookie"))
+        self.send_response(status)
+        self.send_header("Set-Cookie", "session=secret; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.connections, srv.hits, srv.statuses, srv.cookies = set(), 0, [], []
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv, f"http://127.0.0.1:{srv.server_address[1]}/"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_connections_are_reused(server):
+    srv, url = server
+    client = HttpClient()
+    for _ in range(5):
+        assert client.get(url).text == "ok"
+    assert len(srv.connections) == 1
+    client.close()
+
+
+def test_cookies_are_not_shared_between_requests(server):
+    srv, url = server
+    client = HttpClient()
+    client.get(url)
+    client.get(url)
+    client.get(url, cookies={"mine": "1"})
+    assert srv.cookies == [None, None, "mine=1"]
+    assert len(client.session.cookies) == 0
+    client.close()
+
+
+def test_idempotent_requests_are_retried(server):
+    srv, url = server
+    client = HttpClient(backoff=0.01)
+    srv.statuses = [503, 502]
+    assert client.get(url).status_code == 200
+    assert srv.hits == 3
+
+    srv.statuses = [503]
+    assert client.post(url).status_code == 503  # Not retried
+    assert srv.hits == 4
+
+
+def test_circuit_breaker_opens(server):
+    srv, url = server
+    client = HttpClient(retries=0)
+    srv.statuses = [503] * 5
+    for _ in range(5):
+        assert client.get(url).status_code == 503
+    with pytest.raises(RuntimeError):
+        client.get(url)
+    assert srv.hits == 5
+
+
+def test_guard_is_checked_per_request(server, tmp_path, monkeypatch):
+    srv, url = server
+    monkeypatch.setattr(NetworkManager, "ENV_FILE", str(tmp_path / ".env"))
+    manager = NetworkManager(MagicMock())
+    guard = NetworkGuard(manager)
+    guard.enable(enforce_state=False)
+    try:
+        client = HttpClient(guard=guard)
+        assert client.get(url).status_code == 200
+        # The pooled connection is not reconnected, but the policy still applies
+        manager.policy.add_rule(DENY, cidrs=["127.0.0.0/8"])
+        with pytest.raises(OSError):
+            client.get(url)
+        assert srv.hits == 1
+    finally:
+        guard.disable()
@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock
+
+from loop.kernel.ipc import Channel
+from loop.kernel.process import Process, ProcessState
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.syscall import SyscallHandler
+
+
+def test_channel_fifo_and_bound():
+    chan = Channel(capacity=3)
+    assert all(chan.send(i) for i in range(3))
+    assert chan.full()
+    assert not chan.send(99)
+    assert chan.recv() == 0
+    assert chan.recv_many() == [1, 2]
+    assert chan.recv() is None
+    assert not chan
+
+
+def test_recv_many_limits_batch():
+    chan = Channel(capacity=None)
+    for i in range(10):
+        chan.send(i)
+    assert chan.recv_many(4) == [0, 1, 2, 3]
+    assert len(chan) == 6
+
+
+def test_send_buffer_is_zero_copy():
+    data = bytearray(b"hello world")
+    chan = Channel()
+    chan.send_buffer(data)
+    view = chan.recv()
+    assert isinstance(view, memoryview)
+    assert view.readonly
+    data[0:5] = b"HELLO"
+    assert bytes(view[:5]) == b"HELLO"  # shares the sender's memory
+
+
+def test_on_space_fires_once_when_full_channel_drains():
+    chan = Channel(capacity=1)
+    chan.send("a")
+    calls = []
+    chan.on_space = lambda: calls.append(1)
+    chan.recv()
+    chan.send("b")
+    chan.recv()
+    assert calls == [1]
+
+
+def test_blocking_send_parks_until_receiver_drains():
+    scheduler = Scheduler()
+    sys = SyscallHandler(scheduler, MagicMock(), MagicMock())
+    log = []
+
+    def receiver():
+        yield  # let the producer fill the inbox first
+        while len(log) < 5:
+            log.extend(sys.sys_recv_many(block=True))
+            yield
+
+    def sender(dest):
+        sent = 0
+        while sent < 5:
+            if sys.sys_send(dest, sent, block=True):
+                sent += 1
+            else:
+                yield
+
+    recv_proc = Process("receiver", receiver())
+    recv_proc.inbox = Channel(capacity=2)
+    scheduler.add(recv_proc)
+    send_proc = Process("sender", sender(recv_proc.pid))
+    scheduler.add(send_proc)
+
+    scheduler.run(max_steps=1)
+    assert send_proc.state == ProcessState.WAITING
+    assert len(recv_proc.inbox) == 2
+
+    scheduler.run(max_steps=20)
+    assert log == [0, 1, 2, 3, 4]
@@ -0,0 +1,172 @@
+import sqlite3
+import time
+
+import pytest
+
+from loop.kernel.llm import LLMProvider
+from loop.kernel.llm_cache import LLMCache, cache_key, normalize_prompt
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMCache(path=tmp_path / "llm.sqlite", enabled=True, disabled_providers=())
+    yield cache
+    cache.close()
+
+
+def test_normalization_ignores_whitespace_only_changes():
+    a = "TASK: list files  \n\n\n\nSTATE: {}\r\n"
+    b = "TASK: list files\n\nSTATE: {}"
+    assert normalize_prompt(a) == normalize_prompt(b)
+    assert cache_key("openai", "gpt-4o", a) == cache_key("openai", "gpt-4o", b)
+    assert cache_key("openai", "gpt-4o", a) != cache_key("openai", "gpt-4o-mini", a)
+    assert cache_key("openai", "gpt-4o", a) != cache_key("openai", "gpt-4o", a, stop=["\n"])
+
+
+def test_normalization_keeps_indentation():
+    a = "Fix this:\nif ok:\n    run()\ndone()"
+    b = "Fix this:\nif ok:\n    run()\n    done()"
+    assert cache_key("openai", "gpt-4o", a) != cache_key("openai", "gpt-4o", b)
+    assert normalize_prompt("x =  1") != normalize_prompt("x = 1")
+
+
+def test_hit_miss_and_persistence(cache, tmp_path):
+    assert cache.get("openai", "m", "prompt") is None
+    cache.put("openai", "m", "prompt", "response")
+    assert cache.get("openai", "m", "prompt \r\n") == "response"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    cache.close()
+    reopened = LLMCache(path=tmp_path / "llm.sqlite", enabled=True, disabled_providers=())
+    assert reopened.get("openai", "m", "prompt") == "response"
+    assert reopened.stats()["entries"] == 1
+    reopened.close()
+
+
+def test_accepts_str_path(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "sub" / "llm.sqlite"), enabled=True, disabled_providers=())
+    cache.put("openai", "m", "p", "r")
+    assert cache.get("openai", "m", "p") == "r"
+    assert (tmp_path / "sub" / "llm.sqlite").exists()
+    cache.close()
+
+
+def test_ttl_expiry(tmp_path):
+    cache = LLMCache(path=tmp_path / "llm.sqlite", ttl=0.05, enabled=True, disabled_providers=())
+    cache.put("openai", "m", "p", "r")
+    assert cache.get("openai", "m", "p") == "r"
+    time.sleep(0.1)
+    assert cache.get("openai", "m", "p") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_lru_eviction_by_entries_and_size(tmp_path):
+    cache = LLMCache(path=tmp_path / "llm.sqlite", max_entries=10, max_bytes=1000,
+                     enabled=True, disabled_providers=())
+    for i in range(10):
+        cache.put("openai", "m", f"p{i}", "x")
+        time.sleep(0.001)
+    assert cache.get("openai", "m", "p0") == "x"  # Now the most recently used
+    cache.put("openai", "m", "p10", "x")
+    stats = cache.stats()
+    assert stats["entries"] <= 9
+    assert cache.get("openai", "m", "p0") == "x"
+    assert cache.get("openai", "m", "p1") is None
+
+    cache.put("openai", "m", "big", "y" * 950)
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.get("openai", "m", "big") == "y" * 950
+    cache.close()
+
+
+def test_provider_opt_out(tmp_path):
+    cache = LLMCache(path=tmp_path / "llm.sqlite", enabled=True, disabled_providers=["anthropic"])
+    cache.put("anthropic", "m", "p", "r")
+    assert cache.get("anthropic", "m", "p") is None
+    assert cache.stats()["misses"] == 0
+    cache.close()
+
+
+def test_provider_uses_cache(cache, monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    llm = LLMProvider(cache=cache)
+    calls = []
+    monkeypatch.setattr(llm, "_generate", lambda prompt, stop=None: calls.append(prompt) or "answer")
+
+    assert llm.generate("hello") == "answer"
+    assert llm.last_cache_hit is False
+    assert llm.generate("hello  ") == "answer"
+    assert llm.last_cache_hit is True
+    assert calls == ["hello"]
+
+    # Streaming reads and fills the same cache
+    assert "".join(llm.generate_stream("hello")) == "answer"
+    assert llm.last_cache_hit is True
+    first = "".join(llm.generate_stream("test_file.txt please"))
+    assert llm.last_cache_hit is False
+    assert llm.generate("test_file.txt please") == first
+
+
+def _fail(*args, **kwargs):
+    raise ConnectionError("reset")
+
+
+def test_errors_are_not_cached(cache, monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    llm = LLMProvider(cache=cache)
+    monkeypatch.setattr(llm, "_generate", _fail)
+    assert llm.generate("hello") == "LLM Error (mock): reset"
+    assert llm.last_error == "LLM Error (mock): reset"
+    assert cache.get("mock", llm.model, "hello") is None
+
+    monkeypatch.setattr(llm, "_generate_with_tools", _fail)
+    assert llm.generate_with_tools("system", "hello", [])["text"] == "LLM Error (mock): reset"
+    assert cache.stats()["entries"] == 0
+
+
+def test_stream_failing_midway_is_not_cached(cache, monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    llm = LLMProvider(cache=cache)
+
+    def partial(prompt, stop=None):
+        yield '{"thought": "partial'
+        raise ConnectionError("reset")
+
+    monkeypatch.setattr(llm, "_generate_stream", partial)
+    assert list(llm.generate_stream("hello")) == ['{"thought": "partial', "LLM Error (mock): reset"]
+    assert llm.last_error == "LLM Error (mock): reset"
+    assert cache.stats()["entries"] == 0
+
+    monkeypatch.undo()
+    "".join(llm.generate_stream("hello"))
+    assert llm.last_error is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_database_errors_never_fail_a_generation(cache, monkeypatch, capsys):
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "_db", locked)
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    llm = LLMProvider(cache=cache)
+    monkeypatch.setattr(llm, "_generate", lambda prompt, stop=None: "answer")
+    monkeypatch.setattr(llm, "_generate_stream", lambda prompt, stop=None: iter(["ans", "wer"]))
+
+    assert llm.generate("hello") == "answer"
+    assert llm.last_cache_hit is False
+    assert "".join(llm.generate_stream("hello")) == "answer"
+    assert llm.last_error is None
+    monkeypatch.setattr(llm, "_generate_with_tools", lambda system, prompt, tools: {"text": "answer", "tool_calls": []})
+    assert llm.generate_with_tools("system", "hello", [])["text"] == "answer"
+
+    assert capsys.readouterr().out.count("database is locked") == 1
+
+
+def test_unwritable_cache_path_is_a_miss(tmp_path):
+    (tmp_path / "file").write_text("")
+    cache = LLMCache(path=tmp_path / "file" / "llm.sqlite", enabled=True, disabled_providers=())
+    cache.put("mock", "m", "hello", "answer")
+    assert cache.get("mock", "m", "hello") is None
@@ -0,0 +1,187 @@
+import asyncio
+import socket
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from loop.kernel.netpolicy import ALLOW, DENY, NetworkPolicy, TokenBucket
+from loop.kernel.network import NetworkGuard, NetworkManager
+
+
+def test_host_suffix_and_cidr_matching():
+    policy = NetworkPolicy(default=DENY)
+    llm = policy.add_rule(ALLOW, hosts=["api.anthropic.com"], ports=[443], unmetered=True)
+    corp = policy.add_rule(ALLOW, hosts=["corp.example"])
+    policy.add_rule(DENY, hosts=["secret.corp.example"])
+    lan = policy.add_rule(ALLOW, cidrs=["10.0.0.0/8"])
+    policy.add_rule(DENY, cidrs=["10.1.0.0/16"])
+
+    assert policy.match(host="api.anthropic.com", port=443) is llm
+    assert policy.match(host="api.anthropic.com", port=80) is None
+    assert policy.match(host="git.corp.example") is corp
+    assert policy.match(host="x.secret.corp.example").action == DENY  # Longest suffix wins
+    assert policy.match(host="notcorp.example") is None
+    assert policy.match(ip="10.2.3.4") is lan
+    assert policy.match(ip="10.1.3.4").action == DENY  # Longest prefix wins
+    assert not policy.check(ip="192.168.1.1").allowed  # Default
+    assert policy.check(host="api.anthropic.com", port=443).allowed
+
+
+def test_user_scoped_rules_and_ipv6():
+    policy = NetworkPolicy()
+    policy.add_rule(DENY, cidrs=["2001:db8::/32"], users=["guest"])
+    assert not policy.check(ip="2001:db8::1", user="guest").allowed
+    assert policy.check(ip="2001:db8::1", user="alice").allowed
+    assert policy.check(ip="127.0.0.1", user="guest").allowed
+
+
+def test_limits_and_unmetered_rules():
+    policy = NetworkPolicy()
+    policy.add_rule(ALLOW, hosts=["llm.local"], unmetered=True)
+    policy.add_rule(ALLOW, hosts=["slow.local"], rate=100)
+    policy.limit_user("agent", 1000)
+    policy.limit_process(7, 500)
+
+    assert policy.check(host="llm.local", user="agent", pid=7).buckets == ()
+    assert len(policy.check(host="other", user="agent", pid=7).buckets) == 2
+    assert len(policy.check(host="slow.local", user="agent", pid=7).buckets) == 3
+    # Rule buckets are per user
+    a = policy.check(host="slow.local", user="a").buckets
+    b = policy.check(host="slow.local", user="b").buckets
+    assert a[0] is not b[0]
+
+    policy.limit_user("agent", None)
+    assert len(policy.check(host="other", user="agent", pid=7).buckets) == 1
+
+
+def test_token_bucket_debt():
+    bucket = TokenBucket(rate=1000, burst=1000)
+    assert bucket.consume(1000) == 0.0
+    assert bucket.consume(500) == pytest.approx(0.5, abs=0.05)
+
+
+@pytest.fixture
+def guard(tmp_path, monkeypatch):
+    monkeypatch.setattr(NetworkManager, "ENV_FILE", str(tmp_path / ".env"))
+    manager = NetworkManager(MagicMock())
+    identity = {"value": ("alice", 42)}
+    guard = NetworkGuard(manager, identify=lambda: identity["value"])
+    guard.enable(enforce_state=False)
+    guard.identity = identity
+    yield guard
+    guard.disable()
+
+
+@pytest.fixture
+def server():
+    srv = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def serve():
+        try:
+            conn, _ = srv.accept()
+        except OSError:
+            return  # Closed before a client connected
+        with conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                received.append(len(data))
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield srv.getsockname()[1], received
+    thread.join(timeout=1)
+    srv.close()
+
+
+def test_guard_enforces_policy_on_connect(guard, server):
+    port, _ = server
+    policy = guard.manager.policy
+    policy.add_rule(DENY, cidrs=["127.0.0.0/8"], users=["guest"])
+
+    guard.identity["value"] = ("guest", 1)
+    with pytest.raises(PermissionError):
+        socket.create_connection(("127.0.0.1", port))
+
+    guard.identity["value"] = ("alice", 2)
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        assert isinstance(sock, socket.socket)
+        sock.sendall(b"ping")
+
+
+def test_guard_resolves_host_rules(guard, server):
+    port, _ = server
+    guard.manager.policy.add_rule(DENY, hosts=["localhost"])
+    with pytest.raises(PermissionError):
+        socket.create_connection(("localhost", port))
+
+
+def test_guard_meters_bandwidth(guard, server):
+    port, received = server
+    guard.manager.policy.limit_user("alice", 1_000_000)
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        bucket = sock._meter[0]
+        sock.sendall(b"x" * 4096)
+        assert bucket.tokens == pytest.approx(1_000_000 - 4096, abs=1000)
+
+
+def test_guard_patches_sockets_only_while_policy_has_rules(guard):
+    original = guard._original_socket
+    assert guard.armed and not guard.active
+    assert socket.socket is original
+
+    policy = guard.manager.policy
+    policy.limit_user("alice", 1000)
+    assert guard.active and socket.socket is not original
+    policy.clear()
+    assert not guard.active and socket.socket is original
+
+
+def test_host_rules_see_names_resolved_on_any_thread(guard, monkeypatch):
+    def fake_getaddrinfo(host, port, *args, **kwargs):
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("203.0.113.7", port))]
+
+    real_getaddrinfo = guard._original_getaddrinfo
+    guard._original_getaddrinfo = fake_getaddrinfo  # Both names share one address
+    try:
+        guard.manager.policy.add_rule(DENY, hosts=["denied.test"])
+
+        # Resolved on another thread, connected on this one
+        other = threading.Thread(target=socket.getaddrinfo, args=("denied.test", 443))
+        other.start()
+        other.join()
+        with pytest.raises(PermissionError):
+            guard.admit(("203.0.113.7", 443))
+
+        # Resolving an allowed name on the same address does not unlock it
+        socket.getaddrinfo("allowed.test", 443)
+        with pytest.raises(PermissionError):
+            guard.admit(("203.0.113.7", 443))
+
+        # Until the denied name expires
+        now = time.monotonic()
+        monkeypatch.setattr("loop.kernel.network.time.monotonic", lambda: now + guard.RESOLVED_TTL / 2)
+        socket.getaddrinfo("allowed.test", 443)
+        monkeypatch.setattr("loop.kernel.network.time.monotonic", lambda: now + guard.RESOLVED_TTL + 1)
+        assert guard.admit(("203.0.113.7", 443)) == ()
+        assert guard._resolved_names("203.0.113.7") == ["allowed.test"]
+    finally:
+        guard._original_getaddrinfo = real_getaddrinfo  # Restored by disable()
+        guard.disable()
+
+
+def test_guard_applies_host_rules_to_asyncio_connections(guard, server):
+    port, _ = server
+    guard.manager.policy.add_rule(DENY, hosts=["localhost"])
+
+    async def connect():
+        # asyncio resolves on an executor thread and connects on the loop thread
+        reader, writer = await asyncio.open_connection("localhost", port, family=socket.AF_INET)
+        writer.close()
+
+    with pytest.raises(PermissionError, match="denied by network policy"):
+        asyncio.run(connect())
@@ -0,0 +1,63 @@
+import socket
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from loop.kernel.network import NetworkGuard, NetworkManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(NetworkManager, "ENV_FILE", str(tmp_path / ".env"))
+    monkeypatch.delenv(NetworkManager.ENV_KEY, raising=False)
+    return NetworkManager(MagicMock())
+
+
+def write_state(state):
+    with open(NetworkManager.ENV_FILE, "w") as f:
+        f.write(f"OTHER=1\n{NetworkManager.ENV_KEY}={state}\n")
+
+
+def test_state_is_cached(manager):
+    write_state("on")
+    manager.refresh()
+    with patch("builtins.open", side_effect=AssertionError("file read")):
+        for _ in range(1000):
+            assert manager.is_enabled()
+
+
+def test_external_change_is_picked_up(manager, monkeypatch):
+    monkeypatch.setattr(NetworkManager, "STAT_INTERVAL", 0)
+    manager = NetworkManager(MagicMock())
+    write_state("on")
+    assert manager.is_enabled()
+    write_state("off!")  # Size changes with the content, so the stamp differs
+    assert not manager.is_enabled()
+
+
+def test_set_enabled_persists(manager):
+    manager.set_enabled(True)
+    assert NetworkManager(MagicMock()).is_enabled()
+    with open(NetworkManager.ENV_FILE) as f:
+        assert "OTHER" not in f.read()
+
+
+def test_guard_uses_watcher(manager):
+    write_state("off")
+    manager.refresh()
+    guard = NetworkGuard(manager)
+    manager.STAT_INTERVAL = 0.01
+    guard.enable()
+    try:
+        with pytest.raises(OSError):
+            socket.getaddrinfo("localhost", 80)
+        write_state("on")
+        deadline = time.monotonic() + 2.0
+        while not manager.enabled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager.enabled
+        socket.getaddrinfo("localhost", 80)
+    finally:
+        guard.disable()
+    assert manager._watcher is None
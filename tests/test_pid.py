@@ -0,0 +1,65 @@
+import gc
+from unittest.mock import MagicMock
+
+import pytest
+from loop.kernel.pid import PidAllocator
+from loop.kernel.process import Process
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.syscall import SyscallHandler
+
+
+def idle():
+    while True:
+        yield
+
+
+def test_allocator_is_monotonic_and_delays_reuse():
+    alloc = PidAllocator(pid_max=16, reserved=4)
+    pids = [alloc.allocate() for _ in range(5)]
+    assert pids == [1, 2, 3, 4, 5]
+
+    alloc.free(2)
+    # The freed PID is not reused before the allocator wraps
+    assert alloc.allocate() == 6
+
+
+def test_allocator_wraps_past_reserved_range():
+    alloc = PidAllocator(pid_max=8, reserved=3)
+    for _ in range(7):
+        alloc.allocate()
+    alloc.free(1)
+    alloc.free(5)
+    assert alloc.allocate() == 5  # PID 1 stays reserved after the wrap
+    with pytest.raises(RuntimeError):
+        alloc.allocate()
+
+
+def test_process_pids_are_unique_and_freed_on_collect():
+    procs = [Process(f"p{i}", idle()) for i in range(1000)]
+    assert len({p.pid for p in procs}) == 1000
+
+    from loop.kernel import pid as pid_module
+    last = procs[-1].pid
+    assert pid_module._allocator.in_use(last)
+    del procs
+    gc.collect()
+    assert not pid_module._allocator.in_use(last)
+
+
+def test_pid_index_for_kill_and_send():
+    scheduler = Scheduler()
+    procs = [Process(f"p{i}", idle()) for i in range(100)]
+    for p in procs:
+        scheduler.add(p)
+    target = procs[57]
+    assert scheduler.get_process(target.pid) is target
+
+    sys = SyscallHandler(scheduler, MagicMock(), MagicMock())
+    assert sys.sys_send(target.pid, "hello")
+    assert list(target.inbox) == ["hello"]
+    assert sys.sys_kill(target.pid, "SIGKILL")
+    assert target.signal == "SIGKILL"
+
+    scheduler.remove(target)
+    assert scheduler.get_process(target.pid) is None
+    assert not sys.sys_send(target.pid, "gone")
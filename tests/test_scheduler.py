@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import Mock, patch
 from loop.kernel.scheduler import Scheduler
 from loop.kernel.process import Process, ProcessState
+from loop.kernel.events import Wait, Sleep, ipc_event, exit_event
+from loop.kernel.timerwheel import TimerWheel
 
 # Helper generator for processes
 def dummy_process_target():
@@ -67,3 +69,251 @@ def test_scheduler_signals_kill(scheduler):
     scheduler.run(max_steps=1)
 
     assert p not in scheduler.processes
+
+def test_priority_order_within_tick(scheduler):
+    order = []
+    def recorder(tag):
+        while True:
+            order.append(tag)
+            yield
+
+    low = Process("low", recorder("low"), "root", nice=10)
+    normal = Process("normal", recorder("normal"), "root")
+    high = Process("high", recorder("high"), "root", nice=-5)
+    for p in (low, normal, high):
+        scheduler.add(p)
+
+    scheduler.run(max_steps=1)
+
+    # nice -5 gets a 2-step timeslice; lower priorities run after it
+    assert order == ["high", "high", "normal", "low"]
+
+def test_waiting_process_is_parked_until_woken(scheduler):
+    steps = 0
+    def sleeper():
+        nonlocal steps
+        while True:
+            steps += 1
+            yield
+
+    p = Process("sleeper", sleeper(), "root")
+    p.state = ProcessState.WAITING
+    scheduler.add(p)
+    other = Process("other", sleeper(), "root")
+    other.set_nice(19)
+    scheduler.add(other)
+
+    scheduler.run(max_steps=3)
+    assert steps == 3  # only "other" ran
+    assert p in scheduler.waiting
+
+    assert scheduler.wake(p)
+    scheduler.run(max_steps=1)
+    assert steps == 5
+    assert p.state == ProcessState.READY
+
+def test_remove_drops_queued_entry(scheduler):
+    ran = []
+    def target():
+        ran.append(1)
+        yield
+
+    p = Process("gone", target(), "root")
+    scheduler.add(p)
+    assert scheduler.remove(p)
+    assert p not in scheduler.processes
+    assert scheduler.remove(p) is False
+
+    scheduler.run(max_steps=1)
+    assert ran == []
+
+def test_process_table_indexing_tracks_changes(scheduler):
+    procs = [Process(f"p{i}", dummy_process_target(), "root") for i in range(3)]
+    for p in procs:
+        scheduler.add(p)
+    table = scheduler.processes
+    assert [table[i] for i in range(len(table))] == procs
+    assert table[0] is table[0]
+
+    scheduler.remove(procs[0])
+    assert table[0] is procs[1]
+    assert table[-1] is procs[2]
+
+    for p in table.snapshot():  # Safe to remove while iterating a snapshot
+        scheduler.remove(p)
+    assert len(table) == 0
+
+def test_wait_event_parks_until_notified(scheduler):
+    received = []
+    def consumer():
+        while True:
+            msg = p.receive()
+            if msg is None:
+                yield Wait(ipc_event(p.pid))
+                continue
+            received.append(msg)
+            yield
+
+    p = Process("consumer", consumer(), "root")
+    scheduler.add(p)
+    scheduler.run(max_steps=1)
+    assert p.state == ProcessState.WAITING
+    assert scheduler.waiters(ipc_event(p.pid)) == [p]
+    assert scheduler.runnable_count() == 0
+
+    p.send("hello")
+    assert scheduler.notify(ipc_event(p.pid)) == 1
+    assert scheduler.notify(ipc_event(p.pid)) == 0
+    scheduler.run(max_steps=1)
+    assert received == ["hello"]
+
+def test_blocking_recv_sees_message_sent_before_wait_registered(scheduler):
+    from loop.kernel.syscall import SyscallHandler
+    sys_ = SyscallHandler(scheduler, Mock(), Mock())
+    received = []
+    block = scheduler.block
+
+    def racing_block(proc, event):
+        proc.send("raced")  # Lands between the inbox check and the registration
+        block(proc, event)
+
+    def consumer():
+        received.append(sys_.sys_recv(block=True))
+        yield
+
+    p = Process("consumer", consumer(), "root")
+    scheduler.add(p)
+    with patch.object(scheduler, "block", side_effect=racing_block):
+        scheduler.run(max_steps=1)
+    assert received == ["raced"]
+    assert p not in scheduler.waiting
+    assert scheduler.waiters(ipc_event(p.pid)) == []
+
+def test_exit_event_wakes_waiter(scheduler):
+    def short():
+        yield
+
+    child = Process("child", short(), "root")
+    def parent_target():
+        yield Wait(exit_event(child.pid))
+        yield
+
+    parent = Process("parent", parent_target(), "root")
+    scheduler.add(parent)
+    scheduler.add(child)
+
+    scheduler.run(max_steps=1)
+    assert parent.state == ProcessState.WAITING
+    scheduler.run(max_steps=1)  # child finishes -> parent woken
+    assert child not in scheduler.processes
+    assert parent.state == ProcessState.READY
+    assert parent.wait_event is None
+
+def test_timer_wheel_expiry_and_cancel():
+    now = [0.0]
+    wheel = TimerWheel(resolution=0.01, clock=lambda: now[0])
+    short = wheel.schedule(0.05)
+    cancelled = wheel.schedule(0.05)
+    far = wheel.schedule(30)  # lands in an outer wheel and cascades in
+    assert wheel.cancel(cancelled)
+
+    now[0] = 0.04
+    assert wheel.advance() == []
+    now[0] = 0.07
+    assert wheel.advance() == [short]
+    assert 0 < wheel.next_delay() <= 30
+
+    now[0] = 29.9
+    assert wheel.advance() == []
+    now[0] = 30.1
+    assert wheel.advance() == [far]
+    assert wheel.next_delay() is None
+
+def test_sleep_parks_without_blocking_others(scheduler):
+    beats = []
+    def sleeper():
+        while True:
+            beats.append("sleeper")
+            yield Sleep(0.05)
+
+    def worker():
+        while True:
+            beats.append("worker")
+            yield
+
+    p = Process("sleeper", sleeper(), "root")
+    scheduler.add(p)
+    scheduler.add(Process("worker", worker(), "root"))
+
+    scheduler.run(max_steps=3)
+    assert beats.count("sleeper") == 1
+    assert beats.count("worker") == 3
+    assert p.state == ProcessState.WAITING
+    assert len(scheduler.timers) == 1
+
+    import time
+    time.sleep(0.08)
+    scheduler.run(max_steps=2)
+    assert beats.count("sleeper") == 2
+
+def test_idle_scheduler_waits_for_next_timer(scheduler):
+    def sleeper():
+        yield Sleep(0.05)
+        yield
+
+    p = Process("sleeper", sleeper(), "root")
+    scheduler.add(p)
+
+    import time
+    start = time.monotonic()
+    scheduler.run()  # returns once the process exits
+    elapsed = time.monotonic() - start
+    assert p.state == ProcessState.TERMINATED
+    assert 0.05 <= elapsed < 1.0
+
+def test_step_accounting_and_sched_stats(scheduler):
+    from unittest.mock import MagicMock
+    from loop.kernel.syscall import SyscallHandler
+
+    def busy():
+        while True:
+            sum(range(20000))
+            yield
+
+    def stalling():
+        import time
+        while True:
+            time.sleep(0.005)  # blocks the tick without using CPU
+            yield
+
+    hot = Process("hot", busy(), "root")
+    stall = Process("stall", stalling(), "root")
+    scheduler.add(hot)
+    scheduler.add(stall)
+    scheduler.run(max_steps=5)
+
+    assert hot.steps == 5 and stall.steps == 5
+    assert hot.cpu_time_ns > 0
+    # Wall time includes the sleep, CPU time does not
+    assert stall.run_time_ns >= 5 * 5_000_000
+    assert stall.cpu_time_ns < stall.run_time_ns / 2
+    assert stall.step_latency.percentile_ns(99) >= 4_000_000
+
+    sys = SyscallHandler(scheduler, MagicMock(), MagicMock())
+    stats = sys.sys_sched_stats(top=1, sort="max")
+    assert stats["ticks"] == 5
+    assert stats["tick_latency"]["count"] == 5
+    assert [p["name"] for p in stats["procs"]] == ["stall"]
+    assert stats["procs"][0]["steps"] == 5
+
+
+def test_latency_histogram_percentiles():
+    from loop.kernel.stats import LatencyHistogram
+    hist = LatencyHistogram()
+    for _ in range(99):
+        hist.record(1_500)       # 1.5us
+    hist.record(3_000_000)       # 3ms outlier
+    assert hist.count == 100
+    assert hist.percentile_ns(50) == 2_000
+    assert hist.percentile_ns(100) == 3_000_000
+    assert hist.max_ns == 3_000_000
@@ -0,0 +1,65 @@
+import sys
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+# Pre-patch libraries
+sys.modules["pyautogui"] = MagicMock()
+sys.modules["pynput"] = MagicMock()
+sys.modules["pynput.keyboard"] = MagicMock()
+
+from fastapi.testclient import TestClient
+
+from loop.kernel.syscall import SyscallHandler
+from loop.kernel.users import UserManager
+from loop.server import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    um = Mock(spec=UserManager)
+    um.check_session.side_effect = lambda token: {"guest-token": "guest", "root-token": "root"}.get(token)
+    um.has_permission.return_value = False
+    handler = SyscallHandler(scheduler=None, user_manager=um, network_manager=Mock())
+    handler.supervisor = Mock()
+    handler.launcher = Mock()
+    handler.plugin_installer = Mock()
+    monkeypatch.setattr(main, "kernel", Mock(sys=handler, user_manager=um))
+    return TestClient(main.app), handler
+
+
+def test_batch_denies_privileged_syscalls_to_non_admin(client, tmp_path):
+    client, handler = client
+    target = tmp_path / "host.txt"
+    target.write_text("keep")
+    calls = [
+        {"call": "sys_shutdown"},
+        {"call": "sys_reboot"},
+        {"call": "sys_host_proc_kill", "args": [1]},
+        {"call": "sys_host_app_launch", "args": ["calc"]},
+        {"call": "sys_app_launch", "args": ["calc"]},
+        {"call": "sys_plugin_install", "args": ["https://example.com/evil.git"]},
+        {"call": "sys_plugin_uninstall", "args": ["core"]},
+        {"call": "sys_write", "args": [str(target), "pwned"], "kwargs": {"resolve": False}},
+        {"call": "sys_write", "args": [str(target), "pwned", False]},
+        {"call": "sys_delete", "args": [str(target)], "kwargs": {"resolve": False}},
+        {"call": "sys_read", "args": [str(target)], "kwargs": {"resolve": False}},
+    ]
+
+    response = client.post("/syscall/batch", json={"calls": calls, "token": "guest-token"})
+    results = response.json()["results"]
+    assert all(r["error"].startswith("PermissionError") for r in results), results
+    assert target.read_text() == "keep"
+    handler.supervisor.kill_process.assert_not_called()
+    handler.launcher.launch.assert_not_called()
+    handler.plugin_installer.install_plugin.assert_not_called()
+    handler.plugin_installer.uninstall_plugin.assert_not_called()
+
+
+def test_batch_allows_privileged_syscalls_to_root(client):
+    client, handler = client
+    handler.plugin_installer.uninstall_plugin.return_value = True
+    response = client.post("/syscall/batch", json={
+        "calls": [{"call": "sys_plugin_uninstall", "args": ["demo"]}], "token": "root-token",
+    })
+    assert response.json()["results"] == [{"ok": True, "result": True}]
@@ -0,0 +1,101 @@
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Pre-patch libraries
+sys.modules["pyautogui"] = MagicMock()
+sys.modules["pynput"] = MagicMock()
+sys.modules["pynput.keyboard"] = MagicMock()
+
+from loop.kernel.agent import ReActAgent
+from loop.kernel.state_encoder import CompactEncoder, StateEncoder, encode_table, encode_tree, get_encoder
+
+STATE = {
+    "filesystem": {"type": "directory", "children": {
+        "home": {"type": "directory", "permissions": "rw", "owner": "root", "children": {
+            "notes.txt": {"type": "file", "permissions": "rw", "owner": "guest"},
+        }, "more": 3},
+        "usr": {"type": "directory", "permissions": "rw", "owner": "root", "files": 2, "dirs": 1},
+    }},
+    "processes": [{"pid": 1, "name": "init"}, {"pid": 2, "name": "a|b", "tags": ["x"]}],
+    "users": ["root", "guest"],
+    "k8s_pods": [],
+    "unchanged": "Same as in an earlier turn: docker",
+}
+
+
+def test_json_encoder_is_minified():
+    assert get_encoder("json").encode(STATE) == json.dumps(STATE, separators=(",", ":"))
+
+
+def test_tree_is_an_indented_path_list():
+    assert encode_tree(STATE["filesystem"]).split("\n") == [
+        "/",
+        " home/ rw root",
+        "  notes.txt rw guest",
+        "  ...3 more",
+        " usr/ rw root (2 files, 1 dirs)",
+    ]
+
+
+def test_tree_quotes_names_with_whitespace():
+    tree = {"type": "directory", "children": {
+        "my notes.txt": {"type": "file", "permissions": "rw", "owner": "guest"},
+        "Program Files": {"type": "directory", "files": 1, "dirs": 0},
+        '"quoted"': {"type": "file"},
+    }}
+    assert encode_tree(tree).split("\n") == [
+        "/",
+        ' "my notes.txt" rw guest',
+        ' "Program Files"/ (1 files, 0 dirs)',
+        ' "\\"quoted\\""',
+    ]
+
+
+def test_encoders_are_abstract():
+    with pytest.raises(TypeError):
+        StateEncoder()
+
+
+def test_table_has_one_header_row():
+    assert encode_table(STATE["processes"]).split("\n") == [
+        "pid|name|tags",
+        "1|init|",
+        '2|"a|b"|["x"]',
+    ]
+
+
+def test_compact_encoder_sections():
+    text = CompactEncoder().encode(STATE)
+    assert text.startswith("[filesystem]\n/\n")
+    assert "[processes]\npid|name|tags\n" in text
+    assert "users: root, guest" in text
+    assert "k8s_pods: none" in text
+    assert text.endswith("unchanged: Same as in an earlier turn: docker")
+    assert len(text) < len(str(STATE)) / 2
+
+
+def test_unknown_encoder():
+    with pytest.raises(ValueError):
+        get_encoder("yaml")
+
+
+def test_agent_prompt_uses_encoder(monkeypatch):
+    monkeypatch.delenv("LOOP_STATE_ENCODER", raising=False)
+    agent = ReActAgent(MagicMock())
+    assert agent.state_encoder.name == "compact"
+    assert "[processes]\npid|name|tags" in agent._construct_prompt("task", STATE)
+
+    class Upper(StateEncoder):
+        name = "upper"
+
+        def encode(self, state):
+            return "STATE " + ",".join(state).upper()
+
+    agent = ReActAgent(MagicMock(), state_encoder=Upper())
+    assert "STATE FILESYSTEM,PROCESSES" in agent._turn_prompt("task", STATE)
+
+    monkeypatch.setenv("LOOP_STATE_ENCODER", "repr")
+    assert str(STATE) in ReActAgent(MagicMock())._construct_prompt("task", STATE)
@@ -0,0 +1,161 @@
+import json
+import threading
+from unittest.mock import MagicMock
+
+from loop.kernel.stream_parser import StreamingActionParser
+
+
+def feed_chars(parser, text):
+    found = []
+    for ch in text:
+        found.extend(parser.feed(ch))
+    return found
+
+
+def test_detects_single_action_before_trailing_text():
+    text = '```json\n{"thought": "list {it}", "action": {"name": "list_dir", "args": ["/"]}, "todo": ["a"]}\n```'
+    parser = StreamingActionParser()
+    cut = text.index("]}") + 2
+    assert feed_chars(parser, text[:cut]) == [("list_dir", ["/"])]
+    assert not parser.complete
+    assert feed_chars(parser, text[cut:]) == []
+    assert parser.complete
+
+
+def test_detects_each_action_in_list():
+    response = {
+        "thought": 'quote \\" and brace }',
+        "actions": [
+            {"name": "read_file", "args": ["a.txt"]},
+            {"name": "write_file", "args": ["b.txt", "{\"nested\": [1, 2]}"]},
+            {"name": "done", "args": []},
+        ],
+    }
+    parser = StreamingActionParser()
+    assert feed_chars(parser, json.dumps(response)) == [
+        ("read_file", ["a.txt"]),
+        ("write_file", ["b.txt", "{\"nested\": [1, 2]}"]),
+        ("done", []),
+    ]
+
+
+def test_ignores_nested_action_keys():
+    text = json.dumps({"thought": "t", "meta": {"action": {"name": "nope", "args": []}}})
+    parser = StreamingActionParser()
+    assert parser.feed(text) == []
+    assert parser.complete
+
+
+def test_agent_dispatches_action_while_streaming():
+    import sys
+    sys.modules["pyautogui"] = MagicMock()
+    sys.modules["pynput"] = MagicMock()
+    sys.modules["pynput.keyboard"] = MagicMock()
+    from loop.kernel.agent import ReActAgent
+
+    io = MagicMock()
+    agent = ReActAgent(MagicMock(), stream=True, io=io)
+    agent.dom = MagicMock()
+    agent.dom.get_state.return_value = {}
+    agent.resource_monitor = MagicMock()
+    agent.resource_monitor.check_limits.return_value = None
+    agent.action_logger = MagicMock()
+    agent.sandbox = MagicMock()
+    started = threading.Event()
+    agent.sandbox.execute.side_effect = lambda name, args: started.set() or "listing"
+
+    def stream(prompt):
+        yield '{"thought": "look", "actions": [{"name": "list_dir", "args": ["/"]}'
+        # The action must already be running before the model finishes
+        assert started.wait(5)
+        yield ', {"name": "done", "args": []}]}'
+
+    agent.llm = MagicMock()
+    agent.llm.generate_stream.side_effect = stream
+
+    assert agent.run("look around") == "Task Completed"
+    agent.sandbox.execute.assert_called_once_with("list_dir", ["/"])
+    assert "Turn 1 Result: listing" in agent.history
+    assert io.stream.call_count == 2
+
+
+def _streaming_agent():
+    import sys
+    sys.modules["pyautogui"] = MagicMock()
+    sys.modules["pynput"] = MagicMock()
+    sys.modules["pynput.keyboard"] = MagicMock()
+    from loop.kernel.agent import ReActAgent
+
+    agent = ReActAgent(MagicMock(), stream=True)
+    agent.dom = MagicMock()
+    agent.dom.get_state.return_value = {}
+    agent.resource_monitor = MagicMock()
+    agent.resource_monitor.check_limits.return_value = None
+    agent.action_logger = MagicMock()
+    agent.sandbox = MagicMock()
+    agent.sandbox.execute.side_effect = lambda name, args: f"{name} ok"
+    agent.llm = MagicMock()
+    return agent
+
+
+def test_agent_retries_stream_that_fails_before_any_action(monkeypatch):
+    monkeypatch.setattr("loop.utils.error_recovery.time.sleep", lambda s: None)
+    agent = _streaming_agent()
+    attempts = []
+
+    def stream(prompt):
+        attempts.append(prompt)
+        if len(attempts) == 1:
+            agent.llm.last_error = "LLM Error (openai): reset"
+            yield '{"thought": "partial'
+            yield agent.llm.last_error
+            return
+        agent.llm.last_error = None
+        yield '{"thought": "t", "actions": [{"name": "list_dir", "args": ["/"]}, {"name": "done", "args": []}]}'
+
+    agent.llm.generate_stream.side_effect = stream
+    assert agent.run("look around") == "Task Completed"
+    assert len(attempts) == 2
+    assert "Turn 1 Result: list_dir ok" in agent.history  # Retried within the turn
+    agent.sandbox.execute.assert_called_once_with("list_dir", ["/"])
+
+
+def test_agent_keeps_dispatched_actions_when_stream_raises(monkeypatch):
+    monkeypatch.setattr("loop.utils.error_recovery.time.sleep", lambda s: None)
+    agent = _streaming_agent()
+    attempts = []
+
+    def stream(prompt):
+        attempts.append(prompt)
+        agent.llm.last_error = None
+        if len(attempts) == 1:
+            yield '{"thought": "t", "actions": [{"name": "list_dir", "args": ["/"]}, '
+            raise ConnectionError("reset")
+        yield '{"thought": "t", "actions": [{"name": "done", "args": []}]}'
+
+    agent.llm.generate_stream.side_effect = stream
+    assert agent.run("look around") == "Task Completed"
+    assert "Turn 1 Result: list_dir ok" in agent.history
+    assert len(attempts) == 2  # The second turn, not a retry of the first
+    agent.sandbox.execute.assert_called_once_with("list_dir", ["/"])
+
+
+def test_agent_reconciles_streamed_actions_by_content(monkeypatch):
+    agent = _streaming_agent()
+
+    class OutOfOrderParser:
+        # Reports only the second action, e.g. after skipping an entry it could not decode
+        def feed(self, chunk):
+            return [("read_file", ["a.txt"])]
+
+    monkeypatch.setattr("loop.kernel.agent.StreamingActionParser", OutOfOrderParser)
+    response = json.dumps({
+        "thought": "t",
+        "actions": [{"name": "list_dir", "args": ["/"]}, {"name": "read_file", "args": ["a.txt"]},
+                    {"name": "done", "args": []}],
+    })
+    agent.llm.generate_stream.side_effect = lambda prompt: iter([response])
+
+    assert agent.run("read") == "Task Completed"
+    calls = sorted(c.args for c in agent.sandbox.execute.call_args_list)
+    assert calls == [("list_dir", ["/"]), ("read_file", ["a.txt"])]
@@ -106,3 +106,97 @@ def test_sys_reboot(syscall_handler):
     res = syscall_handler.sys_reboot()
     assert res == "REBOOT"
     assert syscall_handler.scheduler.exit_reason == "REBOOT"
+
+
+def test_syscall_table_dispatch_by_number_and_name(syscall_handler):
+    from loop.kernel.syscall_table import SYSCALLS_BY_NAME
+    syscall_handler.sys_net_status = Mock(return_value="active")
+    nr = SYSCALLS_BY_NAME["sys_net_status"].nr
+    assert syscall_handler.syscall(nr) == "active"
+    assert syscall_handler.syscall("net_status") == "active"
+    assert syscall_handler.has_syscall("sys_ls")
+    assert not syscall_handler.has_syscall("sys_nope")
+    with pytest.raises(ValueError):
+        syscall_handler.syscall("sys_nope")
+
+
+def test_syscall_table_enforces_permissions(syscall_handler):
+    syscall_handler.scheduler.current_process.uid = "alice"
+    syscall_handler.user_manager.has_permission.return_value = False
+    with pytest.raises(PermissionError):
+        syscall_handler.syscall("sys_user_add", "bob", "pw")
+    with pytest.raises(PermissionError):
+        syscall_handler.syscall("sys_net_set_status", "off")
+
+
+def test_sys_batch_validates_credentials_once(syscall_handler):
+    um = syscall_handler.user_manager
+    um.has_permission.return_value = True
+    syscall_handler.network_manager.is_enabled.return_value = True
+    syscall_handler.sys_log = Mock(return_value=True)
+
+    results = syscall_handler.sys_batch(
+        [
+            {"call": "sys_net_set_status", "args": ["on"]},
+            ("sys_net_set_status", ["off"]),
+            ("sys_net_status", []),
+            {"call": "sys_unknown"},
+        ],
+        user="alice",
+        password="secret",
+    )
+
+    um.authenticate.assert_called_once_with("alice", "secret", None)
+    # Table check and handler check share one cached lookup
+    assert um.has_permission.call_count == 1
+    assert [r["ok"] for r in results] == [True, True, True, False]
+    assert results[2]["result"] == "active"
+    assert "unknown syscall" in results[3]["error"]
+    # Batch credentials do not leak past the batch
+    assert syscall_handler._get_current_uid() == "root"
+
+
+def test_sys_batch_rejects_bad_credentials(syscall_handler):
+    syscall_handler.user_manager.authenticate.return_value = False
+    results = syscall_handler.sys_batch([("sys_ls", ["/"])], user="alice", password="bad")
+    assert results == [{"ok": False, "error": "authentication failed"}]
+
+
+def test_sys_batch_session_token(syscall_handler):
+    um = syscall_handler.user_manager
+    um.check_session.side_effect = lambda token: "alice" if token == "good" else None
+    syscall_handler.network_manager.is_enabled.return_value = True
+
+    results = syscall_handler.sys_batch([("sys_net_status", [])], token="good")
+    assert results == [{"ok": True, "result": "active"}]
+    um.authenticate.assert_not_called()
+
+    results = syscall_handler.sys_batch([("sys_net_status", [])], token="stale")
+    assert results == [{"ok": False, "error": "authentication failed"}]
+
+
+def test_sys_batch_stop_on_error(syscall_handler):
+    results = syscall_handler.sys_batch([("sys_nope", []), ("sys_net_status", [])], stop_on_error=True)
+    assert [r["ok"] for r in results] == [False, False]
+    assert results[1]["error"] == "skipped"
+
+
+def test_sys_batch_anonymous_outside_process_is_denied():
+    um = Mock(spec=UserManager)
+    um.has_permission.return_value = False
+    handler = SyscallHandler(scheduler=None, user_manager=um, network_manager=Mock())
+
+    results = handler.sys_batch([
+        ("sys_user_add", ["mallory", "pw"]),      # ROOT
+        ("sys_net_set_status", ["off"]),          # RBAC
+    ])
+    assert results == [{"ok": False, "error": "authentication required"}] * 2
+    um.add_user.assert_not_called()
+    handler.network_manager.set_enabled.assert_not_called()
+
+
+def test_sys_batch_anonymous_runs_as_calling_process(syscall_handler):
+    syscall_handler.scheduler.current_process.uid = "guest"
+    syscall_handler.user_manager.has_permission.return_value = False
+    results = syscall_handler.sys_batch([("sys_user_add", ["mallory", "pw"])])
+    assert not results[0]["ok"] and "PermissionError" in results[0]["error"]
@@ -0,0 +1,141 @@
+import json
+import sys
+from unittest.mock import MagicMock
+
+# Pre-patch libraries
+sys.modules["pyautogui"] = MagicMock()
+sys.modules["pynput"] = MagicMock()
+sys.modules["pynput.keyboard"] = MagicMock()
+
+from loop.kernel.agent import ReActAgent
+from loop.kernel.tools import AGENT_TOOLS, REQUIRED, SANDBOX_TOOLS, Tool
+
+
+def test_tool_from_callable_schema_and_positional():
+    def deploy(name: str, replicas: int = 1, *flags, dry_run=False):
+        """Deploy something."""
+
+    tool = Tool.from_callable(deploy)
+    assert tool.name == "deploy"
+    assert tool.description == "Deploy something."
+    schema = tool.schema()
+    assert schema["properties"]["replicas"] == {"type": "integer"}
+    assert schema["properties"]["flags"]["type"] == "array"
+    assert "dry_run" not in schema["properties"]
+    assert schema["required"] == ["name"]
+
+    assert tool.positional({"name": "web"}) == ["web", 1]
+    assert tool.positional({"name": "web", "replicas": 3, "flags": ["-v", "-x"]}) == ["web", 3, "-v", "-x"]
+    assert tool.to_openai()["function"]["parameters"] == schema
+    assert tool.to_anthropic()["input_schema"] == schema
+
+
+def test_sandbox_tools_map_to_execute_arguments():
+    tools = {t.name: t for t in SANDBOX_TOOLS}
+    assert tools["run_process"].positional({"app_name": "calc", "args": ["1+1"]}) == ["calc", "1+1"]
+    assert tools["interact"].positional({"uid": "b1", "action": "click"}) == ["b1", "click", None]
+    assert tools["write_file"].positional({"content": "x"}) == []  # Missing path left to the sandbox
+    assert tools["read_screen"].params == []
+    assert all(default is REQUIRED for _, _, default in tools["write_file"].params)
+
+
+def _bare_objects(schema):
+    # Object schemas without declared properties, which Gemini rejects
+    if not isinstance(schema, dict):
+        return []
+    found = [schema] if schema.get("type") == "object" and not schema.get("properties") else []
+    for value in schema.values():
+        children = value.values() if isinstance(value, dict) else [value]
+        for child in children:
+            found += _bare_objects(child)
+    return found
+
+
+def test_gemini_declarations_have_no_bare_objects():
+    def configure(name: str, settings: dict = None):
+        """Configure something."""
+
+    tools = SANDBOX_TOOLS + AGENT_TOOLS + [Tool.from_callable(configure)]
+    for tool in tools:
+        assert _bare_objects(tool.to_gemini().get("parameters")) == [], tool.name
+
+    docker_run = {t.name: t for t in SANDBOX_TOOLS}["sys_docker_run"]
+    assert docker_run.to_gemini()["parameters"]["properties"]["env"]["type"] == "string"
+    assert docker_run.schema()["properties"]["env"] == {"type": "object"}
+    # Decoded back whether sent as JSON text (Gemini) or as an object
+    assert docker_run.positional({"image": "nginx", "env": '{"A": "1"}'}) == ["nginx", None, None, {"A": "1"}]
+    assert docker_run.positional({"image": "nginx", "ports": {"80": 8080}}) == ["nginx", None, {"80": 8080}, None]
+
+
+def make_agent(result):
+    agent = ReActAgent(MagicMock(), native_tools=True)
+    agent.dom = MagicMock()
+    agent.dom.get_state.return_value = {}
+    agent.resource_monitor = MagicMock()
+    agent.resource_monitor.check_limits.return_value = None
+    agent.action_logger = MagicMock()
+    agent.sandbox = MagicMock()
+    agent.sandbox.execute.return_value = "ok"
+    agent.llm = MagicMock()
+    agent.llm.generate_with_tools.side_effect = result
+    return agent
+
+
+def test_agent_uses_native_tool_calls():
+    agent = make_agent([
+        {"text": "Reading first.", "calls": [
+            {"name": "update_todo", "arguments": {"items": ["read", "finish"]}},
+            {"name": "read_file", "arguments": {"path": "a.txt"}},
+            {"name": "run_process", "arguments": {"app_name": "calc", "args": ["2*3"]}},
+        ]},
+        {"text": "", "calls": [{"name": "done", "arguments": {}}]},
+    ])
+
+    def shout(text: str):
+        """Shout the text."""
+        return text.upper()
+
+    agent.register_tool(shout)
+    assert agent.run("read a file") == "Task Completed"
+
+    system, prompt, tools = agent.llm.generate_with_tools.call_args_list[0].args
+    assert "AVAILABLE ACTIONS" not in system and "TASK: read a file" in prompt
+    assert {"read_file", "shout", "done", "update_todo"} <= {t.name for t in tools}
+    # The static prefix is identical across turns
+    assert agent.llm.generate_with_tools.call_args_list[1].args[0] == system
+
+    agent.sandbox.execute.assert_any_call("read_file", ["a.txt"])
+    agent.sandbox.execute.assert_any_call("run_process", ["calc", "2*3"])
+    assert agent.todo_list == ["read", "finish"]
+    output = next(h for h in agent.history if h.startswith("Turn 1 Output"))
+    output = json.loads(output.split("\n", 1)[1])
+    assert output["thought"] == "Reading first."
+
+
+def test_agent_falls_back_to_text_without_tool_calls():
+    agent = make_agent([
+        {"text": json.dumps({"thought": "t", "action": {"name": "list_dir", "args": ["/"]}}), "calls": []},
+        {"text": json.dumps({"thought": "t", "action": {"name": "done", "args": []}}), "calls": []},
+    ])
+    assert agent.run("list") == "Task Completed"
+    agent.sandbox.execute.assert_called_once_with("list_dir", ["/"])
+
+
+def test_anthropic_request_marks_system_prompt_cacheable(tmp_path):
+    from loop.kernel.llm import LLMProvider
+    from loop.kernel.llm_cache import LLMCache
+
+    llm = LLMProvider(cache=LLMCache(path=tmp_path / "llm.sqlite", enabled=False))
+    llm.provider, llm.is_mock = "anthropic", False
+    llm.client = MagicMock()
+    text = MagicMock(type="text", text="Listing.")
+    call = MagicMock(type="tool_use", input={"path": "/"})
+    call.name = "list_dir"
+    llm.client.messages.create.return_value = MagicMock(content=[text, call])
+
+    result = llm.generate_with_tools("STATIC", "turn", SANDBOX_TOOLS[:1])
+
+    assert result == {"text": "Listing.", "calls": [{"name": "list_dir", "arguments": {"path": "/"}}]}
+    kwargs = llm.client.messages.create.call_args.kwargs
+    assert kwargs["system"] == [{"type": "text", "text": "STATIC", "cache_control": {"type": "ephemeral"}}]
+    assert kwargs["tools"][0]["name"] == "list_dir"
@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import Mock, patch
 from loop.kernel.users import UserManager
@@ -61,3 +62,115 @@ def test_permission_denied_actions(user_manager):
 
     user_manager.add_user("target", "pass")
     assert not user_manager.delete_user("target", requestor="regular")
+
+@pytest.fixture
+def file_user_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(UserManager, "DB_FILE", tmp_path / "users.json")
+    return UserManager()
+
+def test_permission_cache_avoids_reads(file_user_manager):
+    um = file_user_manager
+    um.add_user("alice", "pw")
+    with patch.object(UserManager, "_load", wraps=um._load) as load:
+        for _ in range(100):
+            assert um.has_permission("alice", "use_network")
+            assert not um.has_permission("alice", "manage_network")
+        assert load.call_count == 0
+
+def test_external_change_invalidates_cache(file_user_manager):
+    um = file_user_manager
+    um.STAT_INTERVAL = 3600
+    um.add_user("alice", "pw")
+    assert not um.has_permission("alice", "manage_network")
+
+    # Another process (e.g. the CLI) grants admin by editing the file
+    other = UserManager()
+    other.users["alice"]["roles"].append("admin")
+    with open(UserManager.DB_FILE, "w") as f:
+        json.dump(other.users, f)
+
+    # Within the stat interval the cached decision stands ...
+    assert not um.has_permission("alice", "manage_network")
+    # ... until a change is announced or the file stamp is re-checked
+    UserManager.notify_changed()
+    assert um.has_permission("alice", "manage_network")
+
+def test_save_by_other_instance_is_seen_immediately(file_user_manager):
+    um = file_user_manager
+    um.add_user("bob", "pw")
+    assert not um.has_permission("bob", "manage_network")
+    UserManager().add_role("bob", "admin")
+    assert um.has_permission("bob", "manage_network")
+    assert "admin" in um.get_roles("bob")
+
+def test_saves_append_to_journal(file_user_manager):
+    um = file_user_manager
+    snapshot = UserManager.DB_FILE.read_bytes()
+    um.add_user("carol", "pw")
+    um.add_role("carol", "dev")
+    um.add_user("dave", "pw")
+    um.delete_user("dave")
+    # Mutations go to the journal; the snapshot is untouched
+    assert UserManager.DB_FILE.read_bytes() == snapshot
+    assert len(um.journal_file.read_text().splitlines()) == 5  # header + 4 records
+
+    fresh = UserManager()
+    assert fresh.get_roles("carol") == ["user", "dev"]
+    assert "dave" not in fresh.list_users()
+
+def test_journal_compaction(file_user_manager, monkeypatch):
+    monkeypatch.setattr("loop.kernel.users.COMPACT_MIN_ENTRIES", 3)
+    um = file_user_manager
+    um.users.update({f"u{i}": {"password": "x", "roles": ["user"]} for i in range(3)})
+    for role in ("dev", "ops"):
+        for i in range(3):
+            if (role, i) == ("ops", 2):
+                assert um.journal_file.exists()
+            um.add_role(f"u{i}", role)  # The 6th record outgrows the 5-user table: compact
+    assert not um.journal_file.exists()
+    assert UserManager().get_roles("u2") == ["user", "dev", "ops"]
+
+def test_torn_and_stale_journal(file_user_manager):
+    um = file_user_manager
+    um.add_role("guest", "dev")
+    with open(um.journal_file, "a") as f:
+        f.write('{"op":"set","user":"guest","da')  # crash mid-append
+    assert UserManager().get_roles("guest") == ["user", "dev"]
+
+    # A snapshot replaced behind our back makes the journal stale
+    with open(UserManager.DB_FILE, "w") as f:
+        json.dump({"root": {"password": "x", "roles": ["admin"]}, "guest": {"password": "x", "roles": []}}, f)
+    other = UserManager()
+    assert other.get_roles("guest") == []
+    other.add_role("guest", "ops")  # Stale journal: compacted away
+    assert not um.journal_file.exists()
+    assert UserManager().get_roles("guest") == ["ops"]
+
+def test_journal_survives_copying_the_directory(file_user_manager, tmp_path, monkeypatch):
+    import shutil
+    um = file_user_manager
+    um.add_user("carol", "pw")
+    um.add_role("carol", "dev")
+    assert um.journal_file.exists()
+
+    # cp -a / backup restore: new inodes (and mtimes, after a touch)
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    for f in (UserManager.DB_FILE, um.journal_file):
+        shutil.copy(f, copy / f.name)
+    (copy / "users.json").touch()
+    monkeypatch.setattr(UserManager, "DB_FILE", copy / "users.json")
+    restored = UserManager()
+    assert "carol" in restored.list_users()
+    assert restored.get_roles("carol") == ["user", "dev"]
+
+def test_bulk_operations_persist_once(file_user_manager):
+    um = file_user_manager
+    with patch.object(UserManager, "_save", wraps=um._save) as save:
+        added = um.add_users([("d1", "p"), ("d2", "p"), ("d1", "p"), ("root", "p")])
+        assert added == ["d1", "d2"]
+        assert um.add_roles({"d1": ["dev", "ops"], "d2": ["dev"], "ghost": ["dev"]}) == ["d1", "d2"]
+        assert save.call_count == 2
+    fresh = UserManager()
+    assert fresh.get_roles("d1") == ["user", "dev", "ops"]
+    assert fresh.authenticate("d2", "p")
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.process import Process, ProcessState
+from loop.kernel.watchdog import Watchdog, StepTimeout
+
+
+@pytest.fixture
+def scheduler():
+    s = Scheduler()
+    yield s
+    if s.watchdog:
+        s.watchdog.stop()
+
+
+def spin_forever():
+    while True:
+        pass
+    yield
+
+
+def test_log_records_pid_and_stack(scheduler):
+    def slow_step():
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            pass
+        yield
+
+    proc = Process("slow", slow_step(), "root")
+    scheduler.add(proc)
+    dog = Watchdog(scheduler, timeslice=0.05, action="log", interval=0.01)
+    dog.start()
+    scheduler.run(max_steps=2)
+
+    assert len(dog.overruns) == 1
+    record = dog.overruns[0]
+    assert record["pid"] == proc.pid
+    assert "slow_step" in record["stack"]
+    assert proc.state == ProcessState.TERMINATED
+
+
+def test_interrupt_kills_non_yielding_generator(scheduler):
+    proc = Process("spinner", spin_forever(), "root")
+    scheduler.add(proc)
+    Watchdog(scheduler, timeslice=0.05, action="interrupt", interval=0.01).start()
+
+    scheduler.run(max_steps=5)  # returns instead of hanging forever
+
+    assert proc.state == ProcessState.TERMINATED
+    assert proc.exit_code == 1
+    assert scheduler.current_step is None
+
+
+def test_interrupt_can_be_handled_by_the_generator(scheduler):
+    def cooperative_after_warning():
+        try:
+            while True:
+                pass
+        except StepTimeout:
+            yield "recovered"
+        yield
+
+    proc = Process("handler", cooperative_after_warning(), "root")
+    scheduler.add(proc)
+    Watchdog(scheduler, timeslice=0.05, action="interrupt", interval=0.01).start()
+
+    scheduler.run(max_steps=3)
+    assert proc.exit_code == 0
+
+
+def test_isolate_keeps_loop_running(scheduler):
+    release = threading.Event()
+    beats = []
+    step_threads = []
+
+    def blocker():
+        step_threads.append(threading.get_ident())
+        release.wait(5)  # blocks inside C code
+        yield
+        step_threads.append(threading.get_ident())
+        yield
+
+    def heartbeat():
+        while len(beats) < 5:
+            beats.append(time.monotonic())
+            yield
+        release.set()
+
+    blocked = Process("blocker", blocker(), "root")
+    scheduler.add(blocked)
+    scheduler.add(Process("heartbeat", heartbeat(), "root"))
+    dog = Watchdog(scheduler, timeslice=0.05, action="isolate", interval=0.01)
+    dog.start()
+
+    start = time.monotonic()
+    scheduler.run(max_steps=50)
+
+    assert time.monotonic() - start < 4  # did not wait for the 5s timeout
+    assert len(beats) == 5
+    assert blocked.state == ProcessState.TERMINATED
+    assert dog.overruns[0]["pid"] == blocked.pid
+    # The step after isolation ran on the process's own worker thread
+    assert step_threads[1] != step_threads[0]
+    assert blocked not in scheduler.isolated
+
+
+def test_isolate_process_runs_steps_off_the_loop(scheduler):
+    step_threads = []
+
+    def blocking():
+        step_threads.append(threading.get_ident())
+        yield
+        step_threads.append(threading.get_ident())
+        yield
+
+    proc = Process("shell", blocking(), "root")
+    scheduler.add(proc)
+    scheduler.isolate_process(proc)
+    scheduler.run(max_steps=20)
+
+    assert scheduler.watchdog is None
+    assert proc.state == ProcessState.TERMINATED
+    assert threading.get_ident() not in step_threads
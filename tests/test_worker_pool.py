@@ -0,0 +1,100 @@
+import time
+import pytest
+from loop.kernel.scheduler import Scheduler
+from loop.kernel.process import Process, ProcessState, SCHED_WORKER
+from loop.kernel.worker_pool import WorkerPool
+
+
+def crunch(ctx, n):
+    # CPU-bound body that runs to completion
+    return sum(i * i for i in range(n))
+
+
+def echo(ctx, reply_to):
+    while True:
+        msg = ctx.recv(timeout=0.05)
+        if msg is not None:
+            ctx.send(reply_to, f"echo:{msg}")
+            return
+        yield
+
+
+def spin(ctx):
+    while True:
+        time.sleep(0.01)
+        yield
+
+
+def run_until(scheduler, predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        scheduler.run(max_steps=1)
+
+
+@pytest.fixture
+def pool():
+    scheduler = Scheduler()
+    p = WorkerPool(scheduler, max_workers=2)
+    yield p
+    p.shutdown()
+
+
+def test_worker_runs_and_exits(pool):
+    proc = pool.spawn("crunch", crunch, 10000)
+    assert proc.sched_class == SCHED_WORKER
+    assert proc in pool.scheduler.processes
+
+    run_until(pool.scheduler, lambda: proc not in pool.scheduler.processes)
+
+    assert proc.state == ProcessState.TERMINATED
+    assert proc.exit_code == 0
+    assert not pool.workers
+
+
+def test_ipc_is_proxied_over_pipes(pool):
+    scheduler = pool.scheduler
+    replies = []
+
+    def collector():
+        while not replies:
+            msg = collector_proc.receive()
+            if msg is not None:
+                replies.append(msg)
+            yield
+
+    collector_proc = Process("collector", collector(), "root")
+    scheduler.add(collector_proc)
+    worker = pool.spawn("echo", echo, collector_proc.pid)
+
+    worker.send("hi")  # buffered until the worker starts, then forwarded
+    run_until(scheduler, lambda: bool(replies))
+
+    assert replies == ["echo:hi"]
+
+
+def test_kill_stops_worker(pool):
+    proc = pool.spawn("spin", spin)
+    run_until(pool.scheduler, lambda: proc in pool.workers)
+    worker = pool.workers[proc][0]
+
+    proc.deliver_signal("SIGKILL")
+    pool.scheduler.signal(proc)
+    pool.scheduler.run(max_steps=1)
+
+    assert not worker.is_alive()
+    assert proc not in pool.scheduler.processes
+    assert proc.exit_code == -9
+
+
+def test_pool_caps_concurrent_workers(pool):
+    procs = [pool.spawn(f"spin_{i}", spin) for i in range(3)]
+    run_until(pool.scheduler, lambda: len(pool.workers) == 2, timeout=3)
+    pool.scheduler.run(max_steps=3)
+    assert len(pool.workers) == 2
+
+    first = next(iter(pool.workers))
+    first.deliver_signal("SIGTERM")
+    pool.scheduler.signal(first)
+    waiting = [p for p in procs if p not in pool.workers and p is not first][0]
+    run_until(pool.scheduler, lambda: waiting in pool.workers, timeout=3)
+    assert waiting in pool.workers